@@ -0,0 +1,177 @@
+"""Micro-benchmark for the lock attribute report decoder.
+
+Compares the old if/elif chain of NimlyDigitalLock.attribute_updated (lookup
+dicts rebuilt and INFO f-strings formatted on every report) with the table
+driven dispatch on top of report_decoder. Home Assistant side effects (state
+writes, logbook) are left out so only the decode path is measured. Both
+paths run in alternating passes and the best of each is reported, so load
+changes on the machine do not skew the ratio. The spread of the per-pass
+ratios shows how much the figure moves on the machine at hand.
+
+    python benchmarks/report_decoder_benchmark.py
+"""
+import importlib.util
+import logging
+import pathlib
+import statistics
+import struct
+import time
+
+MODULE = pathlib.Path(__file__).resolve().parents[1] / "custom_components" / "nimly_digital_lock" / "report_decoder.py"
+spec = importlib.util.spec_from_file_location("report_decoder", MODULE)
+rd = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rd)
+
+_LOGGER = logging.getLogger("benchmark")
+_LOGGER.setLevel(logging.WARNING)
+
+REPORTS = [
+    (0x0000, 1),
+    (0x0100, (4 << 24) | (1 << 16) | 3),
+    (0x0003, 1),
+    (0x0021, 174),
+    (0x0103, 0xC4A01234),
+    (0x0102, b"\x01\x02\x03\x04"),
+    (0x0002, 1),
+    (0x0000, 2),
+    (0x0100, (2 << 24) | (2 << 16) | 7),
+    (0x0003, 0),
+]
+
+
+def legacy_attribute_updated(attr_id, value):
+    _LOGGER.info(f"Received lock attribute report: {attr_id:#06x}, Value: {value}")
+    if attr_id == 0x0000:
+        locked = value == 1
+        _LOGGER.info(f"Lock is now: {'locked' if locked else 'unlocked'}")
+    elif attr_id == 0x0001:
+        _LOGGER.info(f"Lock type reported: {value}")
+    elif attr_id == 0x0002:
+        enabled_str = "enabled" if value else "disabled"
+        _LOGGER.info(f"Actuator is {enabled_str}")
+    elif attr_id == 0x0003:
+        door_state_map = {
+            0x00: "Open",
+            0x01: "Closed",
+            0x02: "Error",
+            0x03: "Jammed",
+            0x04: "Forced Open",
+        }
+        door_state = door_state_map.get(value, f"Unknown ({value})")
+        _LOGGER.info(f"Door state: {door_state}")
+        message = f"Door state: {door_state}"
+    elif attr_id == 0x0021:
+        battery_percent = int(value / 2)
+        _LOGGER.info(f"Battery level: {battery_percent}%")
+        message = f"Battery level: {battery_percent}%"
+    elif attr_id == 0x0100 and isinstance(value, int):
+        user_id = value & 0xFFFF
+        event = (value >> 16) & 0xFF
+        method = (value >> 24) & 0xFF
+        event_str = {1: "Locked", 2: "Unlocked"}.get(event, f"Unknown ({event})")
+        method_str = {
+            0: "Key", 1: "Button", 2: "Code Panel (PIN)",
+            3: "Fingerprint", 4: "RFID", 5: "Other"
+        }.get(method, f"Unknown ({method})")
+        _LOGGER.info(f"Lock Event: {event_str} via {method_str}, User ID: {user_id}")
+        message = f"{event_str} via {method_str} (User ID: {user_id})"
+    elif attr_id == 0x0102 and isinstance(value, bytes):
+        rfid = value.hex().upper()
+        _LOGGER.info(f"RFID used: {rfid}")
+        message = f"RFID used: {rfid}"
+    elif attr_id == 0x0103 and isinstance(value, int):
+        value_bytes = value.to_bytes(4, byteorder="little")
+        parent_nwk, rssi, rssi_dbm = struct.unpack("<HBB", value_bytes)
+        rssi_dbm_signed = rssi_dbm - 256 if rssi_dbm > 127 else rssi_dbm
+        _LOGGER.info(
+            f"[AM] [RSSI] Diagnostics Data – Parent NWK: {hex(parent_nwk)}, "
+            f"RSSI: {rssi}, RSSI dBm: {rssi_dbm_signed}"
+        )
+    else:
+        _LOGGER.debug(f"Unhandled attribute report: {attr_id:#06x} = {value}")
+
+
+def _lock_state(value):
+    locked = rd.decode_lock_state(value)
+    _LOGGER.debug("Lock is now: %s", "locked" if locked else "unlocked")
+
+
+def _actuator(value):
+    _LOGGER.debug("Actuator is %s", "enabled" if value else "disabled")
+
+
+def _door_state(value):
+    door_state = rd.decode_door_state(value)
+    _LOGGER.debug("Door state: %s", door_state)
+    message = f"Door state: {door_state}"
+
+
+def _battery(value):
+    battery_percent = rd.decode_battery_percent(value)
+    _LOGGER.debug("Battery level: %s%%", battery_percent)
+    message = f"Battery level: {battery_percent}%"
+
+
+def _event(value):
+    user_id, _event, _method, event_str, method_str = rd.decode_operation_event(value)
+    _LOGGER.debug("Lock Event: %s via %s, User ID: %s", event_str, method_str, user_id)
+    message = f"{event_str} via {method_str} (User ID: {user_id})"
+
+
+def _rfid(value):
+    rfid = rd.decode_rfid(value)
+    _LOGGER.debug("RFID used: %s", rfid)
+    message = f"RFID used: {rfid}"
+
+
+def _link(value):
+    parent_nwk, rssi, rssi_dbm = rd.decode_link_diagnostics(value)
+    _LOGGER.debug("[AM] [RSSI] Diagnostics Data – Parent NWK: %#06x, RSSI: %s, RSSI dBm: %s", parent_nwk, rssi, rssi_dbm)
+
+
+HANDLERS = {
+    rd.ATTR_LOCK_STATE: _lock_state,
+    rd.ATTR_ACTUATOR_ENABLED: _actuator,
+    rd.ATTR_DOOR_STATE: _door_state,
+    rd.ATTR_BATTERY_PERCENT: _battery,
+    rd.ATTR_OPERATION_EVENT: _event,
+    rd.ATTR_RFID_USED: _rfid,
+    rd.ATTR_LINK_DIAGNOSTICS: _link,
+}
+
+
+def table_attribute_updated(attr_id, value):
+    handler = HANDLERS.get(attr_id)
+    if handler is None:
+        _LOGGER.debug("Unhandled attribute report: %#06x = %s", attr_id, value)
+        return
+    handler(value)
+
+
+def _throughput(decode, reports) -> float:
+    start = time.perf_counter()
+    for attr_id, value in reports:
+        decode(attr_id, value)
+    return len(reports) / (time.perf_counter() - start)
+
+
+def run(rounds: int, repeat: int) -> tuple[float, float, list[float]]:
+    """Return the best throughput of each path and the ratio of each interleaved pass."""
+    reports = REPORTS * rounds
+    _throughput(legacy_attribute_updated, reports)  # warm up
+    _throughput(table_attribute_updated, reports)
+    before = after = 0.0
+    ratios = []
+    for _ in range(repeat):
+        legacy = _throughput(legacy_attribute_updated, reports)
+        table = _throughput(table_attribute_updated, reports)
+        before, after = max(before, legacy), max(after, table)
+        ratios.append(table / legacy)
+    return before, after, sorted(ratios)
+
+
+if __name__ == "__main__":
+    before, after, ratios = run(rounds=20000, repeat=9)
+    print(f"before: {before:,.0f} reports/s")
+    print(f"after:  {after:,.0f} reports/s ({after / before:.2f}x)")
+    print(f"per pass: {ratios[0]:.2f}x-{ratios[-1]:.2f}x, median {statistics.median(ratios):.2f}x")
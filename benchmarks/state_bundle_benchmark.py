@@ -0,0 +1,290 @@
+"""Micro-benchmark for entity property reads on a busy dashboard.
+
+Every state write makes Home Assistant read icon and extra_state_attributes,
+and every open dashboard re-renders from them. This compares the old
+properties (threshold ladders, dict building and hass.states lookups on each
+read) with the current ones, for the RSSI sensor, battery sensor and sound
+volume select.
+
+The current property bodies, stale check included, are taken from the entity
+modules themselves, so the benchmark times the code that ships without
+importing Home Assistant. Both variants run in alternating passes and the
+best of each is reported, so load changes on the machine do not skew the
+ratio. "restored" repeats the run with every value still stale from the last
+run, the case where each read also copies the attributes.
+
+    python benchmarks/state_bundle_benchmark.py
+"""
+import ast
+import importlib.util
+import pathlib
+import time
+
+PACKAGE = pathlib.Path(__file__).resolve().parents[1] / "custom_components" / "nimly_digital_lock"
+spec = importlib.util.spec_from_file_location("state_bundles", PACKAGE / "state_bundles.py")
+sb = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sb)
+
+
+def _methods(path: str, class_name: str, *names: str) -> dict:
+    """Compile methods of ``class_name`` in ``path`` without importing the module."""
+    tree = ast.parse((PACKAGE / path).read_text())
+    cls = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == class_name)
+    methods = {}
+    for node in cls.body:
+        if isinstance(node, ast.FunctionDef) and node.name in names:
+            node.decorator_list = []
+            namespace = {}
+            exec(compile(ast.Module(body=[node], type_ignores=[]), str(PACKAGE / path), "exec"), namespace)
+            methods[node.name] = namespace[node.name]
+    return methods
+
+
+def _properties(path: str, class_name: str) -> tuple:
+    """Return the ``icon`` and ``extra_state_attributes`` properties of an entity class."""
+    methods = _methods(path, class_name, "icon", "extra_state_attributes")
+    return property(methods["icon"]), property(methods["extra_state_attributes"])
+
+
+class _LockState:
+    is_stale = _methods("lock_state.py", "LockState", "is_stale")["is_stale"]
+
+    def __init__(self, stale=()):
+        self.stale = set(stale)
+
+
+# Property reads per value change, e.g. a handful of open dashboards
+READS_PER_CHANGE = 20
+RSSI_VALUES = [-48, -52, -61, -75, -88, -43, -29]
+BATTERY_VALUES = [100, 96, 87, 74, 52, 31, 12, 4]
+VOLUME_VALUES = ["Off", "Low", "Normal"]
+
+
+class _State:
+    last_updated = "2024-01-01T00:00:00+00:00"
+
+
+class _States(dict):
+    get = dict.get
+
+
+STATES = _States({"sensor.front_door_rssi": _State()})
+
+
+class LegacyRSSI:
+    entity_id = "sensor.front_door_rssi"
+
+    def __init__(self):
+        self._attr_native_value = -50
+
+    @property
+    def icon(self):
+        if self._attr_native_value is None:
+            return "mdi:wifi-strength-outline"
+        rssi_level = int(self._attr_native_value)
+        if rssi_level >= -30:
+            return "mdi:wifi-strength-4"
+        elif rssi_level >= -50:
+            return "mdi:wifi-strength-3"
+        elif rssi_level >= -70:
+            return "mdi:wifi-strength-2"
+        elif rssi_level >= -85:
+            return "mdi:wifi-strength-1"
+        else:
+            return "mdi:wifi-strength-outline"
+
+    @property
+    def extra_state_attributes(self):
+        attributes = {}
+        if self._attr_native_value is not None:
+            attributes["rssi_dbm"] = f"{self._attr_native_value} dBm"
+            attributes["last_updated"] = STATES.get(self.entity_id).last_updated if STATES.get(
+                self.entity_id) else None
+            rssi_level = int(self._attr_native_value)
+            if rssi_level >= -30:
+                attributes["signal_quality"] = "Excellent"
+            elif rssi_level >= -50:
+                attributes["signal_quality"] = "Good"
+            elif rssi_level >= -70:
+                attributes["signal_quality"] = "Fair"
+            elif rssi_level >= -85:
+                attributes["signal_quality"] = "Poor"
+            else:
+                attributes["signal_quality"] = "Very Poor"
+            if rssi_level >= -30:
+                signal_percent = 100
+            elif rssi_level >= -50:
+                signal_percent = 75
+            elif rssi_level >= -70:
+                signal_percent = 50
+            elif rssi_level >= -85:
+                signal_percent = 25
+            else:
+                signal_percent = 10
+            attributes["signal_percentage"] = f"{signal_percent}%"
+        return attributes
+
+    def update_state(self, value):
+        self._attr_native_value = value
+
+
+class LegacyBattery:
+    def __init__(self):
+        self._attr_native_value = 100
+
+    @property
+    def icon(self):
+        if self._attr_native_value is None:
+            return "mdi:battery-unknown"
+        battery_level = int(self._attr_native_value)
+        if battery_level >= 95:
+            return "mdi:battery"
+        elif battery_level >= 85:
+            return "mdi:battery-90"
+        elif battery_level >= 75:
+            return "mdi:battery-80"
+        elif battery_level >= 65:
+            return "mdi:battery-70"
+        elif battery_level >= 55:
+            return "mdi:battery-60"
+        elif battery_level >= 45:
+            return "mdi:battery-50"
+        elif battery_level >= 35:
+            return "mdi:battery-40"
+        elif battery_level >= 25:
+            return "mdi:battery-30"
+        elif battery_level >= 15:
+            return "mdi:battery-20"
+        elif battery_level >= 5:
+            return "mdi:battery-10"
+        else:
+            return "mdi:battery-alert"
+
+    @property
+    def extra_state_attributes(self):
+        attributes = {}
+        if self._attr_native_value is not None:
+            attributes["battery_level"] = f"{self._attr_native_value}%"
+            if self._attr_native_value >= 75:
+                attributes["battery_status"] = "Good"
+            elif self._attr_native_value >= 25:
+                attributes["battery_status"] = "Medium"
+            elif self._attr_native_value >= 10:
+                attributes["battery_status"] = "Low"
+            else:
+                attributes["battery_status"] = "Critical"
+        return attributes
+
+    def update_state(self, value):
+        self._attr_native_value = value
+
+
+class LegacyVolume:
+    _attr_options = ["Off", "Low", "Normal"]
+
+    def __init__(self):
+        self._attr_current_option = None
+
+    @property
+    def icon(self):
+        icons = {
+            "Off": "mdi:volume-off",
+            "Low": "mdi:volume-medium",
+            "Normal": "mdi:volume-high",
+        }
+        return icons.get(self._attr_current_option, "mdi:volume-medium")
+
+    @property
+    def extra_state_attributes(self):
+        if self._attr_current_option:
+            return {
+                "volume_label": self._attr_current_option,
+                "volume_level": self._attr_options.index(self._attr_current_option),
+            }
+        return {}
+
+    def update_state(self, option):
+        self._attr_current_option = option
+
+
+class _Current:
+    def __init__(self, stale: bool):
+        self._lock_state = _LockState([self.VALUE] if stale else ())
+
+
+class CurrentRSSI(_Current):
+    VALUE = "rssi"
+    icon, extra_state_attributes = _properties("sensors/rssi_sensor.py", "RSSISensor")
+
+    def __init__(self, stale: bool = False):
+        super().__init__(stale)
+        self._bundle = sb.rssi_bundle(-50)
+
+    def update_state(self, value):
+        self._bundle = sb.rssi_bundle(value, _State.last_updated)
+
+
+class CurrentBattery(_Current):
+    VALUE = "battery"
+    icon, extra_state_attributes = _properties("sensors/battery_sensor.py", "BatterySensor")
+
+    def __init__(self, stale: bool = False):
+        super().__init__(stale)
+        self._bundle = sb.battery_bundle(100)
+
+    def update_state(self, value):
+        self._bundle = sb.battery_bundle(value)
+
+
+class CurrentVolume(_Current):
+    VALUE = "volume"
+    icon, extra_state_attributes = _properties("configuration/sound_volume_select.py", "SoundVolumeSelect")
+
+    def __init__(self, stale: bool = False):
+        super().__init__(stale)
+        self._bundle = sb.VOLUME_UNKNOWN
+
+    def update_state(self, option):
+        self._bundle = sb.VOLUME_BUNDLES[option]
+
+
+def _throughput(entities, rounds: int) -> float:
+    reads = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for entity, values in entities:
+            for value in values:
+                entity.update_state(value)
+                for _ in range(READS_PER_CHANGE):
+                    entity.icon
+                    entity.extra_state_attributes
+                reads += READS_PER_CHANGE * 2
+    return reads / (time.perf_counter() - start)
+
+
+def run(rounds: int, repeat: int) -> dict:
+    """Return the best throughput of each variant over ``repeat`` interleaved passes."""
+    variants = {
+        "before": [(LegacyRSSI(), RSSI_VALUES), (LegacyBattery(), BATTERY_VALUES), (LegacyVolume(), VOLUME_VALUES)],
+        "after": [(CurrentRSSI(), RSSI_VALUES), (CurrentBattery(), BATTERY_VALUES), (CurrentVolume(), VOLUME_VALUES)],
+        "restored": [
+            (CurrentRSSI(stale=True), RSSI_VALUES),
+            (CurrentBattery(stale=True), BATTERY_VALUES),
+            (CurrentVolume(stale=True), VOLUME_VALUES),
+        ],
+    }
+    for entities in variants.values():
+        _throughput(entities, rounds)  # warm up
+    best = dict.fromkeys(variants, 0.0)
+    for _ in range(repeat):
+        for name, entities in variants.items():
+            best[name] = max(best[name], _throughput(entities, rounds))
+    return best
+
+
+if __name__ == "__main__":
+    best = run(rounds=500, repeat=9)
+    before = best["before"]
+    print(f"before:   {before:,.0f} property reads/s")
+    print(f"after:    {best['after']:,.0f} property reads/s ({best['after'] / before:.2f}x)")
+    print(f"restored: {best['restored']:,.0f} property reads/s ({best['restored'] / before:.2f}x)")
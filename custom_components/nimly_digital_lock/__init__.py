@@ -3,45 +3,53 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 
-from .const import DOMAIN, PLATFORMS, SERVICE_UPDATE
+from .const import DOMAIN, PLATFORMS
+from .coordinator import get_coordinator
 from .entity import NimlyDigitalLock
 
-from .services import async_register_services
+from .prefetch import get_prefetch
+from .utils.hotpath_log import HotPathLogger, lazy
 
 # Define ZHA domain constant directly instead of importing from unavailable path
 ZHA_DOMAIN = "zha"
 from .const import DOMAIN, ATTRIBUTE_MAP
 
 _LOGGER = logging.getLogger(__name__)
+_HOT_LOGGER = HotPathLogger(_LOGGER)
 
 
 class MyClusterListener:
 
-    def __init__(self, lock: NimlyDigitalLock):
+    def __init__(self, lock: NimlyDigitalLock, cluster_id: int):
         self._lock = lock
+        self._cluster_id = cluster_id
         self._diagnostic_sensors = {}
 
     def attribute_updated(self, attrid, value, received_timestamp):
-        self._lock.attribute_updated(attrid, value)
+        self._lock.frame_received()
+        self._lock.attribute_updated(self._cluster_id, attrid, value, received_timestamp)
 
-        _LOGGER.info(
+        _HOT_LOGGER.info(
+            "attribute_updated",
             "[ZCL ANDRE] Attribute Updated - AttrID: 0x%04X, Value: %s, Time: %s",
             attrid, value, received_timestamp
         )
 
     def cluster_command(self, tsn, command_id, args):
-        _LOGGER.info(
+        self._lock.frame_received()
+        _HOT_LOGGER.info(
+            "cluster_command",
             "[ZCL ANDRE] Cluster Command - TSN: %s, Command ID: 0x%02X, Args: %s",
             tsn, command_id, args
         )
 
     def raw_frame(self, frame):
-        _LOGGER.info("[ZCL ANDRE] Raw Frame Received: %s", frame.hex())
+        self._lock.frame_received()
+        _HOT_LOGGER.info("raw_frame", "[ZCL ANDRE] Raw Frame Received: %s", lazy(frame.hex))
 
     def zdo_command(self, *args, **kwargs):
-        _LOGGER.info("[ZDO ANDRE] Command Received: args=%s kwargs=%s", args, kwargs)
+        _HOT_LOGGER.info("zdo_command", "[ZDO ANDRE] Command Received: args=%s kwargs=%s", args, kwargs)
 
 
 
@@ -66,29 +74,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up config entry."""
     _LOGGER.info("[AM] Setting up ZHA Device Info config entry")
     try:
-        if DOMAIN not in hass.data:
-            hass.data[DOMAIN] = {
-                "device_registry": {},
-                "entities": [],
-                "battery_sensors": {},
-                "rssi_sensors": {},
-            }
-        _LOGGER.info("[AM] Initialized device registry and entities list")
-
-        await async_register_services(hass)
+        # Services, caches and the scheduler are shared; only the lock is per entry
+        ieee = await get_coordinator(hass).async_attach(entry)
 
         _LOGGER.info("[AM] Adding platform: %s", PLATFORMS)
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-
-        # Initial update
-        async def initial_update(event):
-            await hass.services.async_call(DOMAIN, SERVICE_UPDATE)
-
-        hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_STARTED,
-            initial_update
-        )
+        # Every entity has subscribed to its startup values by now
+        get_prefetch(hass, ieee).async_start()
 
         _LOGGER.info("[AM] ZHA Device Info config entry setup complete")
         return True
@@ -104,6 +97,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Unloading ZHA Device Info config entry")
     try:
         result = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        if result:
+            get_coordinator(hass).async_detach(entry)
         _LOGGER.debug("ZHA Device Info config entry unloaded")
         return result
     except Exception as err:
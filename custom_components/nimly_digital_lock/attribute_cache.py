@@ -0,0 +1,162 @@
+"""Attribute cache with single-flight reads for the Nimly Digital Lock integration."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ATTRIBUTE_CACHE_TTL, DEFAULT_ATTRIBUTE_CACHE_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _ClusterReportListener:
+    """Feed attribute reports from one cluster into the cache."""
+
+    def __init__(self, cache, ieee: str, cluster_id: int):
+        self._cache = cache
+        self._ieee = ieee
+        self._cluster_id = cluster_id
+
+    def attribute_updated(self, attrid, value, *args):
+        self._cache.set_reported((self._ieee, self._cluster_id, attrid), value)
+
+
+class AttributeCache:
+    """Per-(ieee, cluster, attribute) value cache.
+
+    Values stay valid for a per-attribute TTL. Concurrent reads of the same
+    key share one in-flight request, and attribute reports refresh entries
+    without a round trip.
+    """
+
+    def __init__(self, ttls: dict | None = None, default_ttl: float = DEFAULT_ATTRIBUTE_CACHE_TTL):
+        self._ttls = dict(ATTRIBUTE_CACHE_TTL if ttls is None else ttls)
+        self._default_ttl = default_ttl
+        self._entries = {}
+        self._reported = {}
+        self._inflight = {}
+        self._watched = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.report_updates = 0
+
+    def ttl(self, cluster_id: int, attribute: int) -> float:
+        """Return how long a value of this attribute stays valid."""
+        return self._ttls.get((cluster_id, attribute), self._default_ttl)
+
+    def get(self, key: tuple, max_age: float | None = None):
+        """Return ``(True, value)`` for a fresh entry, else ``(False, None)``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, stored_at = entry
+        if max_age is None:
+            max_age = self.ttl(key[1], key[2])
+        if time.monotonic() - stored_at > max_age:
+            return False, None
+        return True, value
+
+    def set(self, key: tuple, value) -> None:
+        """Store a value, stamped with the current time."""
+        self._entries[key] = (value, time.monotonic())
+
+    def discard(self, key: tuple) -> None:
+        """Drop the cached value of one attribute."""
+        self._entries.pop(key, None)
+
+    def set_reported(self, key: tuple, value) -> None:
+        """Store a value that arrived in an attribute report."""
+        self.set(key, value)
+        self._reported[key] = time.monotonic()
+        self.report_updates += 1
+
+    def report_age(self, key: tuple) -> float | None:
+        """Return seconds since the last report for a key, or None."""
+        reported_at = self._reported.get(key)
+        if reported_at is None:
+            return None
+        return time.monotonic() - reported_at
+
+    def invalidate(self, ieee: str | None = None) -> None:
+        """Drop cached values for one device, or for every device.
+
+        Called by the device resolver when a device rejoins or is
+        reinitialized, since its values may have changed meanwhile.
+        """
+        if ieee is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == ieee]:
+            del self._entries[key]
+
+    def watch_cluster(self, ieee: str, cluster) -> None:
+        """Refresh the cache from attribute reports of a cluster.
+
+        A device that rejoins gets new cluster objects; the listener then
+        moves from the old cluster to the new one.
+        """
+        watch_key = (ieee, cluster.cluster_id)
+        watched = self._watched.get(watch_key)
+        if watched is not None:
+            watched_cluster, listener = watched
+            if watched_cluster is cluster:
+                return
+            watched_cluster.remove_listener(listener)
+        listener = _ClusterReportListener(self, ieee, cluster.cluster_id)
+        cluster.add_listener(listener)
+        self._watched[watch_key] = (cluster, listener)
+
+    async def async_get_or_read(self, key: tuple, reader, max_age: float | None = None):
+        """Return a cached value or read it, sharing any identical read in flight.
+
+        ``max_age=0`` always starts a read of its own: one already in flight
+        may have been sent before a write the caller wants to see.
+        """
+        found, value = self.get(key, max_age)
+        if found:
+            self.hits += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None and max_age != 0:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        task = asyncio.ensure_future(reader())
+        self._inflight[key] = task
+
+        def _done(done_task):
+            # A read replaced by a newer one must not overwrite its value
+            if self._inflight.get(key) is not done_task:
+                return
+            del self._inflight[key]
+            if not done_task.cancelled() and done_task.exception() is None:
+                result = done_task.result()
+                if result is not None:
+                    self.set(key, result)
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def as_dict(self) -> dict:
+        """Return cache counters for diagnostics."""
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "report_updates": self.report_updates,
+        }
+
+
+def get_attribute_cache(hass: HomeAssistant) -> AttributeCache:
+    """Return the shared attribute cache, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get("attribute_cache")
+    if cache is None:
+        cache = domain_data["attribute_cache"] = AttributeCache()
+    return cache
@@ -0,0 +1,148 @@
+"""Attribute support discovered per lock model, persisted across restarts."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import CAPABILITY_STORAGE_KEY, CAPABILITY_STORAGE_VERSION, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Attribute ids from here on are manufacturer specific; standard discovery
+# does not list them
+MANUFACTURER_ATTRIBUTE_START = 0x5000
+
+
+def model_key(zha_device) -> str | None:
+    """Return ``manufacturer|model|firmware`` for a ZHA device, or None if unknown."""
+    manufacturer = getattr(zha_device, "manufacturer", None)
+    model = getattr(zha_device, "model", None)
+    if not manufacturer or not model:
+        return None
+    firmware = getattr(zha_device, "sw_version", None) or getattr(zha_device, "firmware_version", None)
+    return f"{manufacturer}|{model}|{firmware or 'unknown'}"
+
+
+class ClusterCapabilities:
+    """Attributes one cluster of a model answered attribute discovery with.
+
+    ``manufacturer`` is None when manufacturer specific discovery was not
+    possible; manufacturer range attributes are then assumed to be
+    supported. An attribute found by either discovery is supported,
+    whatever its id.
+    """
+
+    __slots__ = ("standard", "manufacturer")
+
+    def __init__(self, standard, manufacturer=None):
+        self.standard = frozenset(standard)
+        self.manufacturer = None if manufacturer is None else frozenset(manufacturer)
+
+    def supports(self, attribute: int) -> bool:
+        if attribute in self.standard:
+            return True
+        if self.manufacturer is None:
+            return attribute >= MANUFACTURER_ATTRIBUTE_START
+        return attribute in self.manufacturer
+
+    def as_stored(self) -> dict:
+        return {
+            "standard": sorted(self.standard),
+            "manufacturer": None if self.manufacturer is None else sorted(self.manufacturer),
+        }
+
+
+class CapabilityStore:
+    """Discovered attribute support by (manufacturer, model, firmware).
+
+    Discovery runs once per model key, so a second lock of the same model
+    and firmware starts with what the first one reported. Anything not
+    discovered yet counts as supported. The rediscover_capabilities service
+    replaces a stored result.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._store = Store(hass, CAPABILITY_STORAGE_VERSION, CAPABILITY_STORAGE_KEY)
+        self._models = {}
+        self._discovered_at = {}
+        self._load_task = None
+        self.skipped = 0
+
+    async def async_load(self) -> None:
+        """Load the stored models once; later calls wait for the first load."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await asyncio.shield(self._load_task)
+
+    async def _async_load(self) -> None:
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("[Capabilities] Failed to load stored capabilities: %s", e)
+            return
+        for key, stored in (data or {}).get("models", {}).items():
+            self._models[key] = {
+                int(cluster_id, 16): ClusterCapabilities(cluster["standard"], cluster["manufacturer"])
+                for cluster_id, cluster in stored["clusters"].items()
+            }
+            self._discovered_at[key] = stored.get("discovered_at")
+        _LOGGER.debug("[Capabilities] Loaded capabilities of %d model(s)", len(self._models))
+
+    def is_known(self, key: str) -> bool:
+        return key in self._models
+
+    def supports(self, key: str | None, cluster_id: int, attribute: int) -> bool:
+        """Return False only if discovery showed the model lacks the attribute."""
+        clusters = self._models.get(key)
+        if clusters is None:
+            return True
+        cluster = clusters.get(cluster_id)
+        if cluster is None or cluster.supports(attribute):
+            return True
+        self.skipped += 1
+        return False
+
+    async def async_set(self, key: str, clusters: dict) -> None:
+        """Record and persist the discovery result of a model."""
+        self._models[key] = clusters
+        self._discovered_at[key] = time.time()
+        await self._store.async_save(self._data_to_save())
+
+    async def async_forget(self, key: str) -> None:
+        """Drop the stored result of a model so it is discovered again."""
+        if self._models.pop(key, None) is None:
+            return
+        self._discovered_at.pop(key, None)
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict:
+        return {
+            "models": {
+                key: {
+                    "discovered_at": self._discovered_at.get(key),
+                    "clusters": {f"{cluster_id:#06x}": cluster.as_stored() for cluster_id, cluster in clusters.items()},
+                }
+                for key, clusters in self._models.items()
+            }
+        }
+
+    def as_dict(self, key: str | None = None) -> dict:
+        """Return the capability set of one model (or all) for diagnostics."""
+        models = self._data_to_save()["models"]
+        return {
+            "model": key,
+            "discovered": models.get(key) if key is not None else models,
+            "skipped": self.skipped,
+        }
+
+
+def get_capabilities(hass: HomeAssistant) -> CapabilityStore:
+    """Return the shared capability store, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get("capabilities")
+    if store is None:
+        store = domain_data["capabilities"] = CapabilityStore(hass)
+    return store
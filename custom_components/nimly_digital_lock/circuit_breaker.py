@@ -0,0 +1,164 @@
+"""Per-lock circuit breaker for the Nimly Digital Lock integration."""
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_PROBE_BACKOFF,
+    CIRCUIT_MAX_PROBE_BACKOFF,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending background traffic to a lock that is off the mesh."""
+
+
+class CircuitBreaker:
+    """Stop background traffic to a lock after repeated failures.
+
+    While open, the lock's entities are unavailable and a single cheap probe
+    read is sent on an exponential backoff schedule. Any frame or report from
+    the lock, or any successful operation, closes the breaker at once.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        probe,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        base_backoff: float = CIRCUIT_PROBE_BACKOFF,
+        max_backoff: float = CIRCUIT_MAX_PROBE_BACKOFF,
+    ):
+        self._hass = hass
+        self._name = name
+        self._probe = probe
+        self._threshold = threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._backoff = base_backoff
+        self._probe_unsub = None
+        self._listeners = []
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.blocked = 0
+        self.probes = 0
+        self.opened_at = None
+
+    @property
+    def available(self) -> bool:
+        return self.state == STATE_CLOSED
+
+    def allow_background(self) -> bool:
+        """Return True if background traffic may be sent; count it as blocked otherwise."""
+        if self.state == STATE_CLOSED:
+            return True
+        self.blocked += 1
+        return False
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Call ``update_callback`` when availability changes; returns a remover."""
+        self._listeners.append(update_callback)
+
+        def _remove():
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return _remove
+
+    def _notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def record_success(self) -> None:
+        """Note a successful operation or any frame received from the lock."""
+        self.failures = 0
+        if self.state == STATE_CLOSED:
+            return
+        _LOGGER.info("[Breaker] %s is reachable again, closing", self._name)
+        self._cancel_probe()
+        self.state = STATE_CLOSED
+        self.opened_at = None
+        self._backoff = self._base_backoff
+        self._notify()
+
+    @callback
+    def record_failure(self) -> None:
+        """Note a failed operation; open after ``threshold`` in a row."""
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures >= self._threshold:
+            _LOGGER.warning("[Breaker] %s failed %d times in a row, opening", self._name, self.failures)
+            self.state = STATE_OPEN
+            self.opened += 1
+            self.opened_at = time.monotonic()
+            self._schedule_probe()
+            self._notify()
+
+    def _schedule_probe(self) -> None:
+        self._cancel_probe()
+        self._probe_unsub = async_call_later(self._hass, self._backoff, self._probe_due)
+
+    def _cancel_probe(self) -> None:
+        if self._probe_unsub is not None:
+            self._probe_unsub()
+            self._probe_unsub = None
+
+    @callback
+    def _probe_due(self, _now) -> None:
+        self._probe_unsub = None
+        if self.state != STATE_OPEN:
+            return
+        self.state = STATE_HALF_OPEN
+        self._hass.async_create_task(self._async_probe())
+
+    async def _async_probe(self) -> None:
+        self.probes += 1
+        try:
+            await self._probe()
+        except Exception as e:
+            if self.state != STATE_HALF_OPEN:
+                return  # A frame closed the breaker meanwhile
+            self._backoff = min(self._max_backoff, self._backoff * 2)
+            _LOGGER.debug("[Breaker] Probe of %s failed (%s), next in %ss", self._name, e, self._backoff)
+            self.state = STATE_OPEN
+            self._schedule_probe()
+            return
+        self.record_success()
+
+    def shutdown(self) -> None:
+        """Cancel a pending probe."""
+        self._cancel_probe()
+
+    def as_dict(self) -> dict:
+        """Return breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "open_for": round(time.monotonic() - self.opened_at, 1) if self.opened_at else None,
+            "probe_backoff": self._backoff,
+            "probes": self.probes,
+            "blocked": self.blocked,
+        }
+
+
+def get_circuit_breaker(hass: HomeAssistant, ieee: str, probe) -> CircuitBreaker:
+    """Return the circuit breaker of a lock, creating it on first use."""
+    breakers = hass.data.setdefault(DOMAIN, {}).setdefault("circuit_breakers", {})
+    breaker = breakers.get(ieee)
+    if breaker is None:
+        breaker = breakers[ieee] = CircuitBreaker(hass, ieee, probe)
+    return breaker
@@ -0,0 +1,164 @@
+"""Per-lock priority queue for Zigbee traffic of the Nimly Digital Lock integration."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_COMMAND = 0  # lock / unlock
+PRIORITY_WRITE = 1  # user initiated configuration writes
+PRIORITY_READ = 2  # reads an entity waits for
+PRIORITY_POLL = 3  # background polling and reporting setup
+
+PRIORITY_NAMES = {
+    PRIORITY_COMMAND: "command",
+    PRIORITY_WRITE: "write",
+    PRIORITY_READ: "read",
+    PRIORITY_POLL: "poll",
+}
+
+
+class _QueueItem:
+    __slots__ = ("priority", "seq", "factory", "future", "enqueued_at", "preempted")
+
+    def __init__(self, priority: int, seq: int, factory, future, enqueued_at: float):
+        self.priority = priority
+        self.seq = seq
+        self.factory = factory
+        self.future = future
+        self.enqueued_at = enqueued_at
+        self.preempted = False
+
+    def __lt__(self, other) -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class LockCommandQueue:
+    """Serialize all Zigbee traffic to one lock by priority.
+
+    Only one request is on the air per lock at a time. Commands jump ahead
+    of everything queued, and a background poll that is already running is
+    cancelled and re-queued when a command arrives, so an unlock never
+    waits for a diagnostics read to a sleepy device.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str):
+        self._hass = hass
+        self._name = name
+        self._heap = []
+        self._seq = itertools.count()
+        self._worker = None
+        self._current = None
+        self._current_task = None
+        self.preemptions = 0
+        self.completed = 0
+        self._wait_stats = {priority: [0, 0.0, 0.0] for priority in PRIORITY_NAMES}
+
+    async def async_submit(self, factory, priority: int = PRIORITY_READ):
+        """Queue ``factory`` (a coroutine function) and return its result."""
+        future = self._hass.loop.create_future()
+        heapq.heappush(self._heap, _QueueItem(priority, next(self._seq), factory, future, time.monotonic()))
+
+        current = self._current
+        if (
+            priority == PRIORITY_COMMAND
+            and current is not None
+            and current.priority == PRIORITY_POLL
+            and self._current_task is not None
+            and self._current_task.cancel()
+        ):
+            current.preempted = True
+            self.preemptions += 1
+            _LOGGER.debug("[Queue] %s: command preempted a background poll", self._name)
+
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(self._run(), f"{DOMAIN} queue {self._name}")
+        return await future
+
+    async def _run(self) -> None:
+        try:
+            while self._heap:
+                item = heapq.heappop(self._heap)
+                if item.future.done():
+                    continue  # caller gave up
+
+                if not item.preempted:
+                    self._record_wait(item)
+                item.preempted = False
+
+                self._current = item
+                self._current_task = asyncio.ensure_future(item.factory())
+                await asyncio.wait([self._current_task])
+                task = self._current_task
+                self._current = None
+                self._current_task = None
+
+                if task.cancelled():
+                    if item.preempted:
+                        heapq.heappush(self._heap, item)
+                    elif not item.future.done():
+                        item.future.cancel()
+                    continue
+
+                self.completed += 1
+                if item.future.done():
+                    task.exception()  # caller gave up, consume the outcome
+                elif task.exception() is not None:
+                    item.future.set_exception(task.exception())
+                else:
+                    item.future.set_result(task.result())
+        finally:
+            self._worker = None
+
+    def shutdown(self) -> None:
+        """Cancel the running request and everything still queued."""
+        if self._current is not None and not self._current.future.done():
+            self._current.future.cancel()
+        if self._current_task is not None:
+            self._current_task.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+        for item in self._heap:
+            if not item.future.done():
+                item.future.cancel()
+        self._heap.clear()
+
+    def _record_wait(self, item: _QueueItem) -> None:
+        wait = time.monotonic() - item.enqueued_at
+        stats = self._wait_stats[item.priority]
+        stats[0] += 1
+        stats[1] += wait
+        stats[2] = max(stats[2], wait)
+
+    def as_dict(self) -> dict:
+        """Return queue state and wait times for diagnostics."""
+        return {
+            "queued": len(self._heap),
+            "running": PRIORITY_NAMES.get(self._current.priority) if self._current else None,
+            "completed": self.completed,
+            "preemptions": self.preemptions,
+            "wait": {
+                PRIORITY_NAMES[priority]: {
+                    "count": count,
+                    "avg": round(total / count, 3) if count else 0.0,
+                    "max": round(maximum, 3),
+                }
+                for priority, (count, total, maximum) in self._wait_stats.items()
+            },
+        }
+
+
+def get_command_queue(hass: HomeAssistant, ieee: str) -> LockCommandQueue:
+    """Return the command queue of a lock, creating it on first use."""
+    queues = hass.data.setdefault(DOMAIN, {}).setdefault("command_queues", {})
+    queue = queues.get(ieee)
+    if queue is None:
+        queue = queues[ieee] = LockCommandQueue(hass, ieee)
+    return queue
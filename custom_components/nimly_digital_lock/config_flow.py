@@ -5,7 +5,16 @@ from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN
+from .const import DOMAIN, CONF_USE_REPORTING, DEFAULT_USE_REPORTING, CONF_OPTIMISTIC_STATE, DEFAULT_OPTIMISTIC_STATE
+from .const import (
+    CONF_RSSI_DEADBAND,
+    DEFAULT_RSSI_DEADBAND,
+    CONF_RSSI_MIN_INTERVAL,
+    DEFAULT_RSSI_MIN_INTERVAL,
+    CONF_SENSOR_HEARTBEAT,
+    DEFAULT_SENSOR_HEARTBEAT,
+)
+from .ieee import canonical_ieee
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,15 +24,17 @@ class NimlyDigitalLockConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     _user_data: dict
 
     def normalize_ieee(self, ieee: str):
-        ieee_no_colons = ieee.replace(':', '')
-        ieee_clean = ''.join(c for c in ieee_no_colons if c.lower() in '0123456789abcdef')
-        ieee_no_colons = ieee_clean.lower()
-        ieee_with_colons = ':'.join([ieee_clean[i:i+2] for i in range(0, len(ieee_clean), 2)]).lower()
+        ieee_clean = ''.join(c for c in ieee.lower() if c in '0123456789abcdef')
+        try:
+            address = canonical_ieee(ieee_clean)
+        except ValueError:
+            # Wrong length; the caller reports it from no_colons
+            return {"original": ieee, "no_colons": ieee_clean, "with_colons": None}
 
         return {
             "original": ieee,
-            "no_colons": ieee_no_colons,
-            "with_colons": ieee_with_colons
+            "no_colons": address.no_colons,
+            "with_colons": address.with_colons
         }
 
     async def async_step_user(self, user_input=None):
@@ -208,6 +219,26 @@ class NimlyDigitalLockConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "sound_volume",
                     default=self.config_entry.options.get("sound_volume", 2)
                 ): vol.All(int, vol.Range(min=0, max=2)),
+                vol.Optional(
+                    CONF_USE_REPORTING,
+                    default=self.config_entry.options.get(CONF_USE_REPORTING, DEFAULT_USE_REPORTING)
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_OPTIMISTIC_STATE,
+                    default=self.config_entry.options.get(CONF_OPTIMISTIC_STATE, DEFAULT_OPTIMISTIC_STATE)
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_RSSI_DEADBAND,
+                    default=self.config_entry.options.get(CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND)
+                ): vol.All(int, vol.Range(min=0, max=30)),
+                vol.Optional(
+                    CONF_RSSI_MIN_INTERVAL,
+                    default=self.config_entry.options.get(CONF_RSSI_MIN_INTERVAL, DEFAULT_RSSI_MIN_INTERVAL)
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SENSOR_HEARTBEAT,
+                    default=self.config_entry.options.get(CONF_SENSOR_HEARTBEAT, DEFAULT_SENSOR_HEARTBEAT)
+                ): vol.All(int, vol.Range(min=0)),
             })
             return self.async_show_form(
                 step_id="init",
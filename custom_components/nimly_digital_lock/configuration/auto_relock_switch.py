@@ -1,12 +1,13 @@
-import asyncio
 import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceEntryType
-from zigpy.types import EUI64
 
-from ..zbt1_support import async_write_attribute_zbt1, async_read_attribute_zbt1
+from ..zbt1_support import async_write_attribute_zbt1, async_read_attributes_zbt1, get_lock_breaker
 from ..const import DOMAIN
+from ..ieee import canonical_ieee
+from ..lock_state import get_lock_state
+from ..prefetch import get_prefetch
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,9 +16,9 @@ class AutoRelockSwitch(SwitchEntity):
 
     def __init__(self, hass, ieee, lock_name: str):
         self._hass = hass
-        self._ieee = ieee.lower()
-        self._ieee_no_colons = self._ieee.replace(":", "")
-        self._ieee_with_colons = ":".join(self._ieee[i:i + 2] for i in range(0, len(self._ieee), 2)) if ":" not in self._ieee else self._ieee
+        self._ieee = canonical_ieee(ieee)
+        self._ieee_no_colons = self._ieee.no_colons
+        self._ieee_with_colons = self._ieee.with_colons
 
         self._attr_name = "Auto Relock"
         self._attr_unique_id = f"{DOMAIN}_{self._ieee_no_colons}_auto_relock"
@@ -31,7 +32,7 @@ class AutoRelockSwitch(SwitchEntity):
         self.entity_id = f"switch.{clean_name}_auto_relock"
 
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, str(ieee))},
+            "identifiers": {(DOMAIN, self._ieee)},
             "name": lock_name,
             "manufacturer": "Nimly",
             "model": "Nimly Lock",
@@ -39,44 +40,60 @@ class AutoRelockSwitch(SwitchEntity):
             "entry_type": DeviceEntryType.SERVICE,
         }
 
-        self._attr_is_on = False  # default state before reading from device
+        # Value stored by the last run, else off, until read from the device
+        self._lock_state = get_lock_state(hass, self._ieee)
+        restored = self._lock_state.auto_relock
+        self._attr_is_on = bool(restored) if restored is not None else False
+
+    @property
+    def extra_state_attributes(self):
+        if self._lock_state.is_stale("auto_relock"):
+            return {"stale": True}
+        return None
+
+    @property
+    def available(self) -> bool:
+        return get_lock_breaker(self._hass, self._ieee).available
 
     async def async_added_to_hass(self):
 
         await super().async_added_to_hass()
+        self.async_on_remove(
+            get_lock_breaker(self._hass, self._ieee).async_add_listener(self.async_write_ha_state)
+        )
 
         #await log_basic_info(self._hass, self._ieee)
 
-        try:
-            value = await async_read_attribute_zbt1(
-                self.hass,
-                EUI64.convert(self._ieee),
-                endpoint=11,
-                cluster=0x0101,
-                attribute=0x0023
-            )
+        # Read once ZHA has the lock, together with the other entities' attributes
+        self.async_on_remove(
+            get_prefetch(self._hass, self._ieee).async_subscribe(0x0101, 0x0023, self._on_prefetched)
+        )
 
-            if isinstance(value, int):
-                self._attr_is_on = value >= 1
-                _LOGGER.info(f"[AutoRelockSwitch] Initial value: {value} -> {'On' if self._attr_is_on else 'Off'}")
-                self.async_write_ha_state()
-            else:
-                _LOGGER.warning(f"[AutoRelockSwitch] Unexpected attribute value: {value} ({type(value)})")
-        except Exception as e:
-            _LOGGER.warning(f"[AutoRelockSwitch] Failed to read Auto Relock: {e}")
+    def _on_prefetched(self, value):
+        if isinstance(value, int):
+            self._attr_is_on = value >= 1
+            self._lock_state.update(auto_relock=self._attr_is_on)
+            _LOGGER.info(f"[AutoRelockSwitch] Initial value: {value} -> {'On' if self._attr_is_on else 'Off'}")
+            self.async_write_ha_state()
+        else:
+            _LOGGER.warning(f"[AutoRelockSwitch] Unexpected attribute value: {value} ({type(value)})")
 
     async def async_turn_on(self, **kwargs):
         """Turn on auto relock (write 1)."""
         try:
-            await async_write_attribute_zbt1(
+            written = await async_write_attribute_zbt1(
                 self._hass,
                 ieee=self._ieee,
-                endpoint_id=11,
                 cluster_id=0x0101,
                 attribute_id=0x0023,
-                value=1
+                value=1,
+                verify=True,
             )
+            if not written:
+                _LOGGER.error("[AutoRelockSwitch] Lock did not confirm turning ON, keeping the last known state")
+                return
             self._attr_is_on = True
+            self._lock_state.update(auto_relock=True)
             self.async_write_ha_state()
             _LOGGER.info("[AutoRelockSwitch] Auto Relock enabled (1)")
         except Exception as e:
@@ -85,15 +102,19 @@ class AutoRelockSwitch(SwitchEntity):
     async def async_turn_off(self, **kwargs):
         """Turn off auto relock (write 0)."""
         try:
-            await async_write_attribute_zbt1(
+            written = await async_write_attribute_zbt1(
                 self._hass,
                 ieee=self._ieee,
-                endpoint_id=11,
                 cluster_id=0x0101,
                 attribute_id=0x0023,
-                value=0
+                value=0,
+                verify=True,
             )
+            if not written:
+                _LOGGER.error("[AutoRelockSwitch] Lock did not confirm turning OFF, keeping the last known state")
+                return
             self._attr_is_on = False
+            self._lock_state.update(auto_relock=False)
             self.async_write_ha_state()
             _LOGGER.info("[AutoRelockSwitch] Auto Relock disabled (0)")
         except Exception as e:
@@ -103,8 +124,7 @@ class AutoRelockSwitch(SwitchEntity):
 
 async def log_basic_info(hass, ieee):
     try:
-        ieee_obj = EUI64.convert(ieee)
-        endpoint = 1
+        ieee_obj = canonical_ieee(ieee)
         cluster_id = 0x0000  # Basic Cluster
         attributes = {
             0x0000: "ZCL Version",
@@ -120,10 +140,11 @@ async def log_basic_info(hass, ieee):
             0x4000: "SW Version",
         }
 
+        results = await async_read_attributes_zbt1(
+            hass, ieee_obj, [(cluster_id, attr_id) for attr_id in attributes]
+        )
         for attr_id, name in attributes.items():
-            value = await async_read_attribute_zbt1(
-                hass, ieee_obj, endpoint=endpoint, cluster=cluster_id, attribute=attr_id
-            )
+            value = results[(cluster_id, attr_id)]["value"]
             _LOGGER.info(f"[Zigbee Basic Info] {name} (0x{attr_id:04X}): {value}")
 
     except Exception as e:
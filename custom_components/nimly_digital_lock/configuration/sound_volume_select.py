@@ -1,13 +1,15 @@
-import asyncio
 import logging
 from homeassistant.components.select import SelectEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.core import HomeAssistant
-from zigpy.types import EUI64
 
 from ..const import DOMAIN
-from ..zbt1_support import async_read_attribute_zbt1, async_write_attribute_zbt1
+from ..ieee import canonical_ieee
+from ..lock_state import get_lock_state
+from ..state_bundles import VOLUME_BUNDLES, VOLUME_OPTIONS, VOLUME_UNKNOWN
+from ..prefetch import get_prefetch
+from ..zbt1_support import async_write_attribute_zbt1, get_lock_breaker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,13 +18,13 @@ class SoundVolumeSelect(SelectEntity):
     _attr_entity_category = EntityCategory.CONFIG
     _attr_has_entity_name = True
     _attr_icon = "mdi:volume-high"
-    _attr_options = ["Off", "Low", "Normal"]
+    _attr_options = VOLUME_OPTIONS
 
     def __init__(self, hass: HomeAssistant, ieee: str, lock_name: str) -> None:
         self.hass = hass
-        self._ieee = ieee.lower().replace(":", "")
+        self._ieee = canonical_ieee(ieee)
         self._attr_name = "Sound Volume"
-        self._attr_unique_id = f"{DOMAIN}_sound_volume_{self._ieee}"
+        self._attr_unique_id = f"{DOMAIN}_sound_volume_{self._ieee.no_colons}"
 
         clean_name = ''.join(c if c.isalnum() else '_' for c in lock_name.lower()).strip('_')
         while '__' in clean_name:
@@ -30,7 +32,7 @@ class SoundVolumeSelect(SelectEntity):
         self.entity_id = f"select.{clean_name}_sound_volume"
 
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, str(ieee))},
+            "identifiers": {(DOMAIN, self._ieee)},
             "name": lock_name,
             "manufacturer": "Nimly",
             "model": "Nimly Lock",
@@ -39,27 +41,41 @@ class SoundVolumeSelect(SelectEntity):
         }
 
         self._attr_current_option = None  # Will be updated on add
+        self._bundle = VOLUME_UNKNOWN
 
-    async def async_added_to_hass(self) -> None:
-        try:
-            await asyncio.sleep(10)
+        # Show the value stored by the last run until the lock is read
+        self._lock_state = get_lock_state(hass, self._ieee)
+        restored = self._lock_state.volume
+        if restored in (0, 1, 2):
+            self._set_option(self._attr_options[restored], fresh=False)
 
-            value = await async_read_attribute_zbt1(
-                self.hass,
-                EUI64.convert(self._ieee),
-                endpoint=11,
-                cluster=0x0101,
-                attribute=0x0024,
-            )
-            if isinstance(value, int) and value in (0, 1, 2):
-                self._attr_current_option = self._attr_options[value]
-                _LOGGER.info(f"[AM] [SoundVolume] Read initial value: {value}")
-            else:
-                _LOGGER.warning(f"[AM] [SoundVolume] Unexpected initial value: {value}")
-        except Exception as e:
-            _LOGGER.warning(f"[AM] [SoundVolume] Failed to read volume: {e}")
+    def _set_option(self, option: str, fresh: bool = True) -> None:
+        self._attr_current_option = option
+        self._bundle = VOLUME_BUNDLES[option]
+        if fresh:
+            self._lock_state.update(volume=self._bundle.attributes["volume_level"])
 
-        self.async_write_ha_state()
+    @property
+    def available(self) -> bool:
+        return get_lock_breaker(self.hass, self._ieee).available
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            get_lock_breaker(self.hass, self._ieee).async_add_listener(self.async_write_ha_state)
+        )
+
+        # Read once ZHA has the lock, together with the other entities' attributes
+        self.async_on_remove(
+            get_prefetch(self.hass, self._ieee).async_subscribe(0x0101, 0x0024, self._on_prefetched)
+        )
+
+    def _on_prefetched(self, value) -> None:
+        if isinstance(value, int) and value in (0, 1, 2):
+            self._set_option(self._attr_options[value])
+            _LOGGER.info(f"[AM] [SoundVolume] Read initial value: {value}")
+            self.async_write_ha_state()
+        else:
+            _LOGGER.warning(f"[AM] [SoundVolume] Unexpected initial value: {value}")
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
@@ -67,20 +83,23 @@ class SoundVolumeSelect(SelectEntity):
             _LOGGER.error(f"[AM] [SoundVolume] Invalid option: {option}")
             return
 
-        value = self._attr_options.index(option)
+        value = VOLUME_BUNDLES[option].attributes["volume_level"]
 
         try:
 
-            await async_write_attribute_zbt1(
+            written = await async_write_attribute_zbt1(
                 self.hass,
                 ieee=self._ieee,
-                endpoint_id=11,
                 cluster_id=0x0101,
                 attribute_id=0x0024,
                 value=value,
+                verify=True,
             )
+            if not written:
+                _LOGGER.error(f"[AM] [SoundVolume] Lock did not confirm volume {option}, keeping the last known state")
+                return
 
-            self._attr_current_option = option
+            self._set_option(option)
             self.async_write_ha_state()
             _LOGGER.info(f"[AM] [SoundVolume] Changed to: {option} ({value})")
         except Exception as e:
@@ -89,22 +108,14 @@ class SoundVolumeSelect(SelectEntity):
     @property
     def icon(self) -> str:
         """Return the icon based on volume level."""
-        icons = {
-            "Off": "mdi:volume-off",
-            "Low": "mdi:volume-medium",
-            "Normal": "mdi:volume-high",
-        }
-        return icons.get(self._attr_current_option, "mdi:volume-medium")
+        return self._bundle.icon
 
     @property
     def extra_state_attributes(self):
         """Return additional state attributes."""
-        if self._attr_current_option:
-            return {
-                "volume_label": self._attr_current_option,
-                "volume_level": self._attr_options.index(self._attr_current_option),
-            }
-        return {}
+        if self._lock_state.is_stale("volume"):
+            return {**self._bundle.attributes, "stale": True}
+        return self._bundle.attributes
 
     @property
     def should_poll(self) -> bool:
@@ -4,15 +4,14 @@ DOMAIN = "nimly_digital_lock"
 # Standard ZigBee Cluster IDs
 LOCK_CLUSTER_ID = 0x0101  # Door Lock cluster
 POWER_CLUSTER_ID = 0x0001  # Power Configuration cluster
-# We'll discover the correct endpoint ID during device initialization
-ENDPOINT_ID = None  # This will be discovered per device
 
 PLATFORMS = ["lock", "sensor", "select", "switch"]
 
-COMMON_ENDPOINTS = [11, 1, 242, 2, 3]
-
 SERVICE_UPDATE = "update"
 SERVICE_EXPORT = "export"
+SERVICE_SEND_DIRECT_COMMAND = "send_direct_command"
+SERVICE_SET_LOG_MODE = "set_log_mode"
+SERVICE_REDISCOVER_CAPABILITIES = "rediscover_capabilities"
 
 SERVICE_SCHEMAS = {
     SERVICE_UPDATE: vol.Schema({}),
@@ -57,3 +56,123 @@ ATTRIBUTE_CLUSTER_MAPPING = {
     "door_state": (LOCK_CLUSTER_ID, 0x0003),
     "lock_state": (LOCK_CLUSTER_ID, 0x0000),
 }
+
+# Seconds a read attribute value stays valid in the attribute cache.
+# Anything not listed uses the default, which only coalesces reads that
+# happen at (nearly) the same time.
+DEFAULT_ATTRIBUTE_CACHE_TTL = 5
+ATTRIBUTE_CACHE_TTL = {
+    (LOCK_CLUSTER_ID, 0x0001): 3600,  # lock type
+    (LOCK_CLUSTER_ID, 0x0011): 900,  # total users
+    (LOCK_CLUSTER_ID, 0x0012): 900,  # PIN users
+    (LOCK_CLUSTER_ID, 0x0013): 900,  # RFID users
+    (LOCK_CLUSTER_ID, 0x0017): 3600,  # max PIN length
+    (LOCK_CLUSTER_ID, 0x0018): 3600,  # min PIN length
+    (LOCK_CLUSTER_ID, 0x0019): 3600,  # max RFID length
+    (LOCK_CLUSTER_ID, 0x001A): 3600,  # min RFID length
+    (LOCK_CLUSTER_ID, 0x0023): 600,  # auto relock time
+    (LOCK_CLUSTER_ID, 0x0024): 600,  # sound volume
+}
+
+# Attribute discovery runs once per (manufacturer, model, firmware) on
+# these clusters; the result is persisted and unsupported attributes are
+# neither read, reported nor given an entity.
+CAPABILITY_CLUSTERS = (LOCK_CLUSTER_ID, POWER_CLUSTER_ID)
+CAPABILITY_STORAGE_KEY = f"{DOMAIN}.capabilities"
+CAPABILITY_STORAGE_VERSION = 1
+
+# Poll scheduler: seconds between periodic reads, the +/- fraction of
+# jitter applied to every interval and the number of reads allowed to be
+# in flight towards the coordinator at once.
+BATTERY_POLL_INTERVAL = 400
+RSSI_POLL_INTERVAL = 120
+POLL_JITTER = 0.1
+POLL_MAX_IN_FLIGHT = 2
+
+# Diagnostic attributes (lock type, user counts, PIN/RFID limits) rarely
+# change; enabled ones are refreshed together this often, or on demand.
+DIAGNOSTIC_REFRESH_INTERVAL = 3600
+
+# Attribute reporting: configure the lock to push these attributes instead
+# of polling them. Values are (min interval s, max interval s, reportable
+# change). Polling only runs as a fallback when no report arrived within
+# the max interval.
+CONF_USE_REPORTING = "use_reporting"
+DEFAULT_USE_REPORTING = True
+REPORTING_CONFIG = {
+    POWER_CLUSTER_ID: {
+        0x0021: (3600, 21600, 2),  # battery percentage, 1% change
+    },
+    LOCK_CLUSTER_ID: {
+        0x0103: (60, 900, 1),  # link diagnostics (parent, RSSI)
+    },
+}
+
+# Optimistic lock state: show the requested state at once, confirm it from
+# the 0x0000 lock state report or 0x0100 operation event and roll back when
+# nothing confirms within the timeout (seconds) or the door reports jammed.
+CONF_OPTIMISTIC_STATE = "optimistic_state"
+DEFAULT_OPTIMISTIC_STATE = True
+OPTIMISTIC_CONFIRM_TIMEOUT = 15
+OPTIMISTIC_PENDING = "pending"
+OPTIMISTIC_CONFIRMED = "confirmed"
+OPTIMISTIC_ROLLED_BACK = "rolled_back"
+
+# Circuit breaker: consecutive failures before a lock is treated as off the
+# mesh, and the first/maximum seconds between probe reads while it is.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_PROBE_BACKOFF = 60
+CIRCUIT_MAX_PROBE_BACKOFF = 1800
+
+# Seconds within which the same attribute value without a receive timestamp
+# is treated as a second delivery of one report.
+REPORT_DEDUP_WINDOW = 1.0
+
+# Seconds to collect state writes of an entity before writing once; 0 means
+# at the end of the current event loop iteration.
+STATE_WRITE_COALESCE_WINDOW = 0
+
+# Minimum seconds between logbook entries per lock and category. Repeats of
+# the same message in between are merged into one entry. Access events,
+# door state included, are never throttled.
+LOGBOOK_RATE_LIMITS = {
+    "access": 0,
+    "battery": 3600,
+    "diagnostic": 900,
+}
+
+# Hot-path logging: "quiet" drops hot-path messages, "sampled" emits every
+# LOG_SAMPLE_EVERY-th call per call site and at most LOG_SITE_RATE_LIMIT per
+# LOG_SITE_RATE_WINDOW seconds, "trace" emits everything.
+LOG_MODE_QUIET = "quiet"
+LOG_MODE_SAMPLED = "sampled"
+LOG_MODE_TRACE = "trace"
+LOG_MODES = [LOG_MODE_QUIET, LOG_MODE_SAMPLED, LOG_MODE_TRACE]
+DEFAULT_LOG_MODE = LOG_MODE_SAMPLED
+LOG_SAMPLE_EVERY = 20
+LOG_SITE_RATE_LIMIT = 5
+LOG_SITE_RATE_WINDOW = 60
+
+# Sensor write policy: a new value is written only if it moved at least the
+# deadband away from the last written value and the minimum interval since
+# that write has passed; the heartbeat (minutes, 0 = off) forces a write.
+CONF_RSSI_DEADBAND = "rssi_deadband"
+DEFAULT_RSSI_DEADBAND = 3
+CONF_RSSI_MIN_INTERVAL = "rssi_min_interval"
+DEFAULT_RSSI_MIN_INTERVAL = 300
+CONF_SENSOR_HEARTBEAT = "sensor_heartbeat"
+DEFAULT_SENSOR_HEARTBEAT = 60
+BATTERY_DEADBAND = 1
+BATTERY_MIN_INTERVAL = 0
+
+# Last known lock state is persisted so entities start with real values;
+# writes are debounced by this many seconds.
+STATE_STORAGE_KEY = f"{DOMAIN}.lock_state"
+STATE_STORAGE_VERSION = 1
+STATE_SAVE_DELAY = 30
+
+# Startup prefetch: how long to wait for ZHA to report the lock available
+# and how often to check (doubling up to the maximum), in seconds.
+PREFETCH_READY_TIMEOUT = 120
+PREFETCH_CHECK_INTERVAL = 0.5
+PREFETCH_MAX_CHECK_INTERVAL = 5
@@ -0,0 +1,125 @@
+"""Integration-wide coordinator shared by every lock config entry."""
+import asyncio
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import HomeAssistant
+
+from .attribute_cache import get_attribute_cache
+from .capabilities import get_capabilities
+from .const import DOMAIN, SERVICE_UPDATE
+from .ieee import IEEEAddress, canonical_ieee
+from .lock_state import get_lock_state_store
+from .logbook_sink import get_logbook_sink
+from .scheduler import get_scheduler
+from .state_writer import get_state_writer
+from .services import async_register_services, async_unregister_services
+from .zbt1_support import get_resolver
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NimlyCoordinator:
+    """Own everything the locks share: services, device resolution, scheduling and caches.
+
+    The first config entry sets it up; every entry after that only attaches
+    its lock, so adding a lock costs the same however many are configured.
+    The shared parts are torn down when the last lock is detached.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.resolver = get_resolver(hass)
+        self.scheduler = get_scheduler(hass)
+        self.attribute_cache = get_attribute_cache(hass)
+        self.capabilities = get_capabilities(hass)
+        self.lock_state_store = get_lock_state_store(hass)
+        self.locks = {}
+        self._setup_task = None
+        self._unsub_started = None
+
+    async def _async_setup(self) -> None:
+        domain_data = self.hass.data.setdefault(DOMAIN, {})
+        domain_data.setdefault("device_registry", {})
+        domain_data.setdefault("locks", {})
+
+        await async_register_services(self.hass)
+        # Entities start from the last known state instead of defaults, and
+        # platforms leave out entities for attributes the model lacks
+        await asyncio.gather(self.lock_state_store.async_load(), self.capabilities.async_load())
+
+        # One device registry scan once Home Assistant has started, not one per lock
+        if not self.hass.is_running:
+            self._unsub_started = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STARTED, self._async_initial_update
+            )
+        _LOGGER.info("[Coordinator] Shared services, caches and scheduler set up")
+
+    async def _async_initial_update(self, event) -> None:
+        self._unsub_started = None
+        await self.hass.services.async_call(DOMAIN, SERVICE_UPDATE)
+
+    async def async_attach(self, entry: ConfigEntry) -> IEEEAddress:
+        """Set up the shared parts on first use and add the entry's lock."""
+        if self._setup_task is None:
+            self._setup_task = self.hass.async_create_task(self._async_setup())
+        try:
+            await asyncio.shield(self._setup_task)
+        except Exception:
+            self._setup_task = None  # let the next entry try again
+            raise
+
+        ieee = canonical_ieee(entry.data["ieee"])
+        self.locks[entry.entry_id] = ieee
+        _LOGGER.debug("[Coordinator] Attached %s (%d lock(s))", ieee, len(self.locks))
+        return ieee
+
+    def async_detach(self, entry: ConfigEntry) -> None:
+        """Remove the entry's lock; the last one tears the shared parts down."""
+        ieee = self.locks.pop(entry.entry_id, None)
+        domain_data = self.hass.data.get(DOMAIN, {})
+        # Stop the lock's probe timer, queued traffic and startup pass; a
+        # reloaded entry starts with a new breaker, queue and startup pass
+        breaker = domain_data.get("circuit_breakers", {}).pop(ieee, None)
+        if breaker is not None:
+            breaker.shutdown()
+        queue = domain_data.get("command_queues", {}).pop(ieee, None)
+        if queue is not None:
+            queue.shutdown()
+        prefetch = domain_data.get("prefetch", {}).pop(ieee, None)
+        if prefetch is not None:
+            prefetch.shutdown()
+        if self.locks:
+            return
+
+        if self._unsub_started is not None:
+            self._unsub_started()
+            self._unsub_started = None
+        async_unregister_services(self.hass)
+        self.resolver.detach()
+        self.scheduler.shutdown()
+        get_state_writer(self.hass).shutdown()
+        get_logbook_sink(self.hass).shutdown()
+        self.hass.data.get(DOMAIN, {}).pop("coordinator", None)
+        _LOGGER.info("[Coordinator] Last lock removed, shared services stopped")
+
+    def as_dict(self) -> dict:
+        """Return the coordinator state for diagnostics."""
+        return {
+            "locks": len(self.locks),
+            "resolver": {
+                "hits": self.resolver.hits,
+                "misses": self.resolver.misses,
+                "invalidations": self.resolver.invalidations,
+            },
+        }
+
+
+def get_coordinator(hass: HomeAssistant) -> NimlyCoordinator:
+    """Return the integration coordinator, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    coordinator = domain_data.get("coordinator")
+    if coordinator is None:
+        coordinator = domain_data["coordinator"] = NimlyCoordinator(hass)
+    return coordinator
@@ -0,0 +1,111 @@
+"""Shared, batched refresh of the lock's diagnostic attributes."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .command_queue import PRIORITY_POLL
+from .const import DIAGNOSTIC_REFRESH_INTERVAL, DOMAIN, LOCK_CLUSTER_ID
+from .ieee import canonical_ieee
+from .scheduler import get_scheduler
+from .zbt1_support import READ_STATUS_SUCCESS, async_read_attributes_zbt1
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DiagnosticAttributes:
+    """Keep the diagnostic sensors of one lock filled from one read.
+
+    Only sensors that are enabled get added to Home Assistant, so only they
+    register here. All registered attributes are read together in one
+    batched read, every ``DIAGNOSTIC_REFRESH_INTERVAL`` seconds (answered
+    from the attribute cache while the values are within their TTL) or on
+    demand. Concurrent refreshes share the read that is already running.
+    """
+
+    def __init__(self, hass: HomeAssistant, ieee):
+        self._hass = hass
+        self._ieee = canonical_ieee(ieee)
+        self._callbacks = {}
+        self._unregister_poll = None
+        self._refresh_task = None
+        self._refresh_forced = False
+        self.values = {}
+        self.last_refresh = None
+        self.refreshes = 0
+
+    @callback
+    def async_register(self, attribute: int, value_callback):
+        """Call ``value_callback(value)`` on every refresh; returns an unregister."""
+        self._callbacks[attribute] = value_callback
+        if self._unregister_poll is None:
+            self._unregister_poll = get_scheduler(self._hass).async_register(
+                f"{self._ieee.no_colons}:diagnostics", DIAGNOSTIC_REFRESH_INTERVAL, self._async_poll
+            )
+
+        def _unregister():
+            if self._callbacks.get(attribute) is value_callback:
+                del self._callbacks[attribute]
+            if not self._callbacks and self._unregister_poll is not None:
+                self._unregister_poll()
+                self._unregister_poll = None
+
+        return _unregister
+
+    async def _async_poll(self) -> None:
+        await self.async_refresh()
+
+    async def async_refresh(self, force: bool = False) -> None:
+        """Read all registered attributes; ``force`` bypasses the attribute cache.
+
+        A forced refresh does not join a running one that may be answered
+        from the cache.
+        """
+        if self._refresh_task is None or self._refresh_task.done() or (force and not self._refresh_forced):
+            self._refresh_forced = force
+            self._refresh_task = self._hass.async_create_task(self._async_refresh(force))
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh(self, force: bool) -> None:
+        wanted = [(LOCK_CLUSTER_ID, attribute) for attribute in self._callbacks]
+        if not wanted:
+            return
+        results = await async_read_attributes_zbt1(
+            self._hass, self._ieee, wanted, max_age=0 if force else None, priority=PRIORITY_POLL
+        )
+        self.refreshes += 1
+        self.last_refresh = time.time()
+        _LOGGER.debug("[Diagnostics] Refreshed %d attribute(s) of %s (force=%s)", len(wanted), self._ieee, force)
+
+        for key in wanted:
+            result = results.get(key)
+            if result is None or result["status"] != READ_STATUS_SUCCESS:
+                continue
+            attribute = key[1]
+            value = result["value"]
+            if self.values.get(attribute) == value and not force:
+                continue
+            self.values[attribute] = value
+            value_callback = self._callbacks.get(attribute)
+            if value_callback is not None:
+                value_callback(value)
+
+    def as_dict(self) -> dict:
+        """Return the registered attributes and last values for diagnostics."""
+        return {
+            "attributes": sorted(f"{attribute:#06x}" for attribute in self._callbacks),
+            "values": {f"{attribute:#06x}": value for attribute, value in self.values.items()},
+            "last_refresh": self.last_refresh,
+            "refreshes": self.refreshes,
+        }
+
+
+def get_diagnostic_attributes(hass: HomeAssistant, ieee) -> DiagnosticAttributes:
+    """Return the diagnostic attribute refresher of a lock, creating it on first use."""
+    refreshers = hass.data.setdefault(DOMAIN, {}).setdefault("diagnostic_attributes", {})
+    key = canonical_ieee(ieee)
+    refresher = refreshers.get(key)
+    if refresher is None:
+        refresher = refreshers[key] = DiagnosticAttributes(hass, key)
+    return refresher
@@ -3,22 +3,34 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, COMMON_ENDPOINTS
+from .capabilities import model_key
+from .const import DOMAIN
+from .ieee import canonical_ieee
+from .utils.hotpath_log import get_log_mode
 
 _LOGGER = logging.getLogger(__name__)
 
 TO_REDACT = {"ieee", "unique_id", "identifiers"}
 
+
+def _as_dict(obj, *args):
+    return obj.as_dict(*args) if obj is not None else None
+
+
+def _entity_key(unique_id: str, ieee) -> str:
+    """Return ``unique_id`` without the domain prefix and the IEEE part."""
+    parts = unique_id.removeprefix(f"{DOMAIN}_").split("_")
+    return "_".join(part for part in parts if part != ieee.no_colons)
+
+
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
     """Return diagnostics for a config entry."""
-    ieee = entry.data["ieee"]
-    ieee_no_colons = ieee.replace(':', '')
-    ieee_with_colons = ':'.join([ieee_no_colons[i:i+2] for i in range(0, len(ieee_no_colons), 2)])
+    ieee = canonical_ieee(entry.data["ieee"])
 
-    device_data = {}
-    for key in hass.data:
-        if key.startswith(f"{DOMAIN}:{ieee}:"):
-            device_data[key.replace(f"{DOMAIN}:{ieee}:", "")] = hass.data[key]
+    # Only report what exists; looking at diagnostics must not create anything
+    domain_data = hass.data.get(DOMAIN, {})
+    lock_state = domain_data.get("locks", {}).get(ieee)
+    device_data = lock_state.as_dict() if lock_state is not None else None
 
     available_services = {}
     service_domains = ["zigbee", "zha"]
@@ -33,43 +45,32 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
         for method in service_methods:
             available_services[domain][method] = hass.services.has_service(domain, method)
 
-    # Get all data with domain prefix
-    domain_data = {}
-    for key in hass.data:
-        if key.startswith(f"{DOMAIN}_"):
-            # Redact any sensitive information
-            if "IEEE" in key or "ZHA_DEVICE" in key:
-                domain_data[key] = "REDACTED"
-            else:
-                domain_data[key] = hass.data[key]
-
-    # Test communication with lock on different endpoints
-    endpoint_test = {}
-    for endpoint in COMMON_ENDPOINTS:
+    # Endpoint serving each cluster, as resolved from the device descriptor
+    resolver = domain_data.get("resolver")
+    endpoints = {}
+    model = None
+    if resolver is not None:
         try:
-            # Try to send a simple read command to the endpoint
-            service_data = {
-                "ieee": ieee_with_colons,
-                "endpoint_id": endpoint,
-                "cluster_id": 0x0101,  # Lock cluster
-                "attribute": 0x0000,   # Lock state attribute
-                "manufacturer": None
-            }
-
-            # Try with both service domains
-            for domain in service_domains:
-                for method in ["get_zigbee_cluster_attribute", "read_zigbee_cluster_attribute"]:
-                    if hass.services.has_service(domain, method):
-                        try:
-                            endpoint_test[f"{endpoint}_{domain}_{method}"] = "Testing..."
-                            await hass.services.async_call(
-                                domain, method, service_data, blocking=True
-                            )
-                            endpoint_test[f"{endpoint}_{domain}_{method}"] = "Success"
-                        except Exception as e:
-                            endpoint_test[f"{endpoint}_{domain}_{method}"] = f"Failed: {str(e)}"
-        except Exception as e:
-            endpoint_test[f"endpoint_{endpoint}"] = f"Error: {str(e)}"
+            endpoints = resolver.endpoints_as_dict(ieee)
+            zha_device = resolver.get_device(ieee)
+            model = model_key(zha_device) if zha_device is not None else None
+        except (KeyError, AttributeError):
+            pass  # ZHA not loaded
+
+    # Job keys start with the lock's IEEE; list this lock's jobs without it
+    scheduler = _as_dict(domain_data.get("scheduler"))
+    if scheduler is not None:
+        prefix = f"{ieee.no_colons}:"
+        scheduler["job_details"] = {
+            key.removeprefix(prefix): job
+            for key, job in scheduler["job_details"].items()
+            if key.startswith(prefix)
+        }
+
+    duplicate_reports_suppressed = (
+        lock_state.entity.duplicate_reports_suppressed
+        if lock_state is not None and lock_state.entity is not None else 0
+    )
 
     return {
         "entry": async_redact_data(entry.as_dict(), TO_REDACT),
@@ -79,7 +80,25 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
             "with_colons": "REDACTED"
         },
         "device_data": device_data,
-        "domain_data": domain_data,
+        "locks": len(domain_data.get("locks", {})),
         "available_services": available_services,
-        "endpoint_test": endpoint_test
+        "endpoints": endpoints,
+        "coordinator": _as_dict(domain_data.get("coordinator")),
+        "scheduler": scheduler,
+        "command_queue": _as_dict(domain_data.get("command_queues", {}).get(ieee)),
+        "retries": _as_dict(domain_data.get("retry_stats", {}).get(ieee)),
+        "circuit_breaker": _as_dict(domain_data.get("circuit_breakers", {}).get(ieee)),
+        "duplicate_reports_suppressed": duplicate_reports_suppressed,
+        "state_writes": _as_dict(domain_data.get("state_writer")),
+        "logbook": _as_dict(domain_data.get("logbook_sink")),
+        "attribute_cache": _as_dict(domain_data.get("attribute_cache")),
+        "log_mode": get_log_mode(),
+        "startup": _as_dict(domain_data.get("prefetch", {}).get(ieee)),
+        "diagnostic_attributes": _as_dict(domain_data.get("diagnostic_attributes", {}).get(ieee)),
+        "capabilities": _as_dict(domain_data.get("capabilities"), model),
+        "sensor_writes": {
+            _entity_key(unique_id, ieee): policy.as_dict()
+            for unique_id, policy in domain_data.get("write_policies", {}).items()
+            if ieee.no_colons in unique_id.split("_")
+        },
     }
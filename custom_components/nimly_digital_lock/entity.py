@@ -1,20 +1,70 @@
-import asyncio
+import functools
 import logging
-import struct
+import time
 import traceback
 from typing import Any
 
 from homeassistant.components.lock import LockEntity
-from homeassistant.components.logbook import async_log_entry
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceEntryType
-from zigpy.types import EUI64
-from zigpy.zcl.clusters.closures import LockState
-
-from .const import DOMAIN
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    LOCK_CLUSTER_ID,
+    POWER_CLUSTER_ID,
+    BATTERY_POLL_INTERVAL,
+    RSSI_POLL_INTERVAL,
+    DEFAULT_USE_REPORTING,
+    REPORTING_CONFIG,
+    DEFAULT_OPTIMISTIC_STATE,
+    OPTIMISTIC_CONFIRM_TIMEOUT,
+    OPTIMISTIC_PENDING,
+    OPTIMISTIC_CONFIRMED,
+    OPTIMISTIC_ROLLED_BACK,
+    REPORT_DEDUP_WINDOW,
+)
+from .command_queue import PRIORITY_COMMAND, PRIORITY_POLL, get_command_queue
+from .ieee import canonical_ieee
+from .lock_state import get_lock_state
+from .logbook_sink import CATEGORY_ACCESS, CATEGORY_BATTERY, get_logbook_sink
+from .report_decoder import (
+    ATTR_ACTUATOR_ENABLED,
+    ATTR_BATTERY_PERCENT,
+    ATTR_DOOR_STATE,
+    ATTR_LINK_DIAGNOSTICS,
+    ATTR_LOCK_STATE,
+    ATTR_LOCK_TYPE,
+    ATTR_OPERATION_EVENT,
+    ATTR_PIN_USED,
+    ATTR_RFID_USED,
+    DOOR_STATE_JAMMED,
+    LOCK_EVENTS,
+    decode_battery_percent,
+    decode_door_state,
+    decode_link_diagnostics,
+    decode_lock_state,
+    decode_operation_event,
+    decode_rfid,
+)
+from .prefetch import get_prefetch
+from .scheduler import get_scheduler
+from .state_writer import get_state_writer
+from .utils.hotpath_log import HotPathLogger
+from .zbt1_support import (
+    async_configure_reporting_zbt1,
+    async_read_attribute_zbt1,
+    async_send_command_zbt1,
+    attribute_supported,
+    get_lock_breaker,
+    report_is_fresh,
+    resolve_endpoint,
+)
 
 DATA_ZHA = "zha"
 
 _LOGGER = logging.getLogger(__name__)
+_HOT_LOGGER = HotPathLogger(_LOGGER)
 
 
 class NimlyDigitalLock(LockEntity):
@@ -38,179 +88,167 @@ class NimlyDigitalLock(LockEntity):
 
             # First try to get sensor from local registry
             sensor = self._diagnostic_sensors.get(key)
+            self._lock_state.update(**{key: value})  # "battery" / "rssi"
 
-            _LOGGER.info(f"[AM] [_update_sensor] Updating sensor - key: {key}, value: {value}")
-            _LOGGER.info(f"[AM] [_update_sensor] Found sensor to update: {sensor.entity_id}")
+            _HOT_LOGGER.info(
+                "update_sensor", "[AM] [_update_sensor] Updating %s (%s) with value: %s", sensor.entity_id, key, value
+            )
             sensor.update_state(value)
-            _LOGGER.info(f"[AM] [_update_sensor] Sensor update completed with value: {value}")
 
         except Exception as e:
             _LOGGER.error(f"[AM] [_update_sensor] Failed to update sensor: {str(e)}", exc_info=True)
 
 
 
-    def set_cluster_listener(self, listener):
-        self._cluster_listener = listener
-
-    def attribute_updated(self, attr_id, value):
-        _LOGGER.info(f"Received lock attribute report: {attr_id:#06x}, Value: {value}")
-
-        # 0x0000 - Lock State
-        if attr_id == 0x0000:
-            self._is_locked = LockState(value) == LockState.Locked
-
-            #lock_state_str = "Locked" if self._is_locked else "Unlocked"
-            #self._update_sensor("lock_state", lock_state_str)
-
-            self._hass.data[f"{DOMAIN}:{self._ieee}:lock_state"] = 1 if self._is_locked else 0
-            self.async_write_ha_state()
-            _LOGGER.info(f"Lock is now: {'locked' if self._is_locked else 'unlocked'}")
-
-            # Update diagnostics entity state attribute
-            #self._attr_extra_state_attributes = {
-            #    **(self._attr_extra_state_attributes or {}),
-            #    "Lock state": "Locked" if self._is_locked else "Unlocked"
-            #}
-
-        # 0x0001 - Lock Type (Optional)
-        elif attr_id == 0x0001:
-            _LOGGER.info(f"Lock type reported: {value}")
-
-        # 0x0002 - Actuator Enabled (Optional)
-        elif attr_id == 0x0002:
-            enabled_str = "enabled" if value else "disabled"
-            _LOGGER.info(f"Actuator is {enabled_str}")
-
-        # 0x0003 - Door State (Optional)
-        elif attr_id == 0x0003:
-            door_state_map = {
-                0x00: "Open",
-                0x01: "Closed",
-                0x02: "Error",
-                0x03: "Jammed",
-                0x04: "Forced Open",
-            }
-            door_state = door_state_map.get(value, f"Unknown ({value})")
-            _LOGGER.info(f"Door state: {door_state}")
-            async_log_entry(
-                self._hass,
-                name="Nimly Lock",
-                message=f"Door state: {door_state}",
-                domain=DOMAIN,
-                entity_id=self.entity_id,
-            )
+    def _schedule_write(self):
+        """Write state once per loop iteration, however many reports changed it."""
+        self._state_writer.async_schedule_write(self)
 
-        # 0x0021 - Battery Percentage Remaining (Power Cluster)
-        elif attr_id == 0x0021:  # Battery Percentage Remaining
-            battery_percent = int(value / 2)  # value is in half-percent units
-            _LOGGER.info(f"Battery level: {battery_percent}%")
-
-            if (
-                    DOMAIN in self._hass.data
-                    and "battery_sensors" in self._hass.data[DOMAIN]
-            ):
-                ieee_no_colons = self._ieee.lower().replace(":", "")
-                if ieee_no_colons in self._hass.data[DOMAIN]["battery_sensors"]:
-                    self._hass.data[DOMAIN]["battery_sensors"][ieee_no_colons].update_state(battery_percent)
-                    _LOGGER.info(f"Updated battery sensor with {battery_percent}%")
-
-            self._update_sensor("battery", battery_percent)
-            self.async_write_ha_state()
-
-            async_log_entry(
-                self._hass,
-                name="Nimly Lock",
-                message=f"Battery level: {battery_percent}%",
-                domain=DOMAIN,
-                entity_id=self.entity_id,
-            )
+    def frame_received(self):
+        """Any frame from the lock proves it is reachable."""
+        self._breaker.record_success()
 
-        # 0x0100 - Event Status (User + Action + Method)
-        elif attr_id == 0x0100 and isinstance(value, int):
-            user_id = value & 0xFFFF
-            event = (value >> 16) & 0xFF
-            method = (value >> 24) & 0xFF
-
-            event_str = {1: "Locked", 2: "Unlocked"}.get(event, f"Unknown ({event})")
-            method_str = {
-                0: "Key", 1: "Button", 2: "Code Panel (PIN)",
-                3: "Fingerprint", 4: "RFID", 5: "Other"
-            }.get(method, f"Unknown ({method})")
-
-            _LOGGER.info(f"Lock Event: {event_str} via {method_str}, User ID: {user_id}")
-            self._hass.data[f"{DOMAIN}:{self._ieee}:last_method"] = method_str
-
-            async_log_entry(
-                self._hass,
-                name="Nimly Lock",
-                message=f"{event_str} via {method_str} (User ID: {user_id})",
-                domain=DOMAIN,
-                entity_id=self.entity_id,
-            )
+    def set_cluster_listeners(self, listeners):
+        """Attach each ``(cluster, listener)`` pair while the entity is added."""
+        self._cluster_listeners = list(listeners)
+
+    def _is_duplicate_report(self, key, value, received_timestamp):
+        """Return True for the second delivery of a report already handled.
+
+        A sleepy lock can send the same report again when it misses the APS
+        ack. Deliveries carrying the same receive timestamp are the same
+        frame; without a timestamp the same value inside the dedup window is
+        treated as a repeat.
+        """
+        now = time.monotonic()
+        last = self._last_reports.get(key)
+        self._last_reports[key] = (value, received_timestamp, now)
+        if last is None:
+            return False
+        last_value, last_timestamp, last_seen = last
+        if last_value != value:
+            return False
+        if received_timestamp is not None and last_timestamp is not None:
+            return received_timestamp == last_timestamp
+        return now - last_seen <= REPORT_DEDUP_WINDOW
+
+    def attribute_updated(self, cluster_id, attr_id, value, received_timestamp=None):
+        key = (cluster_id, attr_id)
+        if self._is_duplicate_report(key, value, received_timestamp):
+            self.duplicate_reports_suppressed += 1
+            _LOGGER.debug("Suppressed duplicate report: %#06x/%#06x = %s", cluster_id, attr_id, value)
+            return
+
+        handler = self._report_handlers.get(key)
+        if handler is None:
+            _LOGGER.debug("Unhandled attribute report: %#06x/%#06x = %s", cluster_id, attr_id, value)
+            return
+        handler(value)
+
+    def _on_lock_state(self, value):
+        locked = decode_lock_state(value)
+        if self._pending_target is not None and locked != self._pending_target:
+            # Stale report from before the command; keep waiting for the target
+            _LOGGER.debug("Ignoring lock state %s while waiting for %s", locked, self._pending_target)
+            return
+        self._set_locked(locked)
+        self._confirm_optimistic()
+        self._schedule_write()
+        _LOGGER.debug("Lock is now: %s", "locked" if self._lock_state.locked else "unlocked")
+
+    def _on_lock_type(self, value):
+        _LOGGER.debug("Lock type reported: %s", value)
+
+    def _on_actuator_enabled(self, value):
+        _LOGGER.debug("Actuator is %s", "enabled" if value else "disabled")
+
+    def _on_door_state(self, value):
+        door_state = decode_door_state(value)
+        _LOGGER.debug("Door state: %s", door_state)
+        self._lock_state.update(door_state=door_state)
+
+        if value == DOOR_STATE_JAMMED:
+            if self._pending_target is not None:
+                self._rollback_optimistic(jammed=True)
+            else:
+                self._attr_is_jammed = True
+                self._schedule_write()
+        elif self._attr_is_jammed:
+            self._attr_is_jammed = False
+            self._schedule_write()
+
+        # Door state changes are access events and never throttled
+        self._logbook.async_log(self.entity_id, CATEGORY_ACCESS, f"Door state: {door_state}")
+
+    def _on_battery_percent(self, value):
+        battery_percent = decode_battery_percent(value)
+        _LOGGER.debug("Battery level: %s%%", battery_percent)
+
+        self._update_sensor("battery", battery_percent)
+        self._schedule_write()
 
-        # 0x0101 - PIN Used
-        elif attr_id == 0x0101 and isinstance(value, bytes):
-            try:
-                pin = value.decode(errors="ignore")
-                _LOGGER.info(f"Wrong PIN used: {pin}")
-                async_log_entry(
-                    self._hass,
-                    name="Nimly Lock",
-                    message=f"Wrong PIN used",
-                    domain=DOMAIN,
-                    entity_id=self.entity_id,
-                )
-            except Exception as e:
-                _LOGGER.warning(f"Could not decode PIN value: {value} ({e})")
-
-        # 0x0102 - RFID Used
-        elif attr_id == 0x0102 and isinstance(value, bytes):
-            try:
-                rfid = value.hex().upper()
-                _LOGGER.info(f"RFID used: {rfid}")
-                async_log_entry(
-                    self._hass,
-                    name="Nimly Lock",
-                    message=f"RFID used: {rfid}",
-                    domain=DOMAIN,
-                    entity_id=self.entity_id,
-                )
-            except Exception as e:
-                _LOGGER.warning(f"Could not decode RFID value: {value} ({e})")
-
-        # 0x0103 - Diagnostics / Result Code
-        # elif attr_id == 0x0103 and isinstance(value, int):
-        #     result_code = value
-        #     result_str = "OK" if result_code == 0 else f"Error Code {result_code}"
-        #     _LOGGER.info(f"Lock operation result: {result_str}")
-        #     async_log_entry(
-        #         self._hass,
-        #         name="Nimly Lock",
-        #         message=f"Lock result: {result_str}",
-        #         domain=DOMAIN,
-        #         entity_id=self.entity_id,
-        #     )
-
-        else:
-            _LOGGER.debug(f"Unhandled attribute report: {attr_id:#06x} = {value}")
+        self._logbook.async_log(self.entity_id, CATEGORY_BATTERY, f"Battery level: {battery_percent}%")
+
+    def _on_operation_event(self, value):
+        if not isinstance(value, int):
+            return
+        user_id, event, _method, event_str, method_str = decode_operation_event(value)
+
+        _LOGGER.debug("Lock Event: %s via %s, User ID: %s", event_str, method_str, user_id)
+        self._lock_state.update(last_method=method_str, last_user_id=user_id)
+
+        if self._pending_target is not None and event in LOCK_EVENTS and (event == 1) == self._pending_target:
+            self._set_locked(self._pending_target)
+            self._confirm_optimistic()
+            self._schedule_write()
+
+        self._logbook.async_log(
+            self.entity_id, CATEGORY_ACCESS, f"{event_str} via {method_str} (User ID: {user_id})"
+        )
+
+    def _on_pin_used(self, value):
+        if not isinstance(value, bytes):
+            return
+        _LOGGER.debug("Wrong PIN used")
+        self._logbook.async_log(self.entity_id, CATEGORY_ACCESS, "Wrong PIN used")
+
+    def _on_rfid_used(self, value):
+        if not isinstance(value, bytes):
+            return
+        rfid = decode_rfid(value)
+        _LOGGER.debug("RFID used: %s", rfid)
+        self._logbook.async_log(self.entity_id, CATEGORY_ACCESS, f"RFID used: {rfid}")
+
+    def _report_is_fresh(self, cluster_id, attribute):
+        """Return True if reporting covers an attribute and a report arrived in time."""
+        if (cluster_id, attribute) not in self._reporting:
+            return False
+        max_interval = REPORTING_CONFIG[cluster_id][attribute][1]
+        return report_is_fresh(self._hass, self._ieee, cluster_id, attribute, max_interval)
 
     async def _poll_battery(self):
-        _LOGGER.info(f"[AM] [_poll_battery] POLLING BATTERY")
+        if not attribute_supported(self._hass, self._ieee, POWER_CLUSTER_ID, 0x0021):
+            return
+        if self._report_is_fresh(POWER_CLUSTER_ID, 0x0021):
+            _LOGGER.debug("[AM] [_poll_battery] Battery reported recently, skipping poll")
+            return
+
+        _HOT_LOGGER.info("poll_battery", "[AM] [_poll_battery] Polling battery of %s", self._name)
 
-        from .zbt1_support import async_read_attribute_zbt1
         try:
             value = await async_read_attribute_zbt1(
                 self.hass,
                 self._ieee,
-                endpoint=1,
+                endpoint=None,
                 cluster=0x0001,
-                attribute=0x0021
+                attribute=0x0021,
+                priority=PRIORITY_POLL,
             )
 
             if isinstance(value, int):
                 battery_percent = min(100, round(value / 2))
 
-                _LOGGER.info(f"[AM] [Battery] Polled battery: {battery_percent}%")
+                _HOT_LOGGER.info("poll_battery_result", "[AM] [Battery] Polled battery: %s%%", battery_percent)
                 self._update_sensor("battery", battery_percent)
             else:
                 _LOGGER.info(f"[AM] [Battery] Not isInstance in battery...Got value: {value}")
@@ -218,110 +256,166 @@ class NimlyDigitalLock(LockEntity):
         except Exception as e:
             _LOGGER.warning(f"[AM] Failed to poll battery: {e}")
 
+    def _handle_link_diagnostics(self, value):
+        """Decode the 0x0103 link diagnostics value and update the RSSI sensor."""
+        if value is None:
+            return  # Not read
+        if not isinstance(value, int):
+            _LOGGER.warning("[AM] [RSSI] Unexpected value type: %s (%s)", value, type(value))
+            return
+
+        parent_nwk, rssi, rssi_dbm = decode_link_diagnostics(value)
+        _LOGGER.debug(
+            "[AM] [RSSI] Diagnostics Data – Parent NWK: %#06x, RSSI: %s, RSSI dBm: %s",
+            parent_nwk, rssi, rssi_dbm
+        )
+
+        self._update_sensor("rssi", rssi_dbm)
+
     async def _poll_rssi(self):
-        _LOGGER.info(f"[AM] [_poll_rssi] POLLING RSSI")
+        # Discovery may run after the polls were registered
+        if not attribute_supported(self._hass, self._ieee, LOCK_CLUSTER_ID, 0x0103):
+            return
+        if self._report_is_fresh(LOCK_CLUSTER_ID, 0x0103):
+            _LOGGER.debug("[AM] [_poll_rssi] Diagnostics reported recently, skipping poll")
+            return
 
-        from .zbt1_support import async_read_attribute_zbt1
+        _HOT_LOGGER.info("poll_rssi", "[AM] [_poll_rssi] Polling RSSI of %s", self._name)
 
         try:
             value = await async_read_attribute_zbt1(
                 self.hass,
                 self._ieee,
-                endpoint=11,
+                endpoint=None,
                 cluster=0x0101,
-                attribute=0x0103
+                attribute=0x0103,
+                priority=PRIORITY_POLL,
             )
-
-            if isinstance(value, int):
-                # Convert the 32-bit int into 4 bytes (little-endian)
-                value_bytes = value.to_bytes(4, byteorder="little")
-                parent_nwk, rssi, rssi_dbm = struct.unpack("<HBB", value_bytes)
-
-                # Convert unsigned RSSI dBm to signed int if necessary
-                rssi_dbm_signed = rssi_dbm - 256 if rssi_dbm > 127 else rssi_dbm
-
-                _LOGGER.info(
-                    f"[AM] [RSSI] Diagnostics Data – Parent NWK: {hex(parent_nwk)}, "
-                    f"RSSI: {rssi}, RSSI dBm: {rssi_dbm_signed}"
-                )
-
-                self._update_sensor("rssi", rssi_dbm_signed)
-
-            else:
-                _LOGGER.warning(f"[AM] [RSSI] Unexpected value type: {value} ({type(value)})")
+            self._handle_link_diagnostics(value)
 
         except Exception as e:
             _LOGGER.warning(f"[AM] Failed to poll RSSI: {e}")
 
+    def _register_polls(self):
+        """Register battery and RSSI polls, stretched to the max report interval when reported."""
+        battery_interval = BATTERY_POLL_INTERVAL
+        if (POWER_CLUSTER_ID, 0x0021) in self._reporting:
+            battery_interval = REPORTING_CONFIG[POWER_CLUSTER_ID][0x0021][1]
+        rssi_interval = RSSI_POLL_INTERVAL
+        if (LOCK_CLUSTER_ID, 0x0103) in self._reporting:
+            rssi_interval = REPORTING_CONFIG[LOCK_CLUSTER_ID][0x0103][1]
+
+        scheduler = get_scheduler(self._hass)
+        self._unregister_polls()
+        if attribute_supported(self._hass, self._ieee, POWER_CLUSTER_ID, 0x0021):
+            self._poll_unsubs.append(
+                scheduler.async_register(f"{self._ieee_no_colons}:battery", battery_interval, self._poll_battery)
+            )
+        if attribute_supported(self._hass, self._ieee, LOCK_CLUSTER_ID, 0x0103):
+            self._poll_unsubs.append(
+                scheduler.async_register(f"{self._ieee_no_colons}:rssi", rssi_interval, self._poll_rssi)
+            )
 
-    async def async_added_to_hass(self):
-        self._hass = self.hass
-
-        if "entities" not in self._hass.data[DOMAIN]:
-            self._hass.data[DOMAIN]["entities"] = []
-        self._hass.data[DOMAIN]["entities"].append(self)
-
-        ieee_key = self._ieee.lower().replace(":", "")
-
-        if "battery_sensors" in self._hass.data[DOMAIN] and ieee_key in self._hass.data[DOMAIN]["battery_sensors"]:
-            battery_sensor = self._hass.data[DOMAIN]["battery_sensors"][ieee_key]
-            self.register_diagnostic_sensor("battery", battery_sensor)
-            _LOGGER.info(f"[AM] Found and registered existing battery sensor: {battery_sensor.entity_id}")
+    def _unregister_polls(self):
+        for unsub in self._poll_unsubs:
+            unsub()
+        self._poll_unsubs = []
 
-        if "rssi_sensors" in self._hass.data[DOMAIN] and ieee_key in self._hass.data[DOMAIN]["rssi_sensors"]:
-            rssi_sensor = self._hass.data[DOMAIN]["rssi_sensors"][ieee_key]
-            self.register_diagnostic_sensor("rssi", rssi_sensor)
-            _LOGGER.info(f"[AM] Found and registered existing rssi sensor: {rssi_sensor.entity_id}")
+    async def _async_setup_reporting(self):
+        """Configure attribute reporting on the lock so polling becomes a fallback."""
+        for cluster_id, reports in REPORTING_CONFIG.items():
+            configured = await async_configure_reporting_zbt1(self._hass, self._ieee, cluster_id, reports)
+            for attribute, ok in configured.items():
+                if ok:
+                    self._reporting.add((cluster_id, attribute))
 
-        async def battery_polling_loop():
-            while True:
-                await self._poll_battery()
-                await asyncio.sleep(400)
+        _LOGGER.info(f"[AM] Attribute reporting active for {sorted(self._reporting)} on {self._name}")
+        if self._reporting:
+            self._register_polls()
 
-        async def rssi_polling_loop():
-            while True:
-                await self._poll_rssi()
-                await asyncio.sleep(120)
+    async def async_added_to_hass(self):
+        self._hass = self.hass
 
-        self.hass.loop.create_task(battery_polling_loop())
-        self.hass.loop.create_task(rssi_polling_loop())
+        self._lock_state.entity = self
 
-        try:
-            ieee = EUI64.convert(self._ieee_with_colons)
-            zha_data = self._hass.data[DATA_ZHA]
-
-            for (dev_ieee, ep_id, cluster_id, cluster_type), entity in getattr(zha_data, "entities", {}).items():
-                if (
-                        dev_ieee == ieee
-                        and ep_id == 11
-                        and cluster_id == 0x0101
-                        and cluster_type == "in"
-                ):
-                    cluster = entity.cluster
-                    cluster.add_attribute_listener(self)
-                    _LOGGER.info(f"Subscribed to attribute reports on Door Lock cluster for {self._name}")
-                    return
+        # Sensors set up before the lock are waiting in the lock state
+        for key, sensor in self._lock_state.sensors.items():
+            self.register_diagnostic_sensor(key, sensor)
+            _LOGGER.info(f"[AM] Found and registered existing {key} sensor: {sensor.entity_id}")
 
-        except Exception as e:
-            _LOGGER.error(f"Failed to subscribe to cluster updates: {e}")
+        self.async_on_remove(self._breaker.async_add_listener(self.async_write_ha_state))
 
+        # Initial values come from the shared startup read
+        prefetch = get_prefetch(self._hass, self._ieee)
+        self.async_on_remove(prefetch.async_subscribe(LOCK_CLUSTER_ID, ATTR_LOCK_STATE, self._on_lock_state))
+        self.async_on_remove(prefetch.async_subscribe(
+            POWER_CLUSTER_ID, ATTR_BATTERY_PERCENT,
+            lambda value: self._update_sensor("battery", decode_battery_percent(value)),
+        ))
+        self.async_on_remove(prefetch.async_subscribe(
+            LOCK_CLUSTER_ID, ATTR_LINK_DIAGNOSTICS, self._handle_link_diagnostics
+        ))
 
+        # The only subscriptions to the lock's clusters; all are removed on unload
+        for cluster, listener in self._cluster_listeners:
+            cluster.add_listener(listener)
+            self.async_on_remove(functools.partial(cluster.remove_listener, listener))
+            _LOGGER.info(f"Subscribed to attribute reports on cluster {cluster.cluster_id:#06x} for {self._name}")
 
+        self._register_polls()
+        if self._use_reporting:
+            self._reporting_task = self._hass.async_create_task(self._async_setup_reporting())
 
     async def async_will_remove_from_hass(self):
+        if self._lock_state.entity is self:
+            self._lock_state.entity = None
+        # Bind/configure may still be retrying; it must not register polls again
+        if self._reporting_task is not None:
+            self._reporting_task.cancel()
+            self._reporting_task = None
+        self._unregister_polls()
+        self._cancel_confirm_timer()
+
         if self._remove_listener:
             self._remove_listener()
             self._remove_listener = None
 
-    def __init__(self, hass, ieee, name):
-        self._cluster_listener = None
+    def __init__(self, hass, ieee, name, use_reporting=DEFAULT_USE_REPORTING, optimistic=DEFAULT_OPTIMISTIC_STATE):
+        self._cluster_listeners = []
         self._remove_listener = None
+        self._reporting_task = None
+        self._poll_unsubs = []
+        self._use_reporting = use_reporting
+        self._reporting = set()
+        self._optimistic = optimistic
+        self._optimistic_phase = None
+        self._pending_target = None
+        self._confirm_unsub = None
+        self._breaker = get_lock_breaker(hass, ieee)
+        self._state_writer = get_state_writer(hass)
+        self._logbook = get_logbook_sink(hass)
+
+        self._last_reports = {}
+        self.duplicate_reports_suppressed = 0
+
+        # Attribute report dispatch table, built once per lock
+        self._report_handlers = {
+            (LOCK_CLUSTER_ID, ATTR_LOCK_STATE): self._on_lock_state,
+            (LOCK_CLUSTER_ID, ATTR_LOCK_TYPE): self._on_lock_type,
+            (LOCK_CLUSTER_ID, ATTR_ACTUATOR_ENABLED): self._on_actuator_enabled,
+            (LOCK_CLUSTER_ID, ATTR_DOOR_STATE): self._on_door_state,
+            (POWER_CLUSTER_ID, ATTR_BATTERY_PERCENT): self._on_battery_percent,
+            (LOCK_CLUSTER_ID, ATTR_OPERATION_EVENT): self._on_operation_event,
+            (LOCK_CLUSTER_ID, ATTR_PIN_USED): self._on_pin_used,
+            (LOCK_CLUSTER_ID, ATTR_RFID_USED): self._on_rfid_used,
+            (LOCK_CLUSTER_ID, ATTR_LINK_DIAGNOSTICS): self._handle_link_diagnostics,
+        }
         self._hass = hass
-        self._ieee = ieee
+        self._ieee = canonical_ieee(ieee)
         self._name = name
 
-        self._ieee_no_colons = ieee.replace(':', '').lower()
-        self._ieee_with_colons = ':'.join([self._ieee_no_colons[i:i+2] for i in range(0, len(self._ieee_no_colons), 2)]) if ':' not in ieee else ieee
+        self._ieee_no_colons = self._ieee.no_colons
+        self._ieee_with_colons = self._ieee.with_colons
 
         zha_device_info = self._hass.data.get(f"{DOMAIN}_ZHA_DEVICE", {})
         self._zha_ieee = zha_device_info.get("zha_ieee", "")
@@ -344,7 +438,7 @@ class NimlyDigitalLock(LockEntity):
         # Set entity_id format to avoid collisions
         self._attr_entity_id = f"{DOMAIN}_{self._ieee_no_colons}"
 
-        self._is_locked = None
+        self._lock_state = get_lock_state(hass, ieee)
         #self._attrs = {}
         #self._attr_extra_state_attributes = {"Lock state": "Unknown"}
         self._diagnostic_sensors = {}
@@ -360,13 +454,16 @@ class NimlyDigitalLock(LockEntity):
     def unique_id(self):
         return self._unique_id
 
+    @property
+    def available(self):
+        return self._breaker.available
+
     @property
     def is_locked(self):
-        # Get the current lock state from the data storage
-        lock_state = self._hass.data.get(f"{DOMAIN}:{self._ieee}:lock_state")
-        # Update the internal state to match
-        self._is_locked = bool(lock_state) if lock_state is not None else self._is_locked
-        return self._is_locked
+        # An unconfirmed target is shown but never stored in the lock state
+        if self._pending_target is not None:
+            return self._pending_target
+        return self._lock_state.locked
 
     #@property
     #def extra_state_attributes(self):
@@ -374,6 +471,15 @@ class NimlyDigitalLock(LockEntity):
     #def extra_state_attributes(self):
     #    return self._attrs
 
+    @property
+    def extra_state_attributes(self):
+        attributes = {}
+        if self._optimistic_phase is not None:
+            attributes["optimistic_state"] = self._optimistic_phase
+        if self._lock_state.is_stale("locked"):
+            attributes["stale"] = True  # Restored from the last run, not yet confirmed
+        return attributes or None
+
 
     @property
     def device_info(self):
@@ -388,42 +494,124 @@ class NimlyDigitalLock(LockEntity):
 
 
 
+    def _set_locked(self, locked):
+        self._lock_state.update(locked=locked)
+
+    def _cancel_confirm_timer(self):
+        if self._confirm_unsub is not None:
+            self._confirm_unsub()
+            self._confirm_unsub = None
+
+    def _begin_optimistic(self, target):
+        """Show the requested state at once and wait for the lock to confirm it.
+
+        The target is kept in memory only; the lock state is saved, and its
+        stale flag cleared, when a report confirms it.
+        """
+        self._cancel_confirm_timer()
+        self._pending_target = target
+        self._optimistic_phase = OPTIMISTIC_PENDING
+        self._attr_is_jammed = False
+        self.async_write_ha_state()
+
+    def _arm_confirm_timer(self):
+        """Roll back if neither a lock state report nor an operation event confirms in time."""
+        if self._pending_target is None:
+            return  # Already confirmed while the command was in flight
+        self._cancel_confirm_timer()
+        self._confirm_unsub = async_call_later(self._hass, OPTIMISTIC_CONFIRM_TIMEOUT, self._confirm_timeout)
+
+    @callback
+    def _confirm_timeout(self, _now):
+        self._confirm_unsub = None
+        if self._pending_target is not None:
+            _LOGGER.warning(f"No confirmation from {self._name} within {OPTIMISTIC_CONFIRM_TIMEOUT}s, rolling back")
+            self._rollback_optimistic()
+
+    def _confirm_optimistic(self):
+        if self._pending_target is None:
+            return
+        self._cancel_confirm_timer()
+        self._pending_target = None
+        self._optimistic_phase = OPTIMISTIC_CONFIRMED
+
+    def _rollback_optimistic(self, jammed=False):
+        self._cancel_confirm_timer()
+        self._pending_target = None
+        self._optimistic_phase = OPTIMISTIC_ROLLED_BACK
+        self._attr_is_jammed = jammed
+        self._schedule_write()
+
+    async def _async_send_lock_command(self, command_id):
+        """Send lock/unlock through the Door Lock cluster, falling back to the ZHA service."""
+        result = await async_send_command_zbt1(
+            self._hass, self._ieee, endpoint=None, cluster=LOCK_CLUSTER_ID, command_id=command_id
+        )
+        if result is not None:
+            if result["error"] is not None:
+                _LOGGER.error(f"Command {command_id:#04x} to {self._name} failed: {result['error']}")
+            elif not result["success"]:
+                _LOGGER.error(f"Lock rejected command {command_id:#04x} with status {result['status']}")
+            return result["success"]
+
+        # Only reached when the Door Lock cluster could not be resolved
+        _LOGGER.debug("Direct command path unavailable, using issue_zigbee_cluster_command")
+        endpoint_id = resolve_endpoint(self._hass, self._ieee, LOCK_CLUSTER_ID)
+        if endpoint_id is None:
+            _LOGGER.error(f"No endpoint of {self._name} serves the Door Lock cluster")
+            return False
+        service_data = {
+            "ieee": self._ieee_with_colons,
+            "endpoint_id": endpoint_id,
+            "cluster_id": 0x0101,  # Door Lock cluster
+            "cluster_type": "in",
+            "command": command_id,
+            "command_type": "server",
+            "args": []
+        }
+
+        try:
+            await get_command_queue(self._hass, self._ieee).async_submit(
+                lambda: self._hass.services.async_call(
+                    "zha", "issue_zigbee_cluster_command", service_data, blocking=True
+                ),
+                PRIORITY_COMMAND,
+            )
+        except Exception as exc:
+            if isinstance(exc, IndexError) and "tuple index out of range" in str(exc):
+                _LOGGER.debug(f"ZHA response shape bug hit; proceeding as success.")
+            else:
+                raise
+        return True
+
     async def async_lock(self, **kwargs):
         _LOGGER.info(f"AM Going to lock the lock...")
         _LOGGER.info(f"Locking {self._name} [{self._ieee}]")
 
+        if self._optimistic:
+            self._begin_optimistic(True)
+
         try:
-            service_data = {
-                "ieee": self._ieee_with_colons,
-                "endpoint_id": 11,  # ZBT-1 uses endpoint 11
-                "cluster_id": 0x0101,  # Door Lock cluster
-                "cluster_type": "in",
-                "command": 0x00,  # Lock command
-                "command_type": "server",
-                "args": []
-            }
-
-            try:
-                await self._hass.services.async_call(
-                    "zha", "issue_zigbee_cluster_command", service_data, blocking=True
-                )
-            except Exception as exc:
-                if isinstance(exc, IndexError) and "tuple index out of range" in str(exc):
-                    _LOGGER.debug(f"ZHA response shape bug hit; proceeding as success.")
-                else:
-                    raise
+            if not await self._async_send_lock_command(0x00):  # Lock command
+                if self._optimistic:
+                    self._rollback_optimistic()
+                return False
 
             _LOGGER.info(f"Successfully locked {self.name}")
-            # Update internal state
-            self._is_locked = True
-            self._hass.data[f"{DOMAIN}:{self._ieee}:lock_state"] = 1
-            self.async_write_ha_state()
+            if self._optimistic:
+                self._arm_confirm_timer()
+            else:
+                # Update internal state
+                self._set_locked(True)
+                self.async_write_ha_state()
 
             #await self._poll_battery()
 
             return True
 
         except Exception as e:
+            if self._optimistic:
+                self._rollback_optimistic()
             _LOGGER.error(f"Failed to lock: {e}")
             _LOGGER.error("Lock traceback:\n%s", traceback.format_exc())
             return False
@@ -432,36 +620,26 @@ class NimlyDigitalLock(LockEntity):
         _LOGGER.info(f"AM Going to unlock lock...")
         _LOGGER.info(f"Unlocking {self._name} [{self._ieee}]")
 
-        # Standard ZHA unlock command
+        if self._optimistic:
+            self._begin_optimistic(False)
+
         try:
-            # Use ZHA service with Door Lock cluster (0x0101) and unlock command (0x01)
-            service_data = {
-                "ieee": self._ieee_with_colons,
-                "endpoint_id": 11,  # ZBT-1 uses endpoint 11
-                "cluster_id": 0x0101,  # Door Lock cluster
-                "cluster_type": "in",
-                "command": 0x01,  # Unlock command
-                "command_type": "server",
-                "args": []
-            }
-
-            try:
-                await self._hass.services.async_call(
-                    "zha", "issue_zigbee_cluster_command", service_data, blocking=True
-                )
-            except Exception as exc:
-                if isinstance(exc, IndexError) and "tuple index out of range" in str(exc):
-                    _LOGGER.debug(f"ZHA response shape bug hit; proceeding as success.")
-                else:
-                    raise
+            if not await self._async_send_lock_command(0x01):  # Unlock command
+                if self._optimistic:
+                    self._rollback_optimistic()
+                return False
 
             _LOGGER.info(f"Successfully sent unlock command")
-            self._is_locked = False
-            self._hass.data[f"{DOMAIN}:{self._ieee}:lock_state"] = 0
-            self.async_write_ha_state()
+            if self._optimistic:
+                self._arm_confirm_timer()
+            else:
+                self._set_locked(False)
+                self.async_write_ha_state()
 
             return True
         except Exception as e:
+            if self._optimistic:
+                self._rollback_optimistic()
             _LOGGER.error(f"Failed to unlock: {e}")
             _LOGGER.error("Unlock traceback:\n%s", traceback.format_exc())
             return False
@@ -0,0 +1,64 @@
+"""Canonical IEEE address type for the Nimly Digital Lock integration."""
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Every spelling seen so far (with or without colons, any case) -> its address
+_INTERNED = {}
+
+
+class IEEEAddress(str):
+    """An IEEE address in lower-case, colon separated form.
+
+    It is a ``str``, so it compares and hashes like the colon form and can be
+    used directly as a dict key or in ZHA service data. The no-colon and
+    EUI64 forms are computed once. Create instances with ``canonical_ieee``,
+    which parses each spelling only once and returns the same object for
+    every spelling of an address.
+    """
+
+    no_colons: str
+    with_colons: str
+
+    def __new__(cls, no_colons: str):
+        with_colons = ":".join(no_colons[i:i + 2] for i in range(0, 16, 2))
+        self = super().__new__(cls, with_colons)
+        self.no_colons = no_colons
+        self.with_colons = with_colons
+        self._eui64 = None
+        return self
+
+    def __reduce__(self):
+        # Copies and unpickled values resolve to the interned address
+        return canonical_ieee, (self.no_colons,)
+
+    @property
+    def eui64(self):
+        """The zigpy EUI64 form, as used by the ZHA gateway's device index."""
+        if self._eui64 is None:
+            from zigpy.types import EUI64
+
+            self._eui64 = EUI64.convert(self.with_colons)
+        return self._eui64
+
+
+def canonical_ieee(value) -> IEEEAddress:
+    """Return the interned IEEEAddress for a str, EUI64 or IEEEAddress.
+
+    Raises ValueError if ``value`` is not 16 hex digits, colons aside.
+    """
+    if type(value) is IEEEAddress:
+        return value
+    text = value if isinstance(value, str) else str(value)
+    address = _INTERNED.get(text)
+    if address is not None:
+        return address
+
+    no_colons = text.replace(":", "").lower()
+    if len(no_colons) != 16 or not _HEX_DIGITS.issuperset(no_colons):
+        raise ValueError(f"Invalid IEEE address: {text}")
+    address = _INTERNED.get(no_colons)
+    if address is None:
+        address = _INTERNED[no_colons] = IEEEAddress(no_colons)
+        _INTERNED[address.with_colons] = address
+    _INTERNED[text] = address
+    return address
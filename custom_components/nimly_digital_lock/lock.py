@@ -4,8 +4,17 @@ from homeassistant.config_entries import ConfigEntry
 
 from . import MyClusterListener
 from .entity import NimlyDigitalLock
-from .const import DOMAIN
-import logging
+from .const import (
+    DOMAIN,
+    LOCK_CLUSTER_ID,
+    POWER_CLUSTER_ID,
+    CONF_USE_REPORTING,
+    DEFAULT_USE_REPORTING,
+    CONF_OPTIMISTIC_STATE,
+    DEFAULT_OPTIMISTIC_STATE,
+)
+from .lock_state import get_lock_state
+from .zbt1_support import get_resolver
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,46 +38,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     _LOGGER.info(f"Known ZHA device with IEEE {zha_ieee} will be used as a fallback")
 
     # Make sure the data structure is initialized
-    if f"{DOMAIN}:{ieee}:lock_state" not in hass.data:
-        hass.data[f"{DOMAIN}:{ieee}:lock_state"] = 1  # Default to locked
+    lock_state = get_lock_state(hass, ieee)
+    if lock_state.locked is None:
+        # Nothing stored from an earlier run: assume locked until the lock reports
+        lock_state.locked = True
+        lock_state.stale.add("locked")
         _LOGGER.info(f"Initializing lock state to locked (1)")
 
-    lock = NimlyDigitalLock(hass, ieee, name)
-    ieee_key = ieee.lower().replace(":", "")
-
-    zha_data = hass.data.get("zha")
-    _LOGGER.info("[AM] GATEWAY: %s", zha_data.gateway_proxy.gateway)
-
-    devices = zha_data.gateway_proxy.gateway.devices.items()
-    _LOGGER.info("[AM] DEVICES %s", devices)
-
-    for dev_id, d in devices:
-        _LOGGER.info("[AM] d: %s", d)
-
-        if str(d.ieee) == ieee.lower():
-            _LOGGER.info("[AM] endpoints items: %s", d.endpoints.items())
-
-            for ep_id, endpoint in d.device.endpoints.items():
-                if ep_id == 0:
-                    continue  # Skip ZDO endpoint
-
-                if 0x0101 in endpoint.in_clusters:
-                    _LOGGER.info(f"[AM] Found Door Lock cluster on endpoint {ep_id}")
-                    cluster = endpoint.in_clusters[0x0101]
-
-                    listener = MyClusterListener(lock)
-                    lock.set_cluster_listener(listener)
-                    cluster.add_listener(listener)
-
-                    async_add_entities([lock])
-
-                    _LOGGER.info(f"[AM] Listener added to cluster 0x0101 on endpoint {ep_id}")
-                    _LOGGER.info("[AM] Attaching listener to cluster: %s", cluster)
-                    break
-            else:
-                _LOGGER.warning("[AM] Door Lock cluster (0x0101) not found on any endpoint")
-        else:
-            _LOGGER.info("[AM] FAIL MATCH: dev_id: %s not ieee: %", dev_id, ieee)
+    lock = NimlyDigitalLock(
+        hass,
+        ieee,
+        name,
+        use_reporting=entry.options.get(CONF_USE_REPORTING, DEFAULT_USE_REPORTING),
+        optimistic=entry.options.get(CONF_OPTIMISTIC_STATE, DEFAULT_OPTIMISTIC_STATE),
+    )
+
+    resolver = get_resolver(hass)
+    cluster = resolver.get_cluster(ieee, LOCK_CLUSTER_ID)
+    if cluster is None:
+        _LOGGER.warning("[AM] Door Lock cluster (0x0101) not found for %s", ieee)
+        return
+
+    # Battery reports arrive on the Power Configuration cluster. The entity
+    # attaches the listeners when added and removes them again on unload.
+    clusters = [cluster]
+    power_cluster = resolver.get_cluster(ieee, POWER_CLUSTER_ID)
+    if power_cluster is not None:
+        clusters.append(power_cluster)
+    lock.set_cluster_listeners([(c, MyClusterListener(lock, c.cluster_id)) for c in clusters])
+
+    async_add_entities([lock])
+
+    _LOGGER.info("[AM] Listener added to cluster 0x0101 on endpoint %s", cluster.endpoint.endpoint_id)
 
 
     #async_add_entities([lock])
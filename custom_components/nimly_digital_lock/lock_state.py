@@ -0,0 +1,140 @@
+"""Per-lock runtime state for the Nimly Digital Lock integration."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STATE_SAVE_DELAY, STATE_STORAGE_KEY, STATE_STORAGE_VERSION
+from .ieee import canonical_ieee
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LockState:
+    """Last known state of one lock, shared by its entities, services and diagnostics.
+
+    Also holds the lock entity and its sensors, so platforms set up in any
+    order can find each other without scanning. Values are persisted; those
+    restored at startup are listed in ``stale`` until the lock reports them
+    again.
+    """
+
+    __slots__ = (
+        "ieee", "entity", "sensors", "updated", "stale", "_store",
+        "locked", "last_method", "last_user_id", "door_state", "battery", "rssi", "volume", "auto_relock",
+    )
+    _VALUES = ("locked", "last_method", "last_user_id", "door_state", "battery", "rssi", "volume", "auto_relock")
+
+    def __init__(self, ieee: str, store=None):
+        self.ieee = ieee
+        self.entity = None
+        self.sensors = {}
+        self.updated = {}
+        self.stale = set()
+        self._store = store
+        self.locked = None
+        self.last_method = None
+        self.last_user_id = None
+        self.door_state = None
+        self.battery = None
+        self.rssi = None
+        self.volume = None
+        self.auto_relock = None
+
+    def update(self, **values) -> None:
+        """Set fresh values from the lock and schedule a save."""
+        now = time.time()
+        for name, value in values.items():
+            setattr(self, name, value)
+            self.updated[name] = now
+            self.stale.discard(name)
+        if self._store is not None:
+            self._store.async_schedule_save()
+
+    def is_stale(self, name: str) -> bool:
+        return name in self.stale
+
+    def restore(self, stored: dict) -> None:
+        """Apply persisted values; they stay stale until refreshed."""
+        updated = stored.get("updated", {})
+        for name, value in stored.get("values", {}).items():
+            if name in self._VALUES and name not in self.updated:
+                setattr(self, name, value)
+                self.stale.add(name)
+                if name in updated:
+                    self.updated[name] = updated[name]
+
+    def as_stored(self) -> dict:
+        return {
+            "values": {name: getattr(self, name) for name in self._VALUES if getattr(self, name) is not None},
+            "updated": dict(self.updated),
+        }
+
+    def as_dict(self) -> dict:
+        """Return the state for diagnostics."""
+        data = {name: getattr(self, name) for name in self._VALUES}
+        data["updated"] = dict(self.updated)
+        data["stale"] = sorted(self.stale)
+        return data
+
+
+class LockStateStore:
+    """Persist the last known state of every lock with debounced writes."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._store = Store(hass, STATE_STORAGE_VERSION, STATE_STORAGE_KEY)
+        self._load_task = None
+        self.saves_requested = 0
+
+    async def async_load(self) -> None:
+        """Restore the stored locks once; later calls wait for the first load."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await asyncio.shield(self._load_task)
+
+    async def _async_load(self) -> None:
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("[LockState] Failed to load stored lock state: %s", e)
+            return
+        if not data:
+            return
+        for ieee, stored in data.get("locks", {}).items():
+            try:
+                get_lock_state(self._hass, ieee).restore(stored)
+            except ValueError:
+                _LOGGER.debug("[LockState] Ignoring stored state for invalid IEEE %s", ieee)
+        _LOGGER.debug("[LockState] Restored state of %d lock(s)", len(data.get("locks", {})))
+
+    @callback
+    def async_schedule_save(self) -> None:
+        self.saves_requested += 1
+        self._store.async_delay_save(self._data_to_save, STATE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        locks = self._hass.data.get(DOMAIN, {}).get("locks", {})
+        return {"locks": {str(ieee): state.as_stored() for ieee, state in locks.items()}}
+
+
+def get_lock_state_store(hass: HomeAssistant) -> LockStateStore:
+    """Return the shared lock state store, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get("lock_state_store")
+    if store is None:
+        store = domain_data["lock_state_store"] = LockStateStore(hass)
+    return store
+
+
+def get_lock_state(hass: HomeAssistant, ieee) -> LockState:
+    """Return the state of a lock, creating it on first use."""
+    key = canonical_ieee(ieee)
+    locks = hass.data.setdefault(DOMAIN, {}).setdefault("locks", {})
+    state = locks.get(key)
+    if state is None:
+        state = locks[key] = LockState(key, get_lock_state_store(hass))
+    return state
@@ -0,0 +1,141 @@
+"""Rate-limited logbook writer for the Nimly Digital Lock integration."""
+import functools
+import logging
+import time
+
+from homeassistant.components.logbook import async_log_entry
+from homeassistant.core import HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, LOGBOOK_RATE_LIMITS
+
+_LOGGER = logging.getLogger(__name__)
+
+CATEGORY_ACCESS = "access"
+CATEGORY_BATTERY = "battery"
+CATEGORY_DIAGNOSTIC = "diagnostic"
+
+
+class _CategoryState:
+    __slots__ = ("last_written", "last_message", "message", "count", "flush_unsub")
+
+    def __init__(self):
+        self.last_written = None
+        self.last_message = None
+        self.message = None
+        self.count = 0
+        self.flush_unsub = None
+
+
+class LogbookSink:
+    """Write lock logbook entries with per-lock, per-category rate limits.
+
+    Categories with a limit of 0 (access events, door state included) are
+    always written at once. For throttled categories, a message repeating
+    the last one within the interval is held and merged into a single entry
+    carrying how many times it was seen. A different message is never
+    merged: it flushes what is held and is written at once.
+    """
+
+    def __init__(self, hass: HomeAssistant, limits: dict | None = None):
+        self._hass = hass
+        self._limits = dict(LOGBOOK_RATE_LIMITS if limits is None else limits)
+        self._states = {}
+        self.written = 0
+        self.merged = 0
+
+    def _write(self, entity_id: str, message: str) -> None:
+        async_log_entry(
+            self._hass,
+            name="Nimly Lock",
+            message=message,
+            domain=DOMAIN,
+            entity_id=entity_id,
+        )
+        self.written += 1
+
+    @callback
+    def async_log(self, entity_id: str, category: str, message: str) -> None:
+        """Log ``message`` for a lock entity, subject to the category's limit."""
+        limit = self._limits.get(category, 0)
+        if limit <= 0:
+            self._write(entity_id, message)
+            return
+
+        key = (entity_id, category)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _CategoryState()
+
+        if message != state.last_message:
+            self._flush(key)
+            self._write_state(key, state, message)
+            return
+
+        now = time.monotonic()
+        if state.count == 0 and now - state.last_written >= limit:
+            self._write_state(key, state, message)
+            return
+
+        # A repeat within the window: hold it until the window ends
+        if state.count:
+            self.merged += 1
+        state.message = message
+        state.count += 1
+        if state.flush_unsub is None:
+            delay = max(0.0, state.last_written + limit - now)
+            state.flush_unsub = async_call_later(
+                self._hass, delay, HassJob(functools.partial(self._flush_due, key))
+            )
+
+    def _write_state(self, key, state: _CategoryState, message: str, entry: str | None = None) -> None:
+        state.last_written = time.monotonic()
+        state.last_message = message
+        self._write(key[0], message if entry is None else entry)
+
+    @callback
+    def _flush_due(self, key, _now) -> None:
+        state = self._states.get(key)
+        if state is not None:
+            state.flush_unsub = None
+        self._flush(key)
+
+    @callback
+    def _flush(self, key) -> None:
+        """Write the held repeats of ``key`` now, if any."""
+        state = self._states.get(key)
+        if state is None:
+            return
+        if state.flush_unsub is not None:
+            state.flush_unsub()
+            state.flush_unsub = None
+        if state.count == 0:
+            return
+        message = state.message
+        entry = message if state.count == 1 else f"{message} (×{state.count})"
+        state.message = None
+        state.count = 0
+        self._write_state(key, state, message, entry)
+
+    def shutdown(self) -> None:
+        """Write held entries and cancel pending flushes."""
+        for key in list(self._states):
+            self._flush(key)
+
+    def as_dict(self) -> dict:
+        """Return logbook counters for diagnostics."""
+        return {
+            "written": self.written,
+            "merged": self.merged,
+            "pending": sum(state.count for state in self._states.values()),
+            "limits": self._limits,
+        }
+
+
+def get_logbook_sink(hass: HomeAssistant) -> LogbookSink:
+    """Return the shared logbook sink, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    sink = domain_data.get("logbook_sink")
+    if sink is None:
+        sink = domain_data["logbook_sink"] = LogbookSink(hass)
+    return sink
@@ -0,0 +1,167 @@
+"""Batched startup read of everything the lock's entities need."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, PREFETCH_CHECK_INTERVAL, PREFETCH_MAX_CHECK_INTERVAL, PREFETCH_READY_TIMEOUT
+from .ieee import canonical_ieee
+from .zbt1_support import (
+    READ_STATUS_SUCCESS,
+    async_discover_capabilities,
+    async_read_attribute_zbt1,
+    async_read_attributes_zbt1,
+    attribute_supported,
+    get_resolver,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StartupPrefetch:
+    """Read the attributes all entities of one lock asked for, in one pass.
+
+    Entities subscribe to ``(cluster, attribute)`` pairs while they are added.
+    Once the platforms are set up, ``async_run`` waits until ZHA knows the
+    device and reports it available, reads every subscribed attribute in as
+    few frames as possible and hands each value to its subscribers.
+    Subscribers that arrive after the pass get the stored value, or a single
+    read of their own if the pass did not cover them.
+    """
+
+    def __init__(self, hass: HomeAssistant, ieee):
+        self._hass = hass
+        self._ieee = canonical_ieee(ieee)
+        self._subscribers = {}
+        self._results = None
+        self._task = None
+        self.created_at = time.monotonic()
+        self.ready_after = None
+        self.fetched_after = None
+        self.attributes_read = 0
+        self.attributes_failed = 0
+
+    @callback
+    def async_subscribe(self, cluster_id: int, attribute: int, value_callback):
+        """Call ``value_callback(value)`` with the prefetched value; returns an unsubscribe."""
+        key = (cluster_id, attribute)
+        callbacks = self._subscribers.setdefault(key, [])
+        callbacks.append(value_callback)
+
+        if self._results is not None:
+            result = self._results.get(key)
+            if result is not None and result["status"] == READ_STATUS_SUCCESS:
+                value_callback(result["value"])
+            else:
+                self._hass.async_create_task(self._async_read_late(key, value_callback))
+
+        def _unsubscribe():
+            if value_callback in callbacks:
+                callbacks.remove(value_callback)
+
+        return _unsubscribe
+
+    async def _async_read_late(self, key, value_callback) -> None:
+        cluster_id, attribute = key
+        try:
+            value = await async_read_attribute_zbt1(
+                self._hass, self._ieee, endpoint=None, cluster=cluster_id, attribute=attribute
+            )
+        except Exception as e:
+            _LOGGER.debug("[Prefetch] Late read of %#06x/%#06x failed: %s", cluster_id, attribute, e)
+            return
+        if value is not None:
+            value_callback(value)
+
+    def _device_ready(self) -> bool:
+        try:
+            device = get_resolver(self._hass).get_device(self._ieee)
+        except (KeyError, AttributeError):
+            return False  # ZHA not loaded yet
+        return device is not None and getattr(device, "available", True)
+
+    async def _async_wait_ready(self) -> bool:
+        """Wait until ZHA has the device, checking with a growing interval."""
+        deadline = self.created_at + PREFETCH_READY_TIMEOUT
+        interval = PREFETCH_CHECK_INTERVAL
+        while not self._device_ready():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, PREFETCH_MAX_CHECK_INTERVAL)
+        return True
+
+    @callback
+    def async_start(self) -> None:
+        """Run the startup pass in the background."""
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(self.async_run(), f"{DOMAIN} startup prefetch")
+
+    def shutdown(self) -> None:
+        """Cancel the startup pass if it is still waiting or reading."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def async_run(self) -> None:
+        """Do the startup pass once."""
+        if not await self._async_wait_ready():
+            _LOGGER.warning(
+                "[Prefetch] %s not ready in ZHA after %ss, entities keep their stored state",
+                self._ieee, PREFETCH_READY_TIMEOUT,
+            )
+            self._results = {}
+            return
+        self.ready_after = time.monotonic() - self.created_at
+
+        # Once per model, so the read below can leave out unsupported attributes
+        await async_discover_capabilities(self._hass, self._ieee)
+
+        wanted = [
+            key for key, callbacks in self._subscribers.items()
+            if callbacks and attribute_supported(self._hass, self._ieee, *key)
+        ]
+        try:
+            self._results = await async_read_attributes_zbt1(self._hass, self._ieee, wanted)
+        except Exception as e:
+            _LOGGER.warning("[Prefetch] Startup read of %s failed: %s", self._ieee, e)
+            self._results = {}
+            return
+        self.fetched_after = time.monotonic() - self.created_at
+
+        for key in wanted:
+            result = self._results.get(key)
+            if result is None or result["status"] != READ_STATUS_SUCCESS:
+                self.attributes_failed += 1
+                continue
+            self.attributes_read += 1
+            for value_callback in list(self._subscribers.get(key, ())):
+                try:
+                    value_callback(result["value"])
+                except Exception as e:
+                    _LOGGER.warning("[Prefetch] Subscriber for %#06x/%#06x failed: %s", key[0], key[1], e)
+
+        _LOGGER.info(
+            "[Prefetch] %s ready after %.1fs, first valid state after %.1fs (%d read, %d failed)",
+            self._ieee, self.ready_after, self.fetched_after, self.attributes_read, self.attributes_failed,
+        )
+
+    def as_dict(self) -> dict:
+        """Return startup timings for diagnostics."""
+        return {
+            "ready_after": round(self.ready_after, 2) if self.ready_after is not None else None,
+            "first_valid_state_after": round(self.fetched_after, 2) if self.fetched_after is not None else None,
+            "attributes": sorted(f"{c:#06x}/{a:#06x}" for c, a in self._subscribers),
+            "read": self.attributes_read,
+            "failed": self.attributes_failed,
+        }
+
+
+def get_prefetch(hass: HomeAssistant, ieee) -> StartupPrefetch:
+    """Return the startup prefetch of a lock, creating it on first use."""
+    prefetches = hass.data.setdefault(DOMAIN, {}).setdefault("prefetch", {})
+    key = canonical_ieee(ieee)
+    prefetch = prefetches.get(key)
+    if prefetch is None:
+        prefetch = prefetches[key] = StartupPrefetch(hass, key)
+    return prefetch
@@ -0,0 +1,118 @@
+"""Retry policy with backoff for Zigbee operations of the Nimly Digital Lock integration."""
+import asyncio
+import logging
+import random
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+OPERATION_COMMAND = "command"
+OPERATION_READ = "read"
+OPERATION_WRITE = "write"
+OPERATION_POLL = "poll"
+
+# Substrings of exception names/messages that mean the frame never made it
+# (or its answer never came back) and trying again may help.
+RETRYABLE_MARKERS = (
+    "timeout",
+    "no_ack",
+    "delivery",
+    "channel_access",
+    "no_route",
+)
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter, bounded by attempts and a time budget."""
+
+    __slots__ = ("attempts", "base_delay", "max_delay", "jitter", "budget")
+
+    def __init__(self, attempts: int, base_delay: float, max_delay: float, jitter: float, budget: float):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+
+    def delay(self, attempt: int) -> float:
+        """Return the pause before retry number ``attempt`` (1-based)."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+RETRY_POLICIES = {
+    OPERATION_COMMAND: RetryPolicy(attempts=3, base_delay=0.5, max_delay=2.0, jitter=0.25, budget=10.0),
+    OPERATION_WRITE: RetryPolicy(attempts=3, base_delay=1.0, max_delay=4.0, jitter=0.25, budget=20.0),
+    OPERATION_READ: RetryPolicy(attempts=3, base_delay=1.0, max_delay=4.0, jitter=0.25, budget=20.0),
+    OPERATION_POLL: RetryPolicy(attempts=2, base_delay=5.0, max_delay=10.0, jitter=0.5, budget=30.0),
+}
+
+
+def is_retryable(err: BaseException) -> bool:
+    """Classify an error as transient (timeout, MAC no-ack, ...) or fatal."""
+    if isinstance(err, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    text = f"{type(err).__name__} {err}".lower()
+    return any(marker in text for marker in RETRYABLE_MARKERS)
+
+
+class RetryStats:
+    """Retry counters of one lock."""
+
+    __slots__ = ("attempts", "retries", "successes", "exhausted", "fatal")
+
+    def __init__(self):
+        self.attempts = 0
+        self.retries = 0
+        self.successes = 0
+        self.exhausted = 0
+        self.fatal = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def get_retry_stats(hass: HomeAssistant, ieee: str) -> RetryStats:
+    """Return the retry counters of a lock, creating them on first use."""
+    stats = hass.data.setdefault(DOMAIN, {}).setdefault("retry_stats", {})
+    lock_stats = stats.get(ieee)
+    if lock_stats is None:
+        lock_stats = stats[ieee] = RetryStats()
+    return lock_stats
+
+
+async def async_retry(hass: HomeAssistant, ieee: str, operation: str, attempt_factory, attempts: int | None = None):
+    """Run ``attempt_factory`` until it succeeds, fails fatally or the budget is spent.
+
+    ``attempts`` overrides the number of tries of the operation's policy.
+    The last error is raised when no attempt succeeded.
+    """
+    policy = RETRY_POLICIES[operation]
+    max_attempts = attempts or policy.attempts
+    stats = get_retry_stats(hass, ieee)
+    deadline = time.monotonic() + policy.budget
+
+    attempt = 1
+    while True:
+        stats.attempts += 1
+        try:
+            result = await attempt_factory()
+        except Exception as err:
+            if not is_retryable(err):
+                stats.fatal += 1
+                raise
+            delay = policy.delay(attempt)
+            if attempt >= max_attempts or time.monotonic() + delay > deadline:
+                stats.exhausted += 1
+                raise
+            _LOGGER.debug("[Retry] %s %s attempt %d failed (%s), retrying in %.1fs", operation, ieee, attempt, err, delay)
+            stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+        stats.successes += 1
+        return result
@@ -0,0 +1,165 @@
+"""Integration-wide poll scheduler for the Nimly Digital Lock integration."""
+import asyncio
+import logging
+import random
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, POLL_JITTER, POLL_MAX_IN_FLIGHT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollJob:
+    """A periodic read owned by the scheduler."""
+
+    __slots__ = ("key", "interval", "callback", "next_run", "running", "runs", "failures", "last_lag")
+
+    def __init__(self, key: str, interval: float, callback, next_run: float):
+        self.key = key
+        self.interval = interval
+        self.callback = callback
+        self.next_run = next_run
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_lag = 0.0
+
+
+class PollScheduler:
+    """Run every periodic read of the integration from one loop.
+
+    Jobs start at a random phase within their interval and each following
+    run is jittered, so locks added together do not poll in bursts. At most
+    ``max_in_flight`` jobs talk to the coordinator at the same time.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_in_flight: int = POLL_MAX_IN_FLIGHT, jitter: float = POLL_JITTER):
+        self._hass = hass
+        self._jitter = jitter
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._max_in_flight = max_in_flight
+        self._jobs = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._queued = 0
+        self._in_flight = 0
+        self.max_lag = 0.0
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def async_register(self, key: str, interval: float, callback):
+        """Run ``callback`` (a coroutine function) every ``interval`` seconds.
+
+        Returns a function that removes the job again.
+        """
+        first_run = time.monotonic() + random.uniform(0, interval)
+        self._jobs[key] = PollJob(key, interval, callback, first_run)
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(self._run(), f"{DOMAIN} poll scheduler")
+        self._wakeup.set()
+
+        def _unregister():
+            self.async_unregister(key)
+
+        return _unregister
+
+    def async_unregister(self, key: str) -> None:
+        """Remove a job; stop the loop once no jobs are left."""
+        self._jobs.pop(key, None)
+        if not self._jobs and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def async_run_now(self, key: str) -> None:
+        """Move a job to the front of the schedule."""
+        job = self._jobs.get(key)
+        if job is not None and not job.running:
+            job.next_run = time.monotonic()
+            self._wakeup.set()
+
+    def shutdown(self) -> None:
+        """Remove every job and stop the loop."""
+        self._jobs.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            next_wake = None
+
+            for job in list(self._jobs.values()):
+                if job.running:
+                    continue
+                if job.next_run <= now:
+                    job.running = True
+                    self._hass.async_create_background_task(self._execute(job), f"{DOMAIN} poll {job.key}")
+                elif next_wake is None or job.next_run < next_wake:
+                    next_wake = job.next_run
+
+            timeout = None if next_wake is None else max(0.0, next_wake - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job: PollJob) -> None:
+        self._queued += 1
+        try:
+            async with self._semaphore:
+                self._queued -= 1
+                self._in_flight += 1
+                job.last_lag = max(0.0, time.monotonic() - job.next_run)
+                self.max_lag = max(self.max_lag, job.last_lag)
+                try:
+                    await job.callback()
+                    job.runs += 1
+                except Exception as e:
+                    job.failures += 1
+                    _LOGGER.warning("[Scheduler] Poll %s failed: %s", job.key, e)
+                finally:
+                    self._in_flight -= 1
+        finally:
+            job.running = False
+            job.next_run = time.monotonic() + self._jittered(job.interval)
+            self._wakeup.set()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of due jobs waiting for a free coordinator slot."""
+        return self._queued
+
+    def as_dict(self) -> dict:
+        """Return scheduler state for diagnostics."""
+        now = time.monotonic()
+        return {
+            "jobs": len(self._jobs),
+            "max_in_flight": self._max_in_flight,
+            "in_flight": self._in_flight,
+            "queue_depth": self._queued,
+            "max_lag": round(self.max_lag, 3),
+            "job_details": {
+                job.key: {
+                    "interval": job.interval,
+                    "next_run_in": round(job.next_run - now, 1),
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "last_lag": round(job.last_lag, 3),
+                }
+                for job in self._jobs.values()
+            },
+        }
+
+
+def get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the shared poll scheduler, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get("scheduler")
+    if scheduler is None:
+        scheduler = domain_data["scheduler"] = PollScheduler(hass)
+    return scheduler
@@ -2,6 +2,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 
+from .const import LOCK_CLUSTER_ID
+from .zbt1_support import attribute_supported
 from .configuration.sound_volume_select import SoundVolumeSelect, _LOGGER
 
 
@@ -17,5 +19,9 @@ async def async_setup_entry(
     name = entry.data.get("name", "Nimly Front Door")
     #ieee_key = ieee.lower().replace(":", "")
 
+    if not attribute_supported(hass, ieee, LOCK_CLUSTER_ID, 0x0024):
+        _LOGGER.info(f"[AM] {name} does not support attribute 0x0024, not adding sound volume select")
+        return
+
     sound_volume_select = SoundVolumeSelect(hass, ieee, name)
     async_add_entities([sound_volume_select], True)
\ No newline at end of file
@@ -4,10 +4,20 @@ from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import (
+    CONF_RSSI_DEADBAND,
+    DEFAULT_RSSI_DEADBAND,
+    CONF_RSSI_MIN_INTERVAL,
+    DEFAULT_RSSI_MIN_INTERVAL,
+    CONF_SENSOR_HEARTBEAT,
+    DEFAULT_SENSOR_HEARTBEAT,
+    LOCK_CLUSTER_ID,
+)
+from .lock_state import get_lock_state
 from .sensors.battery_sensor import BatterySensor
 from .sensors.diagnostic_sensor import LOCK_DIAGNOSTIC_ATTRIBUTES, LockDiagnosticsSensor
 from .sensors.rssi_sensor import RSSISensor
+from .zbt1_support import attribute_supported
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,45 +32,52 @@ async def async_setup_entry(
 
     ieee = entry.data["ieee"]
     name = entry.data.get("name", "Nimly Front Door")
-    ieee_key = ieee.lower().replace(":", "")
 
     # Create and register battery sensor
 
-    battery_sensor = BatterySensor(hass, ieee, name)
-    rssi_sensor = RSSISensor(hass, ieee, name)
+    heartbeat = entry.options.get(CONF_SENSOR_HEARTBEAT, DEFAULT_SENSOR_HEARTBEAT)
+    battery_sensor = BatterySensor(hass, ieee, name, heartbeat=heartbeat)
+    sensors = {"battery": battery_sensor}
+    # The RSSI comes from the link diagnostics attribute, which not every model has
+    if attribute_supported(hass, ieee, LOCK_CLUSTER_ID, 0x0103):
+        sensors["rssi"] = RSSISensor(
+            hass,
+            ieee,
+            name,
+            deadband=entry.options.get(CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND),
+            min_interval=entry.options.get(CONF_RSSI_MIN_INTERVAL, DEFAULT_RSSI_MIN_INTERVAL),
+            heartbeat=heartbeat,
+        )
     #sound_volume_select = SoundVolumeSelect(hass, ieee, name)
 
-    hass.data[DOMAIN]["battery_sensors"][ieee_key] = battery_sensor
-    hass.data[DOMAIN]["rssi_sensors"][ieee_key] = rssi_sensor
+    lock_state = get_lock_state(hass, ieee)
+    lock_state.sensors.update(sensors)
     #hass.data[DOMAIN]["lock_sound_volume_select"][ieee_key] = lock_sound_volume_select
 
-    async_add_entities([battery_sensor, rssi_sensor], True)
+    async_add_entities(list(sensors.values()), True)
 
-    _LOGGER.info(f"[AM] Added battery sensor: {battery_sensor.entity_id}")
-    _LOGGER.info(f"[AM] Added rssi sensor: {rssi_sensor.entity_id}")
+    for key, sensor in sensors.items():
+        _LOGGER.info(f"[AM] Added {key} sensor: {sensor.entity_id}")
     #_LOGGER.info(f"[AM] Added lock sound volume select: {rssi_sensor.entity_id}")
 
-    if "entities" in hass.data[DOMAIN]:
-        for entity in hass.data[DOMAIN]["entities"]:
-            if hasattr(entity, 'register_diagnostic_sensor') and entity._ieee == ieee:
-                entity.register_diagnostic_sensor("battery", battery_sensor)
-                entity.register_diagnostic_sensor("rssi", rssi_sensor)
-                _LOGGER.info(f"[AM] Registered sensors with lock: {entity.name}")
-
-
-
-    sensors = []
-
-    #for attr_id, (attr_key, name) in LOCK_DIAGNOSTIC_ATTRIBUTES.items():
-    #    sensors.append(
-    #        LockDiagnosticsSensor(
-    #            hass=hass,
-    #            ieee=ieee,
-    #            lock_name=name,
-    #            attribute_id=attr_id,
-    #            attr_key=attr_key,
-    #            friendly_name=name
-    #        )
-    #    )
-
-    #async_add_entities(sensors)
\ No newline at end of file
+    # If the lock was set up first it will not look for the sensors again
+    entity = lock_state.entity
+    if entity is not None:
+        for key, sensor in sensors.items():
+            entity.register_diagnostic_sensor(key, sensor)
+        _LOGGER.info(f"[AM] Registered sensors with lock: {entity.name}")
+
+
+    # Diagnostic attributes are created disabled; enabled ones share one read
+    async_add_entities(
+        LockDiagnosticsSensor(
+            hass=hass,
+            ieee=ieee,
+            lock_name=name,
+            attribute_id=attr_id,
+            attr_key=attr_key,
+            friendly_name=friendly_name,
+        )
+        for attr_id, (attr_key, friendly_name) in LOCK_DIAGNOSTIC_ATTRIBUTES.items()
+        if attribute_supported(hass, ieee, LOCK_CLUSTER_ID, attr_id)
+    )
@@ -8,7 +8,16 @@ from homeassistant.components.sensor import (
 from homeassistant.const import PERCENTAGE
 from homeassistant.core import HomeAssistant, _LOGGER
 from homeassistant.helpers.device_registry import DeviceEntryType
-from ..const import DOMAIN
+from ..const import DOMAIN, BATTERY_DEADBAND, BATTERY_MIN_INTERVAL, DEFAULT_SENSOR_HEARTBEAT
+from ..ieee import canonical_ieee
+from ..lock_state import get_lock_state
+from ..state_bundles import battery_bundle
+from ..state_writer import get_state_writer
+from ..utils.hotpath_log import HotPathLogger
+from ..write_policy import WritePolicy, register_write_policy
+from ..zbt1_support import get_lock_breaker
+
+_HOT_LOGGER = HotPathLogger(_LOGGER)
 
 
 class BatterySensor(SensorEntity):
@@ -21,12 +30,14 @@ class BatterySensor(SensorEntity):
     _attr_has_entity_name = True
     _attr_suggested_display_precision = 0  # Show whole numbers only
 
-    def __init__(self, hass: HomeAssistant, ieee: str, lock_name: str) -> None:
-        """Initialize the sensor."""
+    def __init__(
+        self, hass: HomeAssistant, ieee: str, lock_name: str, heartbeat: int = DEFAULT_SENSOR_HEARTBEAT
+    ) -> None:
+        """Initialize the sensor; ``heartbeat`` is in minutes."""
         self.hass = hass
-        self._ieee = ieee.lower().replace(":", "")
+        self._ieee = canonical_ieee(ieee)
         self._attr_name = "Battery"
-        self._attr_unique_id = f"{DOMAIN}_battery_{self._ieee}"
+        self._attr_unique_id = f"{DOMAIN}_battery_{self._ieee.no_colons}"
 
         # Clean up the entity_id
         clean_name = lock_name.lower()
@@ -39,89 +50,64 @@ class BatterySensor(SensorEntity):
         self.entity_id = f"sensor.{clean_name}_battery"
 
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, ieee)},
+            "identifiers": {(DOMAIN, self._ieee)},
             "name": lock_name,
             "manufacturer": "Nimly",
             "model": "Nimly Lock",
             "sw_version": "1.0",
             "entry_type": DeviceEntryType.SERVICE,
         }
-        # Initialize with None to ensure proper state handling
-        self._attr_native_value = 100
+        # Start from the value stored by the last run, if any
+        self._lock_state = get_lock_state(hass, self._ieee)
+        restored = self._lock_state.battery
+        self._attr_native_value = restored if restored is not None else 100
+        self._bundle = battery_bundle(self._attr_native_value)
+        self._write_policy = register_write_policy(
+            hass, self._attr_unique_id, WritePolicy(BATTERY_DEADBAND, BATTERY_MIN_INTERVAL, heartbeat * 60)
+        )
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self._attr_native_value is not None
+        return self._attr_native_value is not None and get_lock_breaker(self.hass, self._ieee).available
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the lock's reachability."""
+        self.async_on_remove(
+            get_lock_breaker(self.hass, self._ieee).async_add_listener(self.async_write_ha_state)
+        )
 
     @property
     def icon(self) -> str:
         """Return the icon based on battery level."""
-        if self._attr_native_value is None:
-            return "mdi:battery-unknown"
-
-        battery_level = int(self._attr_native_value)
-
-        if battery_level >= 95:
-            return "mdi:battery"
-        elif battery_level >= 85:
-            return "mdi:battery-90"
-        elif battery_level >= 75:
-            return "mdi:battery-80"
-        elif battery_level >= 65:
-            return "mdi:battery-70"
-        elif battery_level >= 55:
-            return "mdi:battery-60"
-        elif battery_level >= 45:
-            return "mdi:battery-50"
-        elif battery_level >= 35:
-            return "mdi:battery-40"
-        elif battery_level >= 25:
-            return "mdi:battery-30"
-        elif battery_level >= 15:
-            return "mdi:battery-20"
-        elif battery_level >= 5:
-            return "mdi:battery-10"
-        else:
-            return "mdi:battery-alert"
+        return self._bundle.icon
 
     @property
     def extra_state_attributes(self):
         """Return additional state attributes."""
-        attributes = {}
-        if self._attr_native_value is not None:
-            attributes["battery_level"] = f"{self._attr_native_value}%"
-
-            # Add battery status description
-            if self._attr_native_value >= 75:
-                attributes["battery_status"] = "Good"
-            elif self._attr_native_value >= 25:
-                attributes["battery_status"] = "Medium"
-            elif self._attr_native_value >= 10:
-                attributes["battery_status"] = "Low"
-            else:
-                attributes["battery_status"] = "Critical"
-
-        return attributes
+        if self._lock_state.is_stale("battery"):
+            return {**self._bundle.attributes, "stale": True}
+        return self._bundle.attributes
 
     def update_state(self, value: int) -> None:
         """Update the sensor with new value."""
-        _LOGGER.info(f"[AM] [Battery] Updating sensor {self.entity_id} with value: {value}%")
-
         # Ensure value is within valid range
         value = max(0, min(100, int(value)))
 
-        # Only update if value actually changed to avoid unnecessary history entries
-        if self._attr_native_value != value:
+        # Only write changes, plus a periodic heartbeat, to keep history small
+        if self._write_policy.should_write(value):
             old_value = self._attr_native_value
             self._attr_native_value = value
+            self._bundle = battery_bundle(value)
 
-            # Force state write to ensure history is recorded
-            self.async_write_ha_state()
+            # Coalesced with other writes from the same burst of reports
+            get_state_writer(self.hass).async_schedule_write(self)
 
-            _LOGGER.info(f"[AM] [Battery] Battery updated from {old_value}% to {value}% - icon: {self.icon}")
+            _HOT_LOGGER.info(
+                "battery_updated", "[AM] [Battery] %s updated from %s%% to %s%%", self.entity_id, old_value, value
+            )
         else:
-            _LOGGER.debug(f"[AM] [Battery] Battery value unchanged at {value}%")
+            _HOT_LOGGER.debug("battery_skipped", "[AM] [Battery] Skipped write of %s%% (policy)", value)
 
     @property
     def native_value(self):
@@ -2,10 +2,12 @@ import logging
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceEntryType
-from zigpy.types import EUI64
 
-from ..const import DOMAIN
-from ..zbt1_support import async_read_attribute_zbt1
+from ..const import DOMAIN, LOCK_CLUSTER_ID
+from ..diagnostic_attributes import get_diagnostic_attributes
+from ..ieee import canonical_ieee
+from ..prefetch import get_prefetch
+from ..zbt1_support import get_lock_breaker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,20 +27,21 @@ LOCK_DIAGNOSTIC_ATTRIBUTES = {
 
 
 class LockDiagnosticsSensor(SensorEntity):
+    """One diagnostic attribute of the lock, disabled until the user enables it."""
+
     def __init__(self, hass, ieee: str, lock_name: str, attribute_id: int, attr_key: str, friendly_name: str):
         self._hass = hass
-        self._ieee = ieee
-        self._ieee_obj = EUI64.convert(ieee)
+        self._ieee = canonical_ieee(ieee)
         self._attribute_id = attribute_id
         self._attr_key = attr_key
         self._attr_name = f"{friendly_name}"
-        self._attr_unique_id = f"{DOMAIN}_{ieee.replace(':','')}_{attr_key}"
+        self._attr_unique_id = f"{DOMAIN}_{self._ieee.no_colons}_{attr_key}"
         self._attr_device_class = None
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_entity_registry_enabled_default = True
+        self._attr_entity_registry_enabled_default = False
         self._attr_native_unit_of_measurement = None
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, ieee)},
+            "identifiers": {(DOMAIN, self._ieee)},
             "name": lock_name,
             "manufacturer": "Nimly",
             "model": "Nimly Lock",
@@ -46,21 +49,32 @@ class LockDiagnosticsSensor(SensorEntity):
         }
         self._attr_native_value = None
 
+    @property
+    def available(self) -> bool:
+        return get_lock_breaker(self._hass, self._ieee).available
+
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
-        try:
-            value = await async_read_attribute_zbt1(
-                self._hass,
-                self._ieee_obj,
-                endpoint=11,
-                cluster=0x0101,
-                attribute=self._attribute_id
-            )
-            self._attr_native_value = value
-            _LOGGER.info(f"[Diagnostics] {self._attr_name} = {value}")
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.warning(f"[Diagnostics] Failed to read {self._attr_name}: {e}")
+        self.async_on_remove(
+            get_lock_breaker(self._hass, self._ieee).async_add_listener(self.async_write_ha_state)
+        )
+        self.async_on_remove(
+            get_prefetch(self._hass, self._ieee).async_subscribe(LOCK_CLUSTER_ID, self._attribute_id, self._on_value)
+        )
+        self.async_on_remove(
+            get_diagnostic_attributes(self._hass, self._ieee).async_register(self._attribute_id, self._on_value)
+        )
+
+    def _on_value(self, value):
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        _LOGGER.debug(f"[Diagnostics] {self._attr_name} = {value}")
+        self.async_write_ha_state()
+
+    async def async_update(self):
+        """Refresh on demand (homeassistant.update_entity), together with the other diagnostics."""
+        await get_diagnostic_attributes(self._hass, self._ieee).async_refresh(force=True)
 
     @property
     def should_poll(self):
@@ -2,11 +2,20 @@ from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, Sen
 from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 import logging
 
-from ..const import DOMAIN
+from ..const import DOMAIN, DEFAULT_RSSI_DEADBAND, DEFAULT_RSSI_MIN_INTERVAL, DEFAULT_SENSOR_HEARTBEAT
+from ..ieee import canonical_ieee
+from ..lock_state import get_lock_state
+from ..state_bundles import rssi_bundle
+from ..state_writer import get_state_writer
+from ..utils.hotpath_log import HotPathLogger
+from ..write_policy import WritePolicy, register_write_policy
+from ..zbt1_support import get_lock_breaker
 
 _LOGGER = logging.getLogger(__name__)
+_HOT_LOGGER = HotPathLogger(_LOGGER)
 
 
 class RSSISensor(SensorEntity):
@@ -19,12 +28,20 @@ class RSSISensor(SensorEntity):
     _attr_has_entity_name = True
     _attr_suggested_display_precision = 0  # Show whole numbers only
 
-    def __init__(self, hass: HomeAssistant, ieee: str, lock_name: str) -> None:
-        """Initialize the sensor."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ieee: str,
+        lock_name: str,
+        deadband: int = DEFAULT_RSSI_DEADBAND,
+        min_interval: int = DEFAULT_RSSI_MIN_INTERVAL,
+        heartbeat: int = DEFAULT_SENSOR_HEARTBEAT,
+    ) -> None:
+        """Initialize the sensor; ``deadband`` is in dB, ``heartbeat`` in minutes."""
         self.hass = hass
-        self._ieee = ieee.lower().replace(":", "")
+        self._ieee = canonical_ieee(ieee)
         self._attr_name = "RSSI"
-        self._attr_unique_id = f"{DOMAIN}_rssi_{self._ieee}"
+        self._attr_unique_id = f"{DOMAIN}_rssi_{self._ieee.no_colons}"
 
         # Clean up the entity_id
         clean_name = lock_name.lower()
@@ -37,96 +54,72 @@ class RSSISensor(SensorEntity):
         self.entity_id = f"sensor.{clean_name}_rssi"
 
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, ieee)},
+            "identifiers": {(DOMAIN, self._ieee)},
             "name": lock_name,
             "manufacturer": "Nimly",
             "model": "Nimly Lock",
             "sw_version": "1.0",
             "entry_type": DeviceEntryType.SERVICE,
         }
-        # Initialize with a typical RSSI value (e.g., -50 dBm is good signal)
-        self._attr_native_value = -50
+        # Start from the value stored by the last run, else a typical RSSI
+        # value (e.g., -50 dBm is good signal)
+        self._lock_state = get_lock_state(hass, self._ieee)
+        restored = self._lock_state.rssi
+        if restored is not None:
+            self._attr_native_value = restored
+            updated = self._lock_state.updated.get("rssi")
+            self._bundle = rssi_bundle(restored, dt_util.utc_from_timestamp(updated) if updated else None)
+        else:
+            self._attr_native_value = -50
+            self._bundle = rssi_bundle(self._attr_native_value)
+        self._write_policy = register_write_policy(
+            hass, self._attr_unique_id, WritePolicy(deadband, min_interval, heartbeat * 60)
+        )
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return True  # Always available once created
+        return get_lock_breaker(self.hass, self._ieee).available
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the lock's reachability."""
+        self.async_on_remove(
+            get_lock_breaker(self.hass, self._ieee).async_add_listener(self.async_write_ha_state)
+        )
 
     @property
     def icon(self) -> str:
         """Return the icon based on RSSI level."""
-        if self._attr_native_value is None:
-            return "mdi:wifi-strength-outline"
-
-        rssi_level = int(self._attr_native_value)
-
-        # RSSI values are negative, with higher (less negative) values being better
-        if rssi_level >= -30:
-            return "mdi:wifi-strength-4"  # Excellent signal
-        elif rssi_level >= -50:
-            return "mdi:wifi-strength-3"  # Good signal
-        elif rssi_level >= -70:
-            return "mdi:wifi-strength-2"  # Fair signal
-        elif rssi_level >= -85:
-            return "mdi:wifi-strength-1"  # Poor signal
-        else:
-            return "mdi:wifi-strength-outline"  # Very poor signal
+        return self._bundle.icon
 
     @property
     def extra_state_attributes(self):
         """Return additional state attributes."""
-        attributes = {}
-        if self._attr_native_value is not None:
-            attributes["rssi_dbm"] = f"{self._attr_native_value} dBm"
-            attributes["last_updated"] = self.hass.states.get(self.entity_id).last_updated if self.hass.states.get(
-                self.entity_id) else None
-
-            # Add RSSI status description based on typical WiFi/Zigbee standards
-            rssi_level = int(self._attr_native_value)
-            if rssi_level >= -30:
-                attributes["signal_quality"] = "Excellent"
-            elif rssi_level >= -50:
-                attributes["signal_quality"] = "Good"
-            elif rssi_level >= -70:
-                attributes["signal_quality"] = "Fair"
-            elif rssi_level >= -85:
-                attributes["signal_quality"] = "Poor"
-            else:
-                attributes["signal_quality"] = "Very Poor"
-
-            # Convert to percentage for easier understanding (optional)
-            # This is a rough conversion for display purposes
-            if rssi_level >= -30:
-                signal_percent = 100
-            elif rssi_level >= -50:
-                signal_percent = 75
-            elif rssi_level >= -70:
-                signal_percent = 50
-            elif rssi_level >= -85:
-                signal_percent = 25
-            else:
-                signal_percent = 10
-
-            attributes["signal_percentage"] = f"{signal_percent}%"
-
-        return attributes
+        if self._lock_state.is_stale("rssi"):
+            return {**self._bundle.attributes, "stale": True}
+        return self._bundle.attributes
 
     def update_state(self, value: int) -> None:
         """Update the sensor with new RSSI value."""
-        _LOGGER.info(f"[AM] [RSSI] Updating sensor {self.entity_id} with value: {value} dBm")
-
         # RSSI values are typically between -30 (excellent) and -100 (very poor)
         # Clamp the value to reasonable bounds
         value = max(-100, min(-10, int(value)))
 
-        # Always update to ensure history recording
+        # Small swings are noise; the heartbeat keeps history from going quiet
+        if not self._write_policy.should_write(value):
+            _HOT_LOGGER.debug("rssi_skipped", "[AM] [RSSI] Skipped write of %s dBm (policy)", value)
+            return
+
         old_value = self._attr_native_value
         self._attr_native_value = value
+        self._bundle = rssi_bundle(value, dt_util.utcnow())
 
-        # Schedule state update to ensure it's recorded in history
-        self.schedule_update_ha_state(force_refresh=True)
+        # Coalesced with other writes from the same burst of reports
+        get_state_writer(self.hass).async_schedule_write(self)
 
-        _LOGGER.info(f"[AM] [RSSI] RSSI updated from {old_value} dBm to {value} dBm - icon: {self.icon}")
+        _HOT_LOGGER.info(
+            "rssi_updated", "[AM] [RSSI] %s updated from %s dBm to %s dBm", self.entity_id, old_value, value
+        )
 
     @property
     def native_value(self):
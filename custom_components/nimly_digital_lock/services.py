@@ -7,7 +7,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.service import async_register_admin_service
 from homeassistant.helpers.json import save_json
 
-from .const import DOMAIN, SERVICE_UPDATE, SERVICE_EXPORT, SERVICE_SCHEMAS
+from .capabilities import get_capabilities
+from .const import DOMAIN, SERVICE_UPDATE, SERVICE_EXPORT, SERVICE_SEND_DIRECT_COMMAND, SERVICE_SET_LOG_MODE, SERVICE_REDISCOVER_CAPABILITIES, SERVICE_SCHEMAS, LOG_MODES
+from .utils.hotpath_log import set_log_mode
+from .zbt1_support import async_discover_capabilities, async_send_command_zbt1, device_model_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,11 +20,25 @@ _LOGGER = logging.getLogger(__name__)
 SEND_COMMAND_SCHEMA = vol.Schema({
     vol.Required("ieee"): cv.string,
     vol.Required("command"): vol.Any(int, str),  # Allow both int (0, 1) and string ('lock', 'unlock')
-    vol.Optional("endpoint", default=11): cv.positive_int,
+    vol.Optional("endpoint"): cv.positive_int,  # defaults to the endpoint serving the cluster
     vol.Optional("cluster_id", default=0x0101): cv.positive_int,
     vol.Optional("retry_count", default=5): cv.positive_int
 })
 
+LOCK_COMMANDS = {"lock": 0x00, "unlock": 0x01}
+
+SET_LOG_MODE_SCHEMA = vol.Schema({
+    vol.Required("mode"): vol.In(LOG_MODES),
+})
+
+REDISCOVER_CAPABILITIES_SCHEMA = vol.Schema({
+    vol.Required("ieee"): cv.string,
+})
+
+SERVICES = (
+    SERVICE_UPDATE, SERVICE_EXPORT, SERVICE_SEND_DIRECT_COMMAND, SERVICE_SET_LOG_MODE, SERVICE_REDISCOVER_CAPABILITIES
+)
+
 
 async def async_register_services(hass: HomeAssistant) -> None:
     """Register services for ZHA Device Info."""
@@ -81,9 +98,10 @@ async def async_register_services(hass: HomeAssistant) -> None:
             # Store updated registry
             hass.data[DOMAIN]["device_registry"] = device_registry
 
-            # Update the state of each ZHA Device Info sensor
-            for entity in hass.data[DOMAIN]["entities"]:
-                entity.async_write_ha_state()
+            # Update the state of each lock entity
+            for lock_state in hass.data[DOMAIN]["locks"].values():
+                if lock_state.entity is not None:
+                    lock_state.entity.async_write_ha_state()
 
         except Exception as err:
             _LOGGER.exception("Error processing devices: %s", err)
@@ -101,6 +119,45 @@ async def async_register_services(hass: HomeAssistant) -> None:
         except Exception as err:
             _LOGGER.error("Failed to export: %s", err)
 
+    async def handle_send_direct_command(call) -> None:
+        """Send a Door Lock cluster command, retrying up to retry_count times."""
+        command = call.data["command"]
+        if isinstance(command, str):
+            command = LOCK_COMMANDS.get(command.lower(), command)
+        try:
+            command = int(command, 0) if isinstance(command, str) else int(command)
+        except ValueError:
+            _LOGGER.error("Unknown command: %s", call.data["command"])
+            return
+
+        result = await async_send_command_zbt1(
+            hass,
+            call.data["ieee"],
+            endpoint=call.data.get("endpoint"),
+            cluster=call.data["cluster_id"],
+            command_id=command,
+            attempts=call.data["retry_count"],
+        )
+        _LOGGER.info("Direct command %#04x to %s: %s", command, call.data["ieee"], result)
+
+    async def handle_set_log_mode(call) -> None:
+        """Switch hot-path logging between quiet, sampled and trace."""
+        set_log_mode(call.data["mode"])
+        _LOGGER.info("Hot-path log mode set to %s", call.data["mode"])
+
+    async def handle_rediscover_capabilities(call) -> None:
+        """Forget the stored attribute support of a lock's model and discover it again."""
+        ieee = call.data["ieee"]
+        model = device_model_key(hass, ieee)
+        if model is None:
+            _LOGGER.error("Device %s is not known to ZHA", ieee)
+            return
+        await get_capabilities(hass).async_forget(model)
+        if await async_discover_capabilities(hass, ieee, force=True):
+            _LOGGER.info("Rediscovered attributes of %s", model)
+        else:
+            _LOGGER.warning("Attribute discovery of %s failed, treating all attributes as supported", model)
+
     # Register services
     async_register_admin_service(
         hass, DOMAIN, SERVICE_UPDATE, handle_update,
@@ -112,4 +169,28 @@ async def async_register_services(hass: HomeAssistant) -> None:
         hass, DOMAIN, SERVICE_EXPORT, handle_export,
         schema=SERVICE_SCHEMAS[SERVICE_EXPORT]
     )
-    _LOGGER.debug("Registered export service")
\ No newline at end of file
+    _LOGGER.debug("Registered export service")
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_SEND_DIRECT_COMMAND, handle_send_direct_command,
+        schema=SEND_COMMAND_SCHEMA
+    )
+    _LOGGER.debug("Registered send_direct_command service")
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_SET_LOG_MODE, handle_set_log_mode,
+        schema=SET_LOG_MODE_SCHEMA
+    )
+    _LOGGER.debug("Registered set_log_mode service")
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_REDISCOVER_CAPABILITIES, handle_rediscover_capabilities,
+        schema=REDISCOVER_CAPABILITIES_SCHEMA
+    )
+    _LOGGER.debug("Registered rediscover_capabilities service")
+
+
+def async_unregister_services(hass: HomeAssistant) -> None:
+    """Remove the services registered by async_register_services."""
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
@@ -0,0 +1,92 @@
+"""Precomputed display state for the sensor and select entities.
+
+Everything the frontend reads from these entities (icon, labels, extra
+attributes) depends only on the current value, so it is derived once per
+value change into an immutable bundle. Property reads are then plain field
+lookups. No Home Assistant imports, so it can be benchmarked on its own.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+
+class StateBundle(NamedTuple):
+    value: object
+    icon: str
+    attributes: Mapping
+
+
+_EMPTY = MappingProxyType({})
+
+# (lower bound in dBm, icon, quality, percentage), best first
+_RSSI_LEVELS = (
+    (-30, "mdi:wifi-strength-4", "Excellent", 100),
+    (-50, "mdi:wifi-strength-3", "Good", 75),
+    (-70, "mdi:wifi-strength-2", "Fair", 50),
+    (-85, "mdi:wifi-strength-1", "Poor", 25),
+)
+_RSSI_FLOOR = ("mdi:wifi-strength-outline", "Very Poor", 10)
+
+# (lower bound in %, icon), highest first
+_BATTERY_ICONS = (
+    (95, "mdi:battery"),
+    (85, "mdi:battery-90"),
+    (75, "mdi:battery-80"),
+    (65, "mdi:battery-70"),
+    (55, "mdi:battery-60"),
+    (45, "mdi:battery-50"),
+    (35, "mdi:battery-40"),
+    (25, "mdi:battery-30"),
+    (15, "mdi:battery-20"),
+    (5, "mdi:battery-10"),
+)
+_BATTERY_STATUS = ((75, "Good"), (25, "Medium"), (10, "Low"))
+
+VOLUME_OPTIONS = ["Off", "Low", "Normal"]
+_VOLUME_ICONS = {
+    "Off": "mdi:volume-off",
+    "Low": "mdi:volume-medium",
+    "Normal": "mdi:volume-high",
+}
+
+VOLUME_UNKNOWN = StateBundle(None, "mdi:volume-medium", _EMPTY)
+
+
+@lru_cache(maxsize=None)
+def _rssi_level(rssi: int):
+    for bound, icon, quality, percent in _RSSI_LEVELS:
+        if rssi >= bound:
+            return icon, quality, percent
+    return _RSSI_FLOOR
+
+
+def rssi_bundle(value: int, last_updated=None) -> StateBundle:
+    """Bundle an RSSI value in dBm; ``last_updated`` is when it was taken."""
+    icon, quality, percent = _rssi_level(int(value))
+    return StateBundle(value, icon, MappingProxyType({
+        "rssi_dbm": f"{value} dBm",
+        "last_updated": last_updated,
+        "signal_quality": quality,
+        "signal_percentage": f"{percent}%",
+    }))
+
+
+@lru_cache(maxsize=None)
+def battery_bundle(value: int) -> StateBundle:
+    """Bundle a battery percentage (0-100)."""
+    level = int(value)
+    icon = next((icon for bound, icon in _BATTERY_ICONS if level >= bound), "mdi:battery-alert")
+    status = next((status for bound, status in _BATTERY_STATUS if value >= bound), "Critical")
+    return StateBundle(value, icon, MappingProxyType({
+        "battery_level": f"{value}%",
+        "battery_status": status,
+    }))
+
+
+VOLUME_BUNDLES = {
+    option: StateBundle(option, _VOLUME_ICONS[option], MappingProxyType({
+        "volume_label": option,
+        "volume_level": level,
+    }))
+    for level, option in enumerate(VOLUME_OPTIONS)
+}
@@ -0,0 +1,77 @@
+"""Coalesced entity state writes for the Nimly Digital Lock integration."""
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, STATE_WRITE_COALESCE_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StateWriteCoalescer:
+    """Collapse several state writes of one entity into a single write.
+
+    A lock operation produces a burst of reports (lock state, operation
+    event, door state, battery) in the same loop iteration. Each report asks
+    for a write here, and every entity with a pending request is written once
+    at the end of the iteration, or after ``window`` seconds if one is set.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float = STATE_WRITE_COALESCE_WINDOW):
+        self._hass = hass
+        self._window = window
+        self._pending = {}
+        self._flush_handle = None
+        self.requested = 0
+        self.written = 0
+
+    @callback
+    def async_schedule_write(self, entity) -> None:
+        """Request a state write for ``entity``; the write happens at the next flush."""
+        self.requested += 1
+        self._pending[id(entity)] = entity
+        if self._flush_handle is not None:
+            return
+        if self._window > 0:
+            self._flush_handle = self._hass.loop.call_later(self._window, self._flush)
+        else:
+            self._flush_handle = self._hass.loop.call_soon(self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending = self._pending
+        self._pending = {}
+        for entity in pending.values():
+            if entity.hass is None:
+                continue  # Removed before the flush
+            try:
+                entity.async_write_ha_state()
+                self.written += 1
+            except Exception as e:
+                _LOGGER.warning("[StateWriter] Failed to write state of %s: %s", entity.entity_id, e)
+
+    def shutdown(self) -> None:
+        """Drop pending writes."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+
+    def as_dict(self) -> dict:
+        """Return write counters for diagnostics."""
+        return {
+            "requested": self.requested,
+            "written": self.written,
+            "saved": self.requested - self.written - len(self._pending),
+            "window": self._window,
+        }
+
+
+def get_state_writer(hass: HomeAssistant) -> StateWriteCoalescer:
+    """Return the shared state write coalescer, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    writer = domain_data.get("state_writer")
+    if writer is None:
+        writer = domain_data["state_writer"] = StateWriteCoalescer(hass)
+    return writer
@@ -2,6 +2,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 
+from .const import LOCK_CLUSTER_ID
+from .zbt1_support import attribute_supported
 from .configuration.auto_relock_switch import AutoRelockSwitch, _LOGGER
 
 async def async_setup_entry(
@@ -16,5 +18,9 @@ async def async_setup_entry(
     name = entry.data.get("name", "Nimly Front Door")
     #ieee_key = ieee.lower().replace(":", "")
 
+    if not attribute_supported(hass, ieee, LOCK_CLUSTER_ID, 0x0023):
+        _LOGGER.info(f"[AM] {name} does not support attribute 0x0023, not adding auto relock switch")
+        return
+
     auto_relock_switch = AutoRelockSwitch(hass, ieee, name)
     async_add_entities([auto_relock_switch], True)
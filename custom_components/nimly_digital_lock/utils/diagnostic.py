@@ -4,6 +4,8 @@ import logging
 import json
 from homeassistant.core import HomeAssistant
 from ..const import DOMAIN, LOCK_CLUSTER_ID
+from ..ieee import canonical_ieee
+from ..zbt1_support import get_resolver
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -11,18 +13,20 @@ async def run_connection_diagnostics(hass: HomeAssistant, ieee: str) -> dict:
     """Run comprehensive diagnostics on the ZigBee connection.
 
     This function attempts to diagnose issues with connecting to the lock device.
-    It tries multiple endpoints, formats and services to determine what works.
+    It reports the IEEE formats, the available services and the endpoint
+    serving each cluster of the device.
     """
     results = {
         "ieee_formats": {},
-        "endpoints_tested": {},
+        "endpoints": {},
         "services_available": {},
         "zigbee_networks": {}
     }
 
     # Test IEEE formats
-    ieee_no_colons = ieee.replace(':', '')
-    ieee_with_colons = ':'.join([ieee_no_colons[i:i+2] for i in range(0, len(ieee_no_colons), 2)])
+    address = canonical_ieee(ieee)
+    ieee_no_colons = address.no_colons
+    ieee_with_colons = address.with_colons
 
     results["ieee_formats"] = {
         "original": ieee,
@@ -40,42 +44,11 @@ async def run_connection_diagnostics(hass: HomeAssistant, ieee: str) -> dict:
             service_available = hass.services.has_service(domain, method)
             results["services_available"][domain][method] = service_available
 
-    # Test endpoints
-    endpoints_to_test = [1, 11, 242, 2, 3]
-
-    for endpoint in endpoints_to_test:
-        results["endpoints_tested"][endpoint] = {"zigbee": False, "zha": False}
-
-        for domain in service_domains:
-            if not results["services_available"][domain]["get_zigbee_cluster_attribute"]:
-                continue
-
-            try:
-                # Try reading a simple attribute to check endpoint responsiveness
-                service_data = {
-                    "ieee": ieee_with_colons,
-                    "endpoint_id": endpoint,
-                    "cluster_id": LOCK_CLUSTER_ID,
-                    "attribute": 0,  # LockState attribute
-                    "manufacturer": None
-                }
-
-                _LOGGER.debug(f"Testing endpoint {endpoint} with {domain}")
-
-                # We don't actually care about the result, just if it doesn't error
-                await hass.services.async_call(
-                    domain,
-                    "get_zigbee_cluster_attribute",
-                    service_data,
-                    blocking=True
-                )
-
-                # If we got here, it worked
-                results["endpoints_tested"][endpoint][domain] = True
-                _LOGGER.info(f"Endpoint {endpoint} responsive with {domain} service")
-
-            except Exception as e:
-                _LOGGER.debug(f"Endpoint {endpoint} test failed with {domain}: {e}")
+    # Endpoints come from the device descriptor instead of probing each one
+    try:
+        results["endpoints"] = get_resolver(hass).endpoints_as_dict(address)
+    except (KeyError, AttributeError):
+        results["endpoints"] = {}
 
     # Check if ZHA integration is available and get device info
     if "zha" in hass.data:
@@ -88,17 +61,16 @@ async def run_connection_diagnostics(hass: HomeAssistant, ieee: str) -> dict:
 
             # Check if our device is in the ZHA device list
             device_found = False
-            for dev in zha_gateway.devices.values():
-                if hasattr(dev, "ieee") and str(dev.ieee).replace(':', '').lower() == ieee_no_colons.lower():
-                    device_found = True
-                    results["zigbee_networks"]["zha"]["device_found"] = True
-                    results["zigbee_networks"]["zha"]["device_info"] = {
-                        "ieee": str(dev.ieee),
-                        "nwk": hex(dev.nwk) if hasattr(dev, "nwk") else None,
-                        "available": dev.available if hasattr(dev, "available") else None,
-                        "endpoints": list(dev.endpoints.keys()) if hasattr(dev, "endpoints") else []
-                    }
-                    break
+            dev = zha_gateway.devices.get(address.eui64)
+            if dev is not None and hasattr(dev, "ieee"):
+                device_found = True
+                results["zigbee_networks"]["zha"]["device_found"] = True
+                results["zigbee_networks"]["zha"]["device_info"] = {
+                    "ieee": str(dev.ieee),
+                    "nwk": hex(dev.nwk) if hasattr(dev, "nwk") else None,
+                    "available": dev.available if hasattr(dev, "available") else None,
+                    "endpoints": list(dev.endpoints.keys()) if hasattr(dev, "endpoints") else []
+                }
 
             if not device_found:
                 results["zigbee_networks"]["zha"]["device_found"] = False
@@ -125,26 +97,16 @@ async def dump_diagnostics_to_log(hass: HomeAssistant, ieee: str):
         _LOGGER.info("===== NIMLY LOCK DIAGNOSTICS REPORT =====")
         _LOGGER.info(f"IEEE Formats: {json.dumps(results['ieee_formats'], indent=2)}")
         _LOGGER.info(f"Services Available: {json.dumps(results['services_available'], indent=2)}")
-        _LOGGER.info(f"Endpoints Tested: {json.dumps(results['endpoints_tested'], indent=2)}")
+        _LOGGER.info(f"Endpoints: {json.dumps(results['endpoints'], indent=2)}")
         _LOGGER.info(f"Zigbee Networks: {json.dumps(results['zigbee_networks'], indent=2)}")
         _LOGGER.info("=======================================")
 
         # Provide recommendations based on results
-        responsive_endpoints = []
-        for endpoint, status in results["endpoints_tested"].items():
-            if status["zigbee"] or status["zha"]:
-                responsive_endpoints.append(endpoint)
-
-        if responsive_endpoints:
-            _LOGGER.info(f"RECOMMENDATION: Use the following responsive endpoints: {responsive_endpoints}")
-
-            # Determine which service to use
-            if any(status["zigbee"] for _, status in results["endpoints_tested"].items()):
-                _LOGGER.info("RECOMMENDATION: Nabu Casa Zigbee service is responsive, use this as primary")
-            elif any(status["zha"] for _, status in results["endpoints_tested"].items()):
-                _LOGGER.info("RECOMMENDATION: ZHA service is responsive, use this as primary")
+        lock_endpoint = results["endpoints"].get(f"{LOCK_CLUSTER_ID:#06x}")
+        if lock_endpoint is not None:
+            _LOGGER.info(f"Door Lock cluster is served by endpoint {lock_endpoint}")
         else:
-            _LOGGER.error("RECOMMENDATION: No responsive endpoints found. Check device power and ZigBee network")
+            _LOGGER.error("RECOMMENDATION: Door Lock cluster not found. Check device power and ZigBee network")
 
         return True
     except Exception as e:
@@ -0,0 +1,112 @@
+"""Low-overhead logging for hot paths of the Nimly Digital Lock integration.
+
+Hot-path messages (raw frames, reports, sensor updates, polls) go through a
+HotPathLogger instead of the module logger. Arguments are only formatted
+when a message is emitted, and the integration-wide mode decides how much
+is emitted:
+
+- ``quiet``: nothing
+- ``sampled``: every Nth call per call site, at most a few per minute
+- ``trace``: everything
+
+The mode can be changed at runtime with the ``set_log_mode`` service.
+"""
+import logging
+import time
+
+from ..const import (
+    DEFAULT_LOG_MODE,
+    LOG_MODE_QUIET,
+    LOG_MODE_SAMPLED,
+    LOG_MODES,
+    LOG_SAMPLE_EVERY,
+    LOG_SITE_RATE_LIMIT,
+    LOG_SITE_RATE_WINDOW,
+)
+
+_mode = DEFAULT_LOG_MODE
+_loggers = []
+
+
+def set_log_mode(mode: str) -> None:
+    """Switch every hot-path logger of the integration to ``mode``."""
+    global _mode
+    if mode not in LOG_MODES:
+        raise ValueError(f"Unknown log mode: {mode}")
+    _mode = mode
+    for hot_logger in _loggers:
+        hot_logger.reset()
+
+
+def get_log_mode() -> str:
+    return _mode
+
+
+class lazy:
+    """Defer an expensive log argument, e.g. ``lazy(frame.hex)``, until formatting."""
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args))
+
+    __repr__ = __str__
+
+
+class _Site:
+    __slots__ = ("calls", "emitted", "window_start", "window_count")
+
+    def __init__(self):
+        self.calls = 0
+        self.emitted = 0
+        self.window_start = 0.0
+        self.window_count = 0
+
+
+class HotPathLogger:
+    """Sampling, rate-limited wrapper around a module logger."""
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+        self._sites = {}
+        _loggers.append(self)
+
+    def reset(self) -> None:
+        self._sites.clear()
+
+    def _log(self, level: int, site: str, msg: str, args) -> None:
+        mode = _mode
+        if mode == LOG_MODE_QUIET or not self._logger.isEnabledFor(level):
+            return
+
+        if mode == LOG_MODE_SAMPLED:
+            state = self._sites.get(site)
+            if state is None:
+                state = self._sites[site] = _Site()
+            state.calls += 1
+            if (state.calls - 1) % LOG_SAMPLE_EVERY:
+                return
+            now = time.monotonic()
+            if now - state.window_start >= LOG_SITE_RATE_WINDOW:
+                state.window_start = now
+                state.window_count = 0
+            if state.window_count >= LOG_SITE_RATE_LIMIT:
+                return
+            state.window_count += 1
+            state.emitted += 1
+
+        self._logger.log(level, msg, *args)
+
+    def debug(self, site: str, msg: str, *args) -> None:
+        self._log(logging.DEBUG, site, msg, args)
+
+    def info(self, site: str, msg: str, *args) -> None:
+        self._log(logging.INFO, site, msg, args)
+
+    def as_dict(self) -> dict:
+        """Return per call site counters (sampled mode only)."""
+        return {site: {"calls": state.calls, "emitted": state.emitted} for site, state in self._sites.items()}
@@ -0,0 +1,59 @@
+"""Deadband and heartbeat policy for sensor state writes."""
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+class WritePolicy:
+    """Decide whether a new sensor value is worth a state write.
+
+    A value is written when it differs from the last written value by at
+    least ``min_change`` and ``min_interval`` seconds have passed since that
+    write. Comparing against the last written value rather than the last
+    reading gives hysteresis: a reading that wobbles around a value does not
+    cause a write on every swing. After ``heartbeat`` seconds without a write
+    the next value is written regardless, so history never goes quiet.
+    """
+
+    __slots__ = ("min_change", "min_interval", "heartbeat", "_last_value", "_last_write", "written", "skipped")
+
+    def __init__(self, min_change: float, min_interval: float = 0, heartbeat: float = 0):
+        self.min_change = min_change
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+        self._last_value = None
+        self._last_write = None
+        self.written = 0
+        self.skipped = 0
+
+    def should_write(self, value) -> bool:
+        """Return True and record the write if ``value`` should be written."""
+        now = time.monotonic()
+        if self._last_write is not None:
+            elapsed = now - self._last_write
+            if not (self.heartbeat and elapsed >= self.heartbeat):
+                if abs(value - self._last_value) < self.min_change or elapsed < self.min_interval:
+                    self.skipped += 1
+                    return False
+        self._last_value = value
+        self._last_write = now
+        self.written += 1
+        return True
+
+    def as_dict(self) -> dict:
+        """Return the policy and its counters for diagnostics."""
+        return {
+            "min_change": self.min_change,
+            "min_interval": self.min_interval,
+            "heartbeat": self.heartbeat,
+            "written": self.written,
+            "skipped": self.skipped,
+        }
+
+
+def register_write_policy(hass: HomeAssistant, unique_id: str, policy: WritePolicy) -> WritePolicy:
+    """Make a sensor's policy visible to diagnostics."""
+    hass.data.setdefault(DOMAIN, {}).setdefault("write_policies", {})[unique_id] = policy
+    return policy
@@ -1,108 +1,619 @@
+import asyncio
 import logging
 
 from zigpy.types import EUI64
 from homeassistant.core import HomeAssistant
 
+from .attribute_cache import get_attribute_cache
+from .capabilities import ClusterCapabilities, get_capabilities, model_key
+from .command_queue import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PRIORITY_READ,
+    PRIORITY_WRITE,
+    get_command_queue,
+)
+from .const import CAPABILITY_CLUSTERS, DOMAIN
+from .ieee import IEEEAddress, canonical_ieee
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .retry import OPERATION_COMMAND, OPERATION_POLL, OPERATION_READ, OPERATION_WRITE, async_retry, is_retryable
+
 _LOGGER = logging.getLogger(__name__)
 
 LOCK_CLUSTER_ID = 0x0101
 POWER_CLUSTER_ID = 0x0001
 BATTERY_PERCENT_ATTR = 0x0021
 
-# Read a Zigbee attribute using the ZBT-1 bridge
-async def async_read_attribute_zbt1(hass: HomeAssistant, ieee: EUI64, endpoint: int, cluster: int, attribute: int):
+# Usable APS payload for an unfragmented frame and the ZCL header inside it
+MAX_APS_PAYLOAD = 82
+ZCL_HEADER_SIZE = 5
+# Read attributes response record: attribute id, status and data type
+READ_RECORD_OVERHEAD = 4
+# Size assumed for variable length values such as octet strings
+VARIABLE_VALUE_SIZE = 16
+# Discover attributes response record: attribute id and data type
+DISCOVER_RECORD_SIZE = 3
+
+READ_STATUS_SUCCESS = "success"
+READ_STATUS_TIMEOUT = "timeout"
+READ_STATUS_ERROR = "error"
+READ_STATUS_NO_RESPONSE = "no_response"
+READ_STATUS_NO_CLUSTER = "no_cluster"
+READ_STATUS_UNSUPPORTED = "unsupported_attribute"
+
+
+class ZHADeviceResolver:
+    """Map IEEE and (endpoint, cluster) to zigpy cluster objects in O(1).
+
+    The index for a device is built on first use from the ZHA gateway's
+    device descriptor, including the endpoint that serves each cluster, and
+    dropped again when zigpy reports that the device joined, left, was
+    removed or (re)initialized, so reconfigured endpoints are picked up.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._devices = {}
+        self._clusters = {}
+        self._first_cluster = {}
+        self._endpoints = {}
+        self._application = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _gateway(self):
+        return self._hass.data["zha"].gateway_proxy.gateway
+
+    def _attach(self, gateway) -> None:
+        """Subscribe to zigpy device lifecycle events once."""
+        if self._application is not None:
+            return
+        application = getattr(gateway, "application_controller", None)
+        if application is None:
+            return
+        application.add_listener(self)
+        self._application = application
+
+    def detach(self) -> None:
+        """Stop listening for device events and drop the index."""
+        if self._application is not None:
+            self._application.remove_listener(self)
+            self._application = None
+        self.invalidate()
+
+    def _index(self, key: IEEEAddress):
+        """Build the cluster index for one device."""
+        gateway = self._gateway()
+        self._attach(gateway)
+
+        zha_device = gateway.devices.get(key.eui64)
+        if zha_device is None:
+            return None
+
+        clusters = {}
+        first_cluster = {}
+        endpoints = {}
+        for ep_id, endpoint in zha_device.device.endpoints.items():
+            if ep_id == 0:
+                continue  # Skip ZDO endpoint
+            for cluster_id, cluster in endpoint.in_clusters.items():
+                clusters[(ep_id, cluster_id)] = cluster
+                if cluster_id not in first_cluster:
+                    first_cluster[cluster_id] = cluster
+                    endpoints[cluster_id] = ep_id
+
+        self._devices[key] = zha_device
+        self._clusters[key] = clusters
+        self._first_cluster[key] = first_cluster
+        self._endpoints[key] = endpoints
+        _LOGGER.debug("[ZBT1] Indexed %d clusters for %s", len(clusters), key)
+        return zha_device
+
+    def get_device(self, ieee):
+        """Return the ZHA device for an IEEE address, or None."""
+        key = canonical_ieee(ieee)
+        zha_device = self._devices.get(key)
+        if zha_device is not None:
+            self.hits += 1
+            return zha_device
+        self.misses += 1
+        return self._index(key)
+
+    def get_cluster(self, ieee, cluster_id: int, endpoint: int | None = None):
+        """Return the in-cluster for a device, from ``endpoint`` or else the one serving it."""
+        if self.get_device(ieee) is None:
+            return None
+        key = canonical_ieee(ieee)
+        if endpoint is not None:
+            cluster = self._clusters[key].get((endpoint, cluster_id))
+            if cluster is not None:
+                return cluster
+        return self._first_cluster[key].get(cluster_id)
+
+    def get_endpoint(self, ieee, cluster_id: int) -> int | None:
+        """Return the endpoint that serves an in-cluster, or None."""
+        if self.get_device(ieee) is None:
+            return None
+        return self._endpoints[canonical_ieee(ieee)].get(cluster_id)
+
+    def endpoints_as_dict(self, ieee) -> dict:
+        """Return the resolved endpoint per cluster for diagnostics."""
+        if self.get_device(ieee) is None:
+            return {}
+        return {f"{cluster_id:#06x}": ep_id for cluster_id, ep_id in self._endpoints[canonical_ieee(ieee)].items()}
+
+    def get_endpoints(self, ieee) -> list:
+        """Return the non-ZDO endpoint ids of a device."""
+        if self.get_device(ieee) is None:
+            return []
+        return sorted({ep_id for ep_id, _ in self._clusters[canonical_ieee(ieee)]})
+
+    def invalidate(self, ieee=None) -> None:
+        """Forget one device, or every device when no IEEE is given, with its cached values."""
+        self.invalidations += 1
+        get_attribute_cache(self._hass).invalidate(None if ieee is None else canonical_ieee(ieee))
+        if ieee is None:
+            self._devices.clear()
+            self._clusters.clear()
+            self._first_cluster.clear()
+            self._endpoints.clear()
+            return
+        key = canonical_ieee(ieee)
+        self._devices.pop(key, None)
+        self._clusters.pop(key, None)
+        self._first_cluster.pop(key, None)
+        self._endpoints.pop(key, None)
+
+    # zigpy application listener callbacks
+    def device_joined(self, device) -> None:
+        self.invalidate(device.ieee)
+
+    def device_initialized(self, device) -> None:
+        self.invalidate(device.ieee)
+
+    def device_left(self, device) -> None:
+        self.invalidate(device.ieee)
+
+    def device_removed(self, device) -> None:
+        self.invalidate(device.ieee)
+
+
+def _read_operation(priority: int) -> str:
+    return OPERATION_POLL if priority >= PRIORITY_POLL else OPERATION_READ
+
+
+async def _async_probe(hass: HomeAssistant, key: str) -> None:
+    """Cheap reachability check: read the lock state, without retries."""
+    cluster_obj = get_resolver(hass).get_cluster(key, LOCK_CLUSTER_ID)
+    if cluster_obj is None:
+        raise CircuitOpenError(f"Door Lock cluster not found for {key}")
+    await get_command_queue(hass, key).async_submit(lambda: cluster_obj.read_attributes([0x0000]), PRIORITY_POLL)
+
+
+def get_lock_breaker(hass: HomeAssistant, ieee) -> CircuitBreaker:
+    """Return the circuit breaker guarding traffic to one lock."""
+    key = canonical_ieee(ieee)
+    return get_circuit_breaker(hass, key, lambda: _async_probe(hass, key))
+
+
+async def _async_submit(hass: HomeAssistant, key: str, factory, priority: int, operation: str, attempts: int | None = None):
+    """Queue a radio operation for a lock, retrying transient failures.
+
+    Background traffic is refused while the lock's circuit breaker is open.
+    """
+    breaker = get_lock_breaker(hass, key)
+    if priority >= PRIORITY_POLL and not breaker.allow_background():
+        raise CircuitOpenError(f"{key} is unreachable, skipping background traffic")
+
+    queue = get_command_queue(hass, key)
     try:
-        devices = hass.data["zha"].gateway_proxy.gateway.devices.items()
-        _LOGGER.info("[AM] DEVICES IN async_read_attribute_zbt1 %s", devices)
+        result = await async_retry(hass, key, operation, lambda: queue.async_submit(factory, priority), attempts)
+    except Exception as err:
+        if is_retryable(err):
+            breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
+
+
+def get_resolver(hass: HomeAssistant) -> ZHADeviceResolver:
+    """Return the shared device resolver, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    resolver = domain_data.get("resolver")
+    if resolver is None:
+        resolver = domain_data["resolver"] = ZHADeviceResolver(hass)
+    return resolver
 
-        for dev_id, d in devices:
-            _LOGGER.info("[AM] d: %s", d)
 
-            if str(d.ieee).lower() == str(ieee).lower():
-                _LOGGER.info("[AM] endpoints items: %s", d.endpoints.items())
+def resolve_endpoint(hass: HomeAssistant, ieee, cluster: int) -> int | None:
+    """Return the endpoint serving a cluster on a device, for ZHA service calls."""
+    try:
+        return get_resolver(hass).get_endpoint(ieee, cluster)
+    except (KeyError, AttributeError):
+        return None  # ZHA not loaded yet
+
 
-                for ep_id, endpoint in d.device.endpoints.items():
-                    if ep_id == 0:
-                        continue  # Skip ZDO endpoint
+def device_model_key(hass: HomeAssistant, ieee) -> str | None:
+    """Return the capability key of a device, or None while ZHA does not know it."""
+    try:
+        zha_device = get_resolver(hass).get_device(ieee)
+    except (KeyError, AttributeError):
+        return None  # ZHA not loaded yet
+    return model_key(zha_device) if zha_device is not None else None
 
-                    # Choose the correct cluster based on the attribute
-                    if attribute == BATTERY_PERCENT_ATTR and POWER_CLUSTER_ID in endpoint.in_clusters:
-                        cluster = endpoint.in_clusters[POWER_CLUSTER_ID]
-                        _LOGGER.info(f"[AM] Reading battery from Power cluster on endpoint {ep_id}")
-                    elif LOCK_CLUSTER_ID in endpoint.in_clusters:
-                        cluster = endpoint.in_clusters[LOCK_CLUSTER_ID]
-                        _LOGGER.info(f"[AM] Reading attribute from Door Lock cluster on endpoint {ep_id}")
-                    else:
-                        continue  # Skip if neither cluster exists
 
-                    _LOGGER.info("[AM] Reading entire cluster: %s", cluster)
+def attribute_supported(hass: HomeAssistant, ieee, cluster: int, attribute: int) -> bool:
+    """Return False if discovery showed the device's model lacks the attribute."""
+    return get_capabilities(hass).supports(device_model_key(hass, ieee), cluster, attribute)
 
-                    try:
-                        _LOGGER.info("[AM] Going to read attribute: %s", attribute)
 
-                        result = await cluster.read_attributes([attribute])
+def _discovery_page(result) -> tuple:
+    """Return ``(complete, attribute_ids)`` from a discover attributes response."""
+    complete = getattr(result, "discovery_complete", None)
+    records = getattr(result, "attribute_info", None)
+    if records is None and isinstance(result, (list, tuple)) and len(result) == 2:
+        complete, records = result
+    if records is None:
+        raise ValueError(f"Unexpected discover attributes response: {result}")
+    return bool(complete), [record.attrid for record in records]
 
-                        _LOGGER.info("[AM] BEFORE: Reading result read_attributes: %s", result)
 
-                        # Some ZHA versions return a tuple: (data_dict, _)
-                        if isinstance(result, tuple):
-                            result = result[0]
+async def async_discover_attributes_zbt1(hass: HomeAssistant, ieee, cluster: int, endpoint: int | None = None, manufacturer: int | None = None, priority: int = PRIORITY_POLL) -> set | None:
+    """Return the attribute ids a cluster reports through ZCL attribute discovery.
 
-                        _LOGGER.info("[AM] AFTER: Reading result read_attributes: %s", result)
-                        return result.get(attribute)
-                    except Exception as e:
-                        _LOGGER.warning(f"[AM] Failed reading attribute {attribute:#04x}: {e}")
-        # If no matching device or attribute found
+    Returns None if the cluster is missing; raises if the device does not
+    answer the discovery.
+    """
+    key = canonical_ieee(ieee)
+    cluster_obj = get_resolver(hass).get_cluster(key, cluster, endpoint)
+    if cluster_obj is None:
         return None
 
-        #zha_device = zha_gateway.device_registry[ieee]
-        #cluster_instance = zha_device.endpoints[endpoint].in_clusters[cluster]
-        #result = await cluster_instance.read_attributes([attribute])
-        #return result.get(attribute)
+    page_size = (MAX_APS_PAYLOAD - ZCL_HEADER_SIZE - 1) // DISCOVER_RECORD_SIZE
+    kwargs = {} if manufacturer is None else {"manufacturer": manufacturer}
+    found = set()
+    start = 0
+    while True:
+        result = await _async_submit(
+            hass, key, lambda start=start: cluster_obj.discover_attributes(start, page_size, **kwargs),
+            priority, OPERATION_POLL,
+        )
+        complete, attributes = _discovery_page(result)
+        found.update(attributes)
+        if complete or not attributes:
+            return found
+        start = max(attributes) + 1
+
+
+async def async_discover_capabilities(hass: HomeAssistant, ieee, force: bool = False) -> bool:
+    """Run attribute discovery for the device's model unless it is already known.
 
+    ``force`` discovers again and replaces the stored result. Only a complete,
+    non-empty discovery is stored; returns True if one was.
+    """
+    key = canonical_ieee(ieee)
+    capabilities = get_capabilities(hass)
+    model = device_model_key(hass, key)
+    if model is None or (capabilities.is_known(model) and not force):
+        return False
+
+    manufacturer_code = getattr(get_resolver(hass).get_device(key), "manufacturer_code", None)
+    clusters = {}
+    for cluster_id in CAPABILITY_CLUSTERS:
+        try:
+            standard = await async_discover_attributes_zbt1(hass, key, cluster_id)
+        except Exception as e:
+            _LOGGER.info("[ZBT1] Attribute discovery on %#06x for %s failed, trying again next start: %s", cluster_id, key, e)
+            return False
+        if standard is None:
+            continue
+        if not standard:
+            # A cluster without attributes is a failed discovery, not a result
+            _LOGGER.info("[ZBT1] Attribute discovery on %#06x for %s returned nothing, not storing it", cluster_id, key)
+            return False
+
+        manufacturer = None
+        if manufacturer_code is not None:
+            try:
+                manufacturer = await async_discover_attributes_zbt1(hass, key, cluster_id, manufacturer=manufacturer_code)
+            except Exception as e:
+                _LOGGER.debug("[ZBT1] Manufacturer attribute discovery on %#06x for %s failed: %s", cluster_id, key, e)
+        # An empty manufacturer list is indistinguishable from no answer
+        clusters[cluster_id] = ClusterCapabilities(standard, manufacturer or None)
+
+    if not clusters:
+        return False
+    await capabilities.async_set(model, clusters)
+    _LOGGER.info(
+        "[ZBT1] Discovered attributes of %s: %s", model,
+        {f"{cluster_id:#06x}": sorted(cluster.standard) for cluster_id, cluster in clusters.items()},
+    )
+    return True
+
+
+# Read a Zigbee attribute using the ZBT-1 bridge
+async def async_read_attribute_zbt1(hass: HomeAssistant, ieee: EUI64, endpoint: int | None, cluster: int, attribute: int, max_age: float | None = None, priority: int = PRIORITY_READ):
+    """Read one attribute, served from the attribute cache when still fresh."""
+    key = canonical_ieee(ieee)
+    if not attribute_supported(hass, key, cluster, attribute):
+        _LOGGER.debug("[ZBT1] %#06x/%#06x not supported by %s, not reading", cluster, attribute, key)
+        return None
+
+    async def _read():
+        try:
+            cluster_obj = get_resolver(hass).get_cluster(key, cluster, endpoint)
+            if cluster_obj is None:
+                _LOGGER.debug("[ZBT1] Cluster %#06x not found for %s", cluster, key)
+                return None
+
+            cache.watch_cluster(key, cluster_obj)
+            result = await _async_submit(
+                hass, key, lambda: cluster_obj.read_attributes([attribute]), priority, _read_operation(priority)
+            )
+
+            # Some ZHA versions return a tuple: (data_dict, _)
+            if isinstance(result, tuple):
+                result = result[0]
+
+            _LOGGER.debug("[ZBT1] Read %#06x/%#06x from %s: %s", cluster, attribute, key, result)
+            return result.get(attribute)
+
+        except CircuitOpenError as e:
+            _LOGGER.debug("[ZBT1] Not reading %#06x/%#06x: %s", cluster, attribute, e)
+            return None
+        except Exception as e:
+            _LOGGER.error("[ZBT1] Failed to read attribute %#06x from cluster %#06x of %s: %s", attribute, cluster, key, e)
+            return None
+
+    cache = get_attribute_cache(hass)
+    return await cache.async_get_or_read((key, cluster, attribute), _read, max_age)
+
+
+def _record_size(cluster, attribute: int) -> int:
+    """Estimate the size of one read response record for an attribute."""
+    attr_def = getattr(cluster, "attributes", {}).get(attribute)
+    value_size = getattr(getattr(attr_def, "type", None), "_size", None)
+    return READ_RECORD_OVERHEAD + (value_size or VARIABLE_VALUE_SIZE)
+
+
+def _chunk_attributes(cluster, attributes: list) -> list:
+    """Split attributes into groups whose response fits in one APS frame."""
+    budget = MAX_APS_PAYLOAD - ZCL_HEADER_SIZE
+    chunks = []
+    current = []
+    used = 0
+    for attribute in attributes:
+        size = _record_size(cluster, attribute)
+        if current and used + size > budget:
+            chunks.append(current)
+            current = []
+            used = 0
+        current.append(attribute)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def async_read_attributes_zbt1(hass: HomeAssistant, ieee, attributes, endpoint: int | None = None, max_age: float | None = None, priority: int = PRIORITY_READ) -> dict:
+    """Read many attributes of one device in as few ZCL frames as possible.
+
+    ``attributes`` is an iterable of ``(cluster_id, attribute_id)`` pairs.
+    Returns ``{(cluster_id, attribute_id): {"status": ..., "value": ...}}``
+    with an entry for every requested attribute. Attributes still fresh in
+    the attribute cache are answered without a read, attributes the
+    device's model does not support are skipped.
+    """
+    key = canonical_ieee(ieee)
+    cache = get_attribute_cache(hass)
+    capabilities = get_capabilities(hass)
+    model = device_model_key(hass, key)
+    results = {}
+
+    by_cluster = {}
+    for cluster_id, attribute in attributes:
+        if not capabilities.supports(model, cluster_id, attribute):
+            results[(cluster_id, attribute)] = {"status": READ_STATUS_UNSUPPORTED, "value": None}
+            continue
+        found, value = cache.get((key, cluster_id, attribute), max_age)
+        if found:
+            cache.hits += 1
+            results[(cluster_id, attribute)] = {"status": READ_STATUS_SUCCESS, "value": value}
+            continue
+        requested = by_cluster.setdefault(cluster_id, [])
+        if attribute not in requested:
+            requested.append(attribute)
+
+    resolver = get_resolver(hass)
+    for cluster_id, requested in by_cluster.items():
+        cluster_obj = resolver.get_cluster(key, cluster_id, endpoint)
+        if cluster_obj is None:
+            for attribute in requested:
+                results[(cluster_id, attribute)] = {"status": READ_STATUS_NO_CLUSTER, "value": None}
+            continue
+
+        cache.watch_cluster(key, cluster_obj)
+        cache.misses += len(requested)
+
+        for chunk in _chunk_attributes(cluster_obj, requested):
+            try:
+                result = await _async_submit(
+                    hass, key, lambda chunk=chunk: cluster_obj.read_attributes(chunk), priority, _read_operation(priority)
+                )
+            except asyncio.TimeoutError:
+                for attribute in chunk:
+                    results[(cluster_id, attribute)] = {"status": READ_STATUS_TIMEOUT, "value": None}
+                continue
+            except Exception as e:
+                _LOGGER.warning("[ZBT1] Batched read of %#06x %s from %s failed: %s", cluster_id, chunk, ieee, e)
+                for attribute in chunk:
+                    results[(cluster_id, attribute)] = {"status": READ_STATUS_ERROR, "value": None}
+                continue
+
+            # Some ZHA versions return a tuple: (success, failure)
+            success, failure = result if isinstance(result, tuple) else (result, {})
+            for attribute in chunk:
+                if attribute in success:
+                    results[(cluster_id, attribute)] = {"status": READ_STATUS_SUCCESS, "value": success[attribute]}
+                    cache.set((key, cluster_id, attribute), success[attribute])
+                elif attribute in failure:
+                    status = failure[attribute]
+                    results[(cluster_id, attribute)] = {
+                        "status": getattr(status, "name", str(status)).lower(),
+                        "value": None,
+                    }
+                else:
+                    results[(cluster_id, attribute)] = {"status": READ_STATUS_NO_RESPONSE, "value": None}
+
+    _LOGGER.debug("[ZBT1] Batched read from %s: %s", ieee, results)
+    return results
+
+def _reporting_failures(result, attributes) -> set:
+    """Return the attributes a configure reporting response rejected."""
+    records = getattr(result, "status_records", None)
+    if records is None:
+        records = result[0] if isinstance(result, (list, tuple)) and result and isinstance(result[0], (list, tuple)) else result
+    failed = set()
+    for record in records or []:
+        status = getattr(record, "status", None)
+        if status is not None and getattr(status, "name", str(status)).upper() != "SUCCESS":
+            attrid = getattr(record, "attrid", None)
+            failed.update(attributes if attrid is None else [attrid])
+    return failed
+
+
+async def async_configure_reporting_zbt1(hass: HomeAssistant, ieee, cluster: int, reports: dict, endpoint: int | None = None, priority: int = PRIORITY_POLL) -> dict:
+    """Bind a cluster and configure attribute reporting on the device.
+
+    ``reports`` maps attribute id to ``(min_interval, max_interval,
+    reportable_change)``. Returns ``{attribute_id: configured}``.
+    Attributes the device's model does not support are left out.
+    """
+    key = canonical_ieee(ieee)
+    unsupported = {attribute for attribute in reports if not attribute_supported(hass, key, cluster, attribute)}
+    if unsupported:
+        _LOGGER.debug("[ZBT1] Not configuring reporting of unsupported %s on %#06x for %s", unsupported, cluster, key)
+        reports = {attribute: config for attribute, config in reports.items() if attribute not in unsupported}
+    if not reports:
+        return {attribute: False for attribute in unsupported}
+
+    cluster_obj = get_resolver(hass).get_cluster(key, cluster, endpoint)
+    if cluster_obj is None:
+        _LOGGER.debug("[ZBT1] Cluster %#06x not found for %s", cluster, key)
+        return {attribute: False for attribute in (*reports, *unsupported)}
+
+    async def _configure():
+        await cluster_obj.bind()
+        if hasattr(cluster_obj, "configure_reporting_multiple"):
+            result = await cluster_obj.configure_reporting_multiple(reports)
+            return _reporting_failures(result, list(reports))
+        failed = set()
+        for attribute, (min_interval, max_interval, change) in reports.items():
+            result = await cluster_obj.configure_reporting(attribute, min_interval, max_interval, change)
+            failed |= _reporting_failures(result, [attribute])
+        return failed
+
+    get_attribute_cache(hass).watch_cluster(key, cluster_obj)
+    try:
+        failed = await _async_submit(hass, key, _configure, priority, OPERATION_POLL)
     except Exception as e:
-        _LOGGER.error(f"[ZBT1] Failed to read attribute {attribute:#04x} from cluster {cluster:#04x} on endpoint {endpoint}: {e}")
+        _LOGGER.warning("[ZBT1] Failed to configure reporting on %#06x for %s: %s", cluster, key, e)
+        return {attribute: False for attribute in (*reports, *unsupported)}
+
+    _LOGGER.debug("[ZBT1] Configured reporting on %#06x for %s, rejected: %s", cluster, key, failed)
+    configured = {attribute: attribute not in failed for attribute in reports}
+    configured.update((attribute, False) for attribute in unsupported)
+    return configured
+
+
+def report_is_fresh(hass: HomeAssistant, ieee, cluster: int, attribute: int, max_age: float) -> bool:
+    """Return True if the attribute was reported within ``max_age`` seconds."""
+    age = get_attribute_cache(hass).report_age((canonical_ieee(ieee), cluster, attribute))
+    return age is not None and age <= max_age
+
+
+def _command_status(result) -> int | None:
+    """Return the ZCL status code of a command response, or None if it has none."""
+    status = getattr(result, "status", None)
+    if status is None and isinstance(result, (list, tuple)) and result:
+        # Default_Response is (command_id, status)
+        status = result[-1]
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
         return None
 
+
 # Send a Zigbee cluster command using ZBT-1
-async def async_send_command_zbt1(hass: HomeAssistant, ieee: EUI64, endpoint: int, cluster: int, command_id: int, args=None):
+async def async_send_command_zbt1(hass: HomeAssistant, ieee: EUI64, endpoint: int | None, cluster: int, command_id: int, args=None, priority: int = PRIORITY_COMMAND, attempts: int | None = None):
+    """Send a cluster command straight through zigpy and parse the ZCL response.
+
+    Returns ``{"status": ..., "success": ..., "error": ...}``, or None only
+    when the cluster could not be resolved, so the caller can fall back to
+    the ZHA service. A command that failed on the way (timeout, exhausted
+    retries, open breaker) may still have reached the lock and is returned
+    as a failure instead, so it is not sent a second time.
+    ``attempts`` overrides the retry policy's number of tries.
+    """
     args = args or []
+    key = canonical_ieee(ieee)
     try:
-        zha_gateway = hass.data["zha"]
-        zha_device = zha_gateway.device_registry[ieee]
-        cluster_instance = zha_device.endpoints[endpoint].in_clusters[cluster]
-        result = await cluster_instance.command(command_id, *args)
-        return result
-    except Exception as e:
-        _LOGGER.error(f"[ZBT1] Failed to send command {command_id} to cluster {cluster:#04x} on endpoint {endpoint}: {e}")
+        cluster_obj = get_resolver(hass).get_cluster(key, cluster, endpoint)
+    except (KeyError, AttributeError) as e:
+        _LOGGER.debug("[ZBT1] Cannot resolve %s (%s)", key, e)
+        return None  # ZHA not loaded
+    if cluster_obj is None:
+        _LOGGER.debug("[ZBT1] Cluster %#06x not found for %s", cluster, key)
         return None
 
+    try:
+        result = await _async_submit(
+            hass, key, lambda: cluster_obj.command(command_id, *args), priority, OPERATION_COMMAND, attempts
+        )
+    except Exception as e:
+        _LOGGER.error("[ZBT1] Failed to send command %#04x to cluster %#06x of %s: %s", command_id, cluster, key, e)
+        return {"status": None, "success": False, "error": str(e) or type(e).__name__}
+
+    status = _command_status(result)
+    _LOGGER.debug("[ZBT1] Command %#04x to %s returned %s", command_id, key, result)
+    return {"status": status, "success": status in (None, 0), "error": None}
+
 # Discover endpoints for a given device
 def get_zbt1_endpoints(hass: HomeAssistant, ieee: EUI64):
     try:
-        zha_gateway = hass.data["zha"]
-        zha_device = zha_gateway.device_registry[ieee]
-        return list(zha_device.endpoints.keys())
+        return get_resolver(hass).get_endpoints(ieee)
     except Exception as e:
         _LOGGER.error(f"[ZBT1] Failed to get endpoints for device {ieee}: {e}")
         return []
 
 
-
-
 async def async_write_attribute_zbt1(
     hass,
     ieee: str,
-    endpoint_id: int,
     cluster_id: int,
     attribute_id: int,
     value,
-) -> None:
-    """Write a Zigbee attribute using Home Assistant's set_zigbee_cluster_attribute."""
+    endpoint_id: int | None = None,
+    priority: int = PRIORITY_WRITE,
+    verify: bool = False,
+) -> bool:
+    """Write a Zigbee attribute using Home Assistant's set_zigbee_cluster_attribute.
+
+    Without ``endpoint_id`` the write goes to the endpoint serving the cluster.
+    With ``verify`` the attribute is read back afterwards. Returns True only
+    if the write went through (and, when verifying, the lock reports the
+    written value), so callers can keep their state unchanged otherwise.
+    """
+    key = canonical_ieee(ieee)
     try:
-        ieee_colon = ":".join(ieee[i:i+2] for i in range(0, len(ieee), 2))
+        if endpoint_id is None:
+            endpoint_id = resolve_endpoint(hass, key, cluster_id)
+            if endpoint_id is None:
+                _LOGGER.error("[ZBT1] No endpoint of %s serves cluster %#06x, not writing", key, cluster_id)
+                return False
         service_data = {
-            "ieee": ieee_colon,
+            "ieee": key.with_colons,
             "endpoint_id": endpoint_id,
             "cluster_id": cluster_id,
             "attribute": attribute_id,
@@ -110,9 +621,29 @@ async def async_write_attribute_zbt1(
             "cluster_type": "in"
         }
 
-        result = await hass.services.async_call(
-            "zha", "set_zigbee_cluster_attribute", service_data, blocking=True
+        result = await _async_submit(
+            hass,
+            key,
+            lambda: hass.services.async_call(
+                "zha", "set_zigbee_cluster_attribute", service_data, blocking=True
+            ),
+            priority,
+            OPERATION_WRITE,
         )
-        _LOGGER.info(f"[ZBT1] Attribute write result: {result}")
+        _LOGGER.info("[ZBT1] Attribute write result: %s", result)
     except Exception as e:
-        _LOGGER.error(f"[ZBT1] Failed to write attribute via set_zigbee_cluster_attribute: {e}")
+        _LOGGER.error("[ZBT1] Failed to write attribute %#06x of %s: %s", attribute_id, key, e)
+        return False
+
+    if verify:
+        # The value cached, or being read, from before the write says nothing
+        get_attribute_cache(hass).discard((key, cluster_id, attribute_id))
+        actual = await async_read_attribute_zbt1(
+            hass, key, endpoint=endpoint_id, cluster=cluster_id, attribute=attribute_id, max_age=0, priority=priority
+        )
+        if actual != value:
+            _LOGGER.error("[ZBT1] Wrote %s to %#06x of %s but it reads back %s", value, attribute_id, key, actual)
+            return False
+    else:
+        get_attribute_cache(hass).set((key, cluster_id, attribute_id), value)
+    return True
@@ -0,0 +1 @@
+"""Tests for the Nimly Digital Lock integration."""
@@ -0,0 +1,8 @@
+"""Shared fixtures for the Nimly Digital Lock tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load custom_components/ in every test."""
+    yield
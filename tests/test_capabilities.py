@@ -0,0 +1,35 @@
+"""Tests for discovered attribute support."""
+import pytest
+
+from custom_components.nimly_digital_lock.capabilities import ClusterCapabilities, CapabilityStore
+
+LOCK_CLUSTER_ID = 0x0101
+
+
+def test_low_id_attribute_found_by_manufacturer_discovery_is_supported():
+    """0x0103 (link diagnostics) only answers manufacturer specific discovery."""
+    cluster = ClusterCapabilities(standard=[0x0000, 0x0003], manufacturer=[0x0100, 0x0103])
+
+    assert cluster.supports(0x0103)
+    assert cluster.supports(0x0000)
+    assert not cluster.supports(0x0021)
+    assert not cluster.supports(0x5001)
+
+
+def test_manufacturer_range_assumed_supported_without_manufacturer_discovery():
+    cluster = ClusterCapabilities(standard=[0x0000])
+
+    assert cluster.supports(0x5001)
+    assert not cluster.supports(0x0103)
+
+
+@pytest.mark.asyncio
+async def test_store_reports_manufacturer_found_attribute_supported(hass):
+    store = CapabilityStore(hass)
+    await store.async_set(
+        "Nimly|easyCodeTouch|1.0",
+        {LOCK_CLUSTER_ID: ClusterCapabilities(standard=[0x0000], manufacturer=[0x0103])},
+    )
+
+    assert store.supports("Nimly|easyCodeTouch|1.0", LOCK_CLUSTER_ID, 0x0103)
+    assert store.skipped == 0
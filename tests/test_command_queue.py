@@ -0,0 +1,27 @@
+"""Tests for the per-lock command queue."""
+import asyncio
+
+import pytest
+
+from custom_components.nimly_digital_lock.command_queue import PRIORITY_COMMAND, LockCommandQueue
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_request_in_flight(hass):
+    """A caller waiting on the running request is released by shutdown."""
+    queue = LockCommandQueue(hass, "test")
+    started = asyncio.Event()
+
+    async def _never_answers():
+        started.set()
+        await asyncio.sleep(3600)
+
+    caller = hass.async_create_task(queue.async_submit(_never_answers, PRIORITY_COMMAND))
+    await started.wait()
+
+    queue.shutdown()
+    await asyncio.wait([caller], timeout=1)
+
+    assert caller.done()
+    with pytest.raises(asyncio.CancelledError):
+        caller.result()